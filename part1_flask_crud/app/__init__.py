@@ -5,8 +5,12 @@ from typing import Optional
 
 from flask import Flask
 
+from .cache import BankCache, NullCache, create_cache_backend
 from .config import AppConfig
-from .db import create_session_factory
+from .db import create_session_factory, get_engine, init_app as init_db, pool_stats, served_by_primary
+from .json_provider import init_app as init_json
+from .negotiation import DEFAULT_COMPRESSION_MIN_SIZE, init_app as init_compression
+from .write_behind import DEFAULT_WAIT_SECONDS, init_app as init_write_behind
 
 
 def create_app(config_override: Optional[dict] = None) -> Flask:
@@ -17,8 +21,77 @@ def create_app(config_override: Optional[dict] = None) -> Flask:
     if config_override is None:
         app_config = AppConfig.from_env()
         app.config["DB_SESSION_FACTORY"] = create_session_factory(app_config)
+        app.config["DB_REPLICA_SESSION_FACTORIES"] = [
+            create_session_factory(app_config, server) for server in app_config.db_read_replicas
+        ]
+        app.config["DB_REPLICA_STRATEGY"] = app_config.db_replica_strategy
+        app.config["DB_READ_YOUR_WRITES_SECONDS"] = app_config.db_read_your_writes_seconds
+        app.config["BANK_CACHE"] = BankCache(
+            create_cache_backend(
+                app_config.cache_backend,
+                ttl_seconds=app_config.cache_ttl_seconds,
+                max_entries=app_config.cache_max_entries,
+                directory=app_config.cache_dir,
+            )
+        )
+        app.config["INSTRUMENTATION"] = app_config.instrumentation_enabled
+        app.config["QUERY_BUDGET_ENABLED"] = app_config.query_budget_enabled
+        app.config["QUERY_BUDGET_MODE"] = app_config.query_budget_mode
+        app.config["QUERY_BUDGET_DEFAULT"] = app_config.query_budget_default
+        app.config["QUERY_BUDGETS"] = app_config.query_budgets
+        app.config["SEARCH_FULL_TEXT"] = app_config.search_full_text
+        app.config["JSON_PROVIDER"] = app_config.json_provider
+        app.config["COMPRESSION_ENABLED"] = app_config.compression_enabled
+        app.config["COMPRESSION_MIN_SIZE"] = app_config.compression_min_size
+        app.config["REQUIRE_IF_MATCH"] = app_config.require_if_match
+        app.config["WRITE_BEHIND_ENABLED"] = app_config.write_behind_enabled
+        app.config["WRITE_BEHIND_DURABLE"] = app_config.write_behind_durable
+        app.config["WRITE_BEHIND_INTERVAL_MS"] = app_config.write_behind_interval_ms
+        app.config["WRITE_BEHIND_MAX_BATCH"] = app_config.write_behind_max_batch
+        app.config["WRITE_BEHIND_MAX_QUEUE"] = app_config.write_behind_max_queue
+        app.config["WRITE_BEHIND_WAIT_SECONDS"] = app_config.write_behind_wait_seconds
+        app.config["ADMISSION_ENABLED"] = app_config.admission_enabled
+        app.config["RATE_LIMIT_PER_CLIENT"] = app_config.rate_limit_per_client
+        app.config["RATE_LIMIT_BURST"] = app_config.rate_limit_burst
+        app.config["RATE_LIMITS"] = app_config.rate_limits
+        app.config["ADMISSION_MAX_CONCURRENT"] = app_config.admission_max_concurrent
     else:
         app.config.update(config_override)
+    app.config.setdefault("BANK_CACHE", BankCache(NullCache()))
+    app.config.setdefault("SEARCH_FULL_TEXT", True)
+    app.config.setdefault("JSON_PROVIDER", "auto")
+    app.config.setdefault("COMPRESSION_ENABLED", True)
+    app.config.setdefault("COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE)
+    app.config.setdefault("REQUIRE_IF_MATCH", False)
+    app.config.setdefault("WRITE_BEHIND_DURABLE", True)
+    app.config.setdefault("WRITE_BEHIND_WAIT_SECONDS", DEFAULT_WAIT_SECONDS)
+    init_db(app)
+    if app.config.get("DB_REPLICAS") is not None:
+        # A lagging replica would fill the cache with stale rows, served to
+        # every client (the sticky writer too) until the next write.
+        app.config["BANK_CACHE"].should_store = served_by_primary
+    init_json(app)
+    init_write_behind(app)
+
+    if app.config.get("INSTRUMENTATION"):
+        from .instrumentation import init_app as init_instrumentation
+
+        init_instrumentation(app)
+
+    if app.config.get("QUERY_BUDGET_ENABLED"):
+        from .query_budget import init_app as init_query_budget
+
+        init_query_budget(app)
+
+    # after the hooks above, so refused requests are still timed and counted
+    if app.config.get("ADMISSION_ENABLED"):
+        from .admission import init_app as init_admission
+
+        init_admission(app)
+
+    # registered last so it runs first among the after_request hooks and
+    # the timings above include compression
+    init_compression(app)
 
     # register blueprints
     from .banks import banks_bp  # imported here and not at the top to avoid circular imports
@@ -31,6 +104,29 @@ def create_app(config_override: Optional[dict] = None) -> Flask:
     def health():
         """Return a lightweight health check response."""
         return {"status": "ok"}
+
+    @app.get("/cache/stats")
+    def cache_stats():
+        """Return hit/miss/eviction counters of the bank cache."""
+        return app.config["BANK_CACHE"].stats()
+
+    @app.get("/write-behind/stats")
+    def write_behind_stats():
+        """Return write-behind queue counters and depth."""
+        write_behind = app.config.get("WRITE_BEHIND_QUEUE")
+        return {"enabled": True, **write_behind.stats()} if write_behind else {"enabled": False}
+
+    @app.get("/pool/stats")
+    def db_pool_stats():
+        """Return connection pool occupancy and checkout wait times.
+
+        With read replicas, the primary's stats are followed by a `replicas` list.
+        """
+        stats = pool_stats(get_engine(app.config["DB_SESSION_FACTORY"]))
+        replicas = app.config.get("DB_REPLICAS")
+        if replicas is not None:
+            stats["replicas"] = replicas.stats()
+        return stats
     
     from flask import redirect, url_for
 
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, g, request
+from .db import get_engine, pool_capacity as db_pool_capacity
+
+DEFAULT_CLIENT_BURST = 20
+# How long a request may wait for a free slot before it is shed
+DEFAULT_QUEUE_SECONDS = 0.1
+# Token buckets kept for distinct clients; the least recently seen are dropped
+DEFAULT_MAX_CLIENTS = 10000
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `burst`; each request takes one.
+
+    Not thread-safe on its own; AdmissionController serializes access.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token; return 0 on success, else the seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        """Give back a token taken by a request that was refused later on."""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+@dataclass
+class AdmissionStats:
+    """Counters describing admission decisions."""
+
+    admitted: int = 0
+    rate_limited_client: int = 0
+    rate_limited_route: int = 0
+    shed: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+class AdmissionController:
+    """Decides, before any database work, whether a request may proceed.
+
+    A request must get a token from its client's bucket (`client_rate`
+    per second, bursts of `client_burst`) and from its endpoint's bucket
+    when `route_rates` has one (shared by all clients), then a slot under
+    `max_concurrent`. When all slots are taken, up to `max_concurrent` more
+    requests may wait `queue_seconds` for one; the rest are shed at once.
+    Refusals cost a dictionary lookup, not a pool wait.
+    """
+
+    def __init__(
+        self,
+        client_rate: float = 0.0,
+        client_burst: float = DEFAULT_CLIENT_BURST,
+        route_rates: Optional[Dict[str, float]] = None,
+        max_concurrent: int = 0,
+        queue_seconds: float = DEFAULT_QUEUE_SECONDS,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+    ) -> None:
+        self.client_rate = client_rate
+        self.client_burst = max(client_burst, 1)
+        self.route_rates = dict(route_rates or {})
+        self.max_concurrent = max_concurrent
+        self.queue_seconds = queue_seconds
+        self.max_clients = max_clients
+        self.counters = AdmissionStats()
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._routes: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._waiting = 0
+
+    def _client_bucket(self, client: str, now: float) -> TokenBucket:
+        bucket = self._clients.get(client)
+        if bucket is None:
+            bucket = self._clients[client] = TokenBucket(self.client_rate, self.client_burst, now)
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client)
+        return bucket
+
+    def admit(self, client: str, endpoint: Optional[str]) -> Tuple[int, float]:
+        """Return (0, 0) and take a concurrency slot, or (status, retry_after_seconds).
+
+        An admitted request must call `release` when it is done.
+        """
+        now = time.monotonic()
+        with self._lock:
+            taken: List[TokenBucket] = []
+            if self.client_rate > 0:
+                bucket = self._client_bucket(client, now)
+                wait = bucket.take(now)
+                if wait:
+                    self.counters.rate_limited_client += 1
+                    return 429, wait
+                taken.append(bucket)
+            route_rate = self.route_rates.get(endpoint or "")
+            if route_rate:
+                bucket = self._routes.get(endpoint)
+                if bucket is None:
+                    bucket = self._routes[endpoint] = TokenBucket(route_rate, max(route_rate, 1), now)
+                wait = bucket.take(now)
+                if wait:
+                    # a refused request does no work, so it does not use up its rate limits
+                    self._refund(taken)
+                    self.counters.rate_limited_route += 1
+                    return 429, wait
+                taken.append(bucket)
+            if self.max_concurrent and not self._wait_for_slot():
+                self._refund(taken)
+                self.counters.shed += 1
+                return 503, 1.0
+            self.counters.admitted += 1
+            self.counters.in_flight += 1
+            self.counters.max_in_flight = max(self.counters.max_in_flight, self.counters.in_flight)
+        return 0, 0.0
+
+    @staticmethod
+    def _refund(buckets: List[TokenBucket]) -> None:
+        for bucket in buckets:
+            bucket.refund()
+
+    def _wait_for_slot(self) -> bool:
+        # called with the lock held; waiting releases it
+        if self.counters.in_flight < self.max_concurrent:
+            return True
+        if self._waiting >= self.max_concurrent or self.queue_seconds <= 0:
+            return False
+        self._waiting += 1
+        try:
+            return self._slot_freed.wait_for(
+                lambda: self.counters.in_flight < self.max_concurrent, timeout=self.queue_seconds
+            )
+        finally:
+            self._waiting -= 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.counters.in_flight -= 1
+            self._slot_freed.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters and the configured limits as a plain dict."""
+        with self._lock:
+            stats = asdict(self.counters)
+            stats["tracked_clients"] = len(self._clients)
+            stats["waiting"] = self._waiting
+        stats.update(
+            client_rate=self.client_rate,
+            client_burst=self.client_burst,
+            route_rates=self.route_rates,
+            max_concurrent=self.max_concurrent,
+            queue_seconds=self.queue_seconds,
+        )
+        return stats
+
+
+def pool_capacity(app: Flask) -> int:
+    """Connections the primary and replica pools can hand out at once, or 0 if unbounded/unknown.
+
+    Reads are spread over the replicas, so their pools add to the primary's.
+    """
+    factories = [app.config["DB_SESSION_FACTORY"], *(app.config.get("DB_REPLICA_SESSION_FACTORIES") or [])]
+    capacities = [db_pool_capacity(get_engine(factory)) for factory in factories]
+    return 0 if None in capacities else sum(capacities)
+
+
+def _refuse(status: int, retry_after: float) -> Tuple[Dict[str, str], int, Dict[str, str]]:
+    # a plain (body, status, headers) tuple, so the ASGI app can return it too
+    message = "Too many requests; slow down." if status == 429 else "Server is busy; retry later."
+    return {"error": message}, status, {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+def init_app(app: Flask) -> None:
+    """Refuse requests to the blueprints early when the app is overloaded.
+
+    Config keys:
+    - RATE_LIMIT_PER_CLIENT: requests per second per client address (0: off)
+    - RATE_LIMIT_BURST: requests a client may send at once
+    - RATE_LIMITS: {endpoint: requests per second}, shared by all clients
+    - ADMISSION_MAX_CONCURRENT: requests handled at once; 0 means the
+      capacity (pool_size + max_overflow) of the primary and replica pools
+    - ADMISSION_QUEUE_SECONDS: how long a request may wait for a free slot
+
+    Rate-limited requests get 429, requests over the concurrency cap 503,
+    both with Retry-After. Health, stats and metrics routes are exempt.
+    Behind a proxy, wrap the app in werkzeug's ProxyFix so clients are told
+    apart by their own address.
+    """
+    max_concurrent = app.config.get("ADMISSION_MAX_CONCURRENT") or pool_capacity(app)
+    admission = AdmissionController(
+        client_rate=app.config.get("RATE_LIMIT_PER_CLIENT", 0.0),
+        client_burst=app.config.get("RATE_LIMIT_BURST", DEFAULT_CLIENT_BURST),
+        route_rates=app.config.get("RATE_LIMITS"),
+        max_concurrent=max_concurrent,
+        queue_seconds=app.config.get("ADMISSION_QUEUE_SECONDS", DEFAULT_QUEUE_SECONDS),
+    )
+    app.config["ADMISSION"] = admission
+
+    @app.before_request
+    def admit_request() -> Optional[Tuple[Dict[str, str], int, Dict[str, str]]]:
+        if request.blueprint is None:
+            return None
+        status, retry_after = admission.admit(request.remote_addr or "unknown", request.endpoint)
+        if status:
+            return _refuse(status, retry_after)
+        g.admitted = True
+        return None
+
+    @app.teardown_request
+    def release_slot(exc: Optional[BaseException]) -> None:
+        # runs once a streamed response has been sent, so exports hold their slot
+        if g.pop("admitted", False):
+            admission.release()
+
+    @app.get("/admission/stats")
+    def admission_stats():
+        """Return admission counters and limits."""
+        return admission.stats()
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 api_bp = Blueprint("api", __name__)
 
-from . import routes  # noqa: F401
+from . import bulk, routes  # noqa: F401
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+from flask import current_app, jsonify, request
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from werkzeug.http import quote_etag
+
+from ..db import get_session
+from ..writes import bulk_delete_statement, bulk_update_statement, current_versions_statement, insert_banks
+from . import api_bp
+from .routes import _bank_etag, _get_cache, _parse_bank_payload
+
+BULK_MAX_ITEMS = 10000
+# SQL Server accepts at most 2100 parameters per statement
+IN_CLAUSE_CHUNK_SIZE = 1000
+# A bulk UPDATE binds each bank's ID four times with its name, location and version
+UPDATE_CHUNK_SIZE = 250
+# A bulk DELETE binds each bank's ID twice and its version
+DELETE_CHUNK_SIZE = 500
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Yield consecutive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _read_batch() -> List[Any]:
+    """Return the request body as a list of batch items."""
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Request body must be a non-empty JSON array.")
+    if len(payload) > BULK_MAX_ITEMS:
+        raise ValueError(f"A batch may contain at most {BULK_MAX_ITEMS} items.")
+    return payload
+
+
+def _parse_bank_id(value: Any, seen: Set[int]) -> int:
+    """Validate a bank ID taken from a batch item; each ID may appear once."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("id must be an integer.")
+    if value in seen:
+        raise ValueError("id appears more than once in the batch.")
+    seen.add(value)
+    return value
+
+
+def _parse_version(value: Any) -> Optional[int]:
+    """Validate the optional expected row version of a batch item."""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("version must be an integer.")
+    return value
+
+
+def _current_versions(session: Session, bank_ids: Sequence[int]) -> Dict[int, int]:
+    """Return the current version of each of `bank_ids` that exists, using chunked IN queries."""
+    versions: Dict[int, int] = {}
+    for chunk in _chunks(bank_ids, IN_CLAUSE_CHUNK_SIZE):
+        versions.update((bank_id, version) for bank_id, version in session.execute(current_versions_statement(chunk)))
+    return versions
+
+
+def _write_failed(index: int, bank_id: int, current: Dict[int, int]) -> Dict[str, Any]:
+    """Result of an item whose write matched no row: 404, or 412 with the current ETag."""
+    if bank_id not in current:
+        return _error(index, 404, "Bank not found.")
+    return {
+        **_error(index, 412, "Bank was modified by another request."),
+        "etag": quote_etag(_bank_etag(bank_id, current[bank_id])),
+    }
+
+
+def _error(index: int, status: int, message: str) -> Dict[str, Any]:
+    return {"index": index, "status": status, "error": message}
+
+
+def _bulk_response(results: List[Optional[Dict[str, Any]]], success_status: int):
+    """Return per-item results; 207 Multi-Status when any item failed."""
+    failed = any("error" in result for result in results)
+    return jsonify({"results": results}), 207 if failed else success_status
+
+
+@api_bp.post("/banks/bulk")
+def bulk_create_banks():
+    """Create many banks in a single transaction.
+
+    Each item is validated like POST /api/banks. Valid items are inserted with
+    batched multi-row INSERTs (see `insert_banks`) and invalid items are
+    reported by index.
+    """
+    try:
+        items = _read_batch()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    rows: List[Dict[str, Any]] = []
+    indexes: List[int] = []
+    for index, item in enumerate(items):
+        try:
+            name, location = _parse_bank_payload(item)
+        except ValueError as exc:
+            results[index] = _error(index, 400, str(exc))
+            continue
+        rows.append({"name": name, "location": location})
+        indexes.append(index)
+
+    if rows:
+        session = get_session()
+        try:
+            banks = insert_banks(session, rows)
+            session.commit()
+            _get_cache().invalidate()
+        except SQLAlchemyError:
+            session.rollback()
+            return jsonify({"error": "Failed to create banks."}), 400
+
+        for index, bank in zip(indexes, banks):
+            results[index] = {"index": index, "status": 201, "bank": bank}
+
+    return _bulk_response(results, 201)
+
+
+@api_bp.put("/banks/bulk")
+def bulk_update_banks():
+    """Update many banks in a single transaction.
+
+    Each item needs a unique `id` plus the fields required by
+    PUT /api/banks/<id>, and may carry the `version` it expects, the bulk
+    form of If-Match. Rows are updated in chunks by set-based UPDATEs that
+    bump the row version and return the stored rows, so each result carries
+    the bank's new version and ETag. Unknown IDs are reported as 404 items,
+    version conflicts as 412 and, with REQUIRE_IF_MATCH, items without a
+    version as 428.
+    """
+    try:
+        items = _read_batch()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    require_version = current_app.config["REQUIRE_IF_MATCH"]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    rows: List[Dict[str, Any]] = []
+    versions: Dict[int, int] = {}
+    indexes: List[int] = []
+    seen: Set[int] = set()
+    for index, item in enumerate(items):
+        try:
+            name, location = _parse_bank_payload(item)
+            bank_id = _parse_bank_id(item.get("id"), seen)
+            version = _parse_version(item.get("version"))
+        except ValueError as exc:
+            results[index] = _error(index, 400, str(exc))
+            continue
+        if version is None and require_version:
+            results[index] = _error(index, 428, "version is required.")
+            continue
+        if version is not None:
+            versions[bank_id] = version
+        rows.append({"id": bank_id, "name": name, "location": location})
+        indexes.append(index)
+
+    if rows:
+        session = get_session()
+        try:
+            updated: Dict[int, Dict[str, Any]] = {}
+            for chunk in _chunks(rows, UPDATE_CHUNK_SIZE):
+                chunk_versions = {row["id"]: versions[row["id"]] for row in chunk if row["id"] in versions}
+                for row in session.execute(bulk_update_statement(chunk, chunk_versions)):
+                    updated[row.id] = row._asdict()
+            current = _current_versions(session, [bank_id for bank_id in versions if bank_id not in updated])
+            session.commit()
+            _get_cache().invalidate(*updated)
+        except SQLAlchemyError:
+            session.rollback()
+            return jsonify({"error": "Failed to update banks."}), 400
+
+        for index, row in zip(indexes, rows):
+            bank = updated.get(row["id"])
+            if bank is not None:
+                results[index] = {
+                    "index": index,
+                    "status": 200,
+                    "bank": bank,
+                    "etag": quote_etag(_bank_etag(bank["id"], bank["version"])),
+                }
+            else:
+                results[index] = _write_failed(index, row["id"], current)
+
+    return _bulk_response(results, 200)
+
+
+@api_bp.delete("/banks/bulk")
+def bulk_delete_banks():
+    """Delete many banks by ID in a single transaction.
+
+    The body is a JSON array of unique bank IDs, or of `{"id", "version"}`
+    objects to delete a bank only while it has that version. Rows are
+    removed with chunked `DELETE ... WHERE id IN (...)` statements returning
+    the deleted IDs. Unknown IDs are reported as 404 items, version
+    conflicts as 412 and, with REQUIRE_IF_MATCH, items without a version
+    as 428.
+    """
+    try:
+        items = _read_batch()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    require_version = current_app.config["REQUIRE_IF_MATCH"]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    bank_ids: List[int] = []
+    versions: Dict[int, int] = {}
+    indexes: List[int] = []
+    seen: Set[int] = set()
+    for index, item in enumerate(items):
+        conditional = isinstance(item, dict)
+        try:
+            bank_id = _parse_bank_id(item.get("id") if conditional else item, seen)
+            version = _parse_version(item.get("version")) if conditional else None
+        except ValueError as exc:
+            results[index] = _error(index, 400, str(exc))
+            continue
+        if version is None and require_version:
+            results[index] = _error(index, 428, "version is required.")
+            continue
+        if version is not None:
+            versions[bank_id] = version
+        bank_ids.append(bank_id)
+        indexes.append(index)
+
+    if bank_ids:
+        session = get_session()
+        try:
+            deleted: Set[int] = set()
+            for chunk in _chunks(bank_ids, DELETE_CHUNK_SIZE):
+                chunk_versions = {bank_id: versions[bank_id] for bank_id in chunk if bank_id in versions}
+                deleted.update(session.scalars(bulk_delete_statement(chunk, chunk_versions)))
+            current = _current_versions(session, [bank_id for bank_id in versions if bank_id not in deleted])
+            session.commit()
+            _get_cache().invalidate(*deleted)
+        except SQLAlchemyError:
+            session.rollback()
+            return jsonify({"error": "Failed to delete banks."}), 400
+
+        for index, bank_id in zip(indexes, bank_ids):
+            if bank_id in deleted:
+                results[index] = {"index": index, "status": 204, "id": bank_id}
+            else:
+                results[index] = _write_failed(index, bank_id, current)
+
+    return _bulk_response(results, 200)
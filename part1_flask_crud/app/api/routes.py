@@ -1,19 +1,62 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import hashlib
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from flask import current_app, jsonify, request
+from flask import Response, current_app, jsonify, request, stream_with_context, url_for
+from sqlalchemy import Select, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from werkzeug.datastructures import ETags
 
+from ..cache import BankCache
+from ..db import get_session
 from ..models import Bank
+from ..negotiation import (
+    ARROW,
+    JSON,
+    MSGPACK,
+    NDJSON,
+    encode_rows,
+    identity_etag,
+    matches_if_none_match,
+    negotiate_format,
+    offered_formats,
+    stream_rows,
+)
+from ..pagination import PageRequest, keyset_select, parse_page_args, split_page
+from ..search import SearchRequest, apply_search, parse_search_args
+from ..write_behind import WriteBehindFull, WriteBehindQueue
+from ..writes import current_version_statement, delete_bank_statement, load_bank_row, update_bank_statement
 from . import api_bp
 
+BANK_FIELDS = {"id": Bank.id, "name": Bank.name, "location": Bank.location}
+# name and location are String(255) columns
+MAX_FIELD_LENGTH = Bank.__table__.c.name.type.length
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {"ndjson": NDJSON, "json": JSON, "msgpack": MSGPACK, "arrow": ARROW}
+LIST_FORMATS = (JSON, MSGPACK, ARROW)
 
-def _get_session() -> Session:
-    """Return a new database session from the app config."""
-    session_factory = current_app.config["DB_SESSION_FACTORY"]
-    return session_factory()
+
+class Framework(NamedTuple):
+    """The parts of Flask (or Quart) the shared response helpers build with.
+
+    The async API passes Quart's equivalents, which work in Quart's own
+    app and request contexts, so both APIs answer with the same responses.
+    """
+
+    response_class: Callable[..., Any]
+    jsonify: Callable[..., Any]
+    url_for: Callable[..., str]
+
+
+FLASK = Framework(Response, jsonify, url_for)
+
+
+def _get_cache() -> BankCache:
+    """Return the bank cache from the app config."""
+    return current_app.config["BANK_CACHE"]
 
 
 def _serialize_bank(bank: Bank) -> Dict[str, Any]:
@@ -21,88 +64,436 @@ def _serialize_bank(bank: Bank) -> Dict[str, Any]:
     return {"id": bank.id, "name": bank.name, "location": bank.location}
 
 
+def _bank_etag(bank_id: int, version: int) -> str:
+    """Build the strong ETag of a single bank from its row version."""
+    return f"bank-{bank_id}-v{version}"
+
+
+def _if_match_versions(if_match: ETags, bank_id: int) -> Optional[List[int]]:
+    """Return the row versions allowed by If-Match, or None if unconditional.
+
+    If-Match uses strong comparison (RFC 9110), so weak tags never match.
+    The tag of a compressed response names the same row version and is
+    accepted.
+    """
+    if not if_match or if_match.star_tag:
+        return None
+    prefix = f"bank-{bank_id}-v"
+    tags = [identity_etag(tag) for tag in if_match.as_set()]
+    return [int(tag[len(prefix):]) for tag in tags if tag.startswith(prefix) and tag[len(prefix):].isdigit()]
+
+
+def _precondition_failed(bank_id: int, version: Optional[int], web: Framework = FLASK) -> Tuple[Response, int]:
+    """Answer a conditional write that matched no row: 404 or 412 with the current ETag."""
+    if version is None:
+        return web.jsonify({"error": "Bank not found."}), 404
+    response = web.jsonify({"error": "Bank was modified by another request."})
+    response.set_etag(_bank_etag(bank_id, version))
+    return response, 412
+
+
+def _not_modified(etag: str, web: Framework = FLASK) -> Response:
+    """Return an empty 304 response carrying the current ETag."""
+    response = web.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _rows_response(rows: List[Dict[str, Any]], media_type: str, fields: List[str], web: Framework = FLASK) -> Response:
+    """Encode list rows as JSON (through the app's JSON provider) or a binary format."""
+    if media_type == JSON:
+        return web.jsonify(rows)
+    body = encode_rows(media_type, rows, [BANK_FIELDS[field] for field in fields])
+    return web.response_class(body, mimetype=media_type)
+
+
+def _parse_bank_payload(payload: Any) -> Tuple[str, str]:
+    """Validate a bank payload and return its stripped name and location."""
+    if not isinstance(payload, dict):
+        payload = {}
+    name = payload.get("name")
+    location = payload.get("location")
+    name = name.strip() if isinstance(name, str) else ""
+    location = location.strip() if isinstance(location, str) else ""
+    if not name or not location:
+        raise ValueError("name and location are required.")
+    # checked here rather than left to the database, so a queued create
+    # cannot fail its whole write-behind batch
+    if len(name) > MAX_FIELD_LENGTH or len(location) > MAX_FIELD_LENGTH:
+        raise ValueError(f"name and location must be at most {MAX_FIELD_LENGTH} characters.")
+    return name, location
+
+
+def _list_columns(fields: List[str]) -> List[Any]:
+    """Columns to select for `fields`, in the same order.
+
+    Rows are turned into dicts with `dict(zip(fields, row))`, so no ORM
+    objects are built. Bank.id is appended when not requested because the
+    next cursor is computed from it, and Bank.version because the page's
+    ETag is; zip() drops both again.
+    """
+    columns = [BANK_FIELDS[field] for field in fields]
+    if "id" not in fields:
+        columns.append(Bank.id)
+    columns.append(Bank.version)
+    return columns
+
+
+def _page_result(rows: List[Any], fields: List[str], next_cursor: Optional[int]) -> Dict[str, Any]:
+    """Build the cacheable result of a list page from rows of `_list_columns`.
+
+    The fingerprint hashes the ID and row version of every row and the next
+    cursor. Any insert, update or delete that changes what the page shows
+    also changes one of them, so no table-wide change counter is needed.
+    """
+    fingerprint = hashlib.sha1(repr(([(row.id, row.version) for row in rows], next_cursor)).encode("utf-8"))
+    return {
+        "rows": [dict(zip(fields, row)) for row in rows],
+        "next": next_cursor,
+        "fingerprint": fingerprint.hexdigest(),
+    }
+
+
+def _list_etag(fingerprint: str, media_type: str, params: Tuple[Any, ...]) -> str:
+    """Strong ETag of a list page in a given format."""
+    return hashlib.sha1(repr((fingerprint, media_type) + params).encode("utf-8")).hexdigest()
+
+
+def _parse_fields(raw: Optional[str]) -> List[str]:
+    """Parse the `fields` query argument into a list of Bank column names."""
+    if not raw:
+        return list(BANK_FIELDS)
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in BANK_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"fields must be a comma-separated subset of: {', '.join(BANK_FIELDS)}.")
+    return fields
+
+
+@dataclass(frozen=True)
+class ListRequest:
+    """The validated arguments of a list request."""
+
+    page: PageRequest
+    fields: List[str]
+    search: SearchRequest
+    # `fields` as sent, repeated in the link to the next page
+    raw_fields: Optional[str] = None
+
+    @property
+    def params(self) -> Tuple[Any, ...]:
+        """Everything that selects the page, used in its cache key and ETag."""
+        return (self.page.after, self.page.limit, tuple(self.fields)) + self.search.as_tuple()
+
+    def statement(self, dialect: str, full_text: bool) -> Select:
+        """SELECT of the page, one row past it to detect a next page."""
+        return apply_search(
+            keyset_select(_list_columns(self.fields), self.page),
+            self.search,
+            dialect,
+            full_text=full_text,
+            page=self.page,
+        )
+
+    def result(self, rows: List[Any]) -> Dict[str, Any]:
+        """Cacheable result of the rows returned by `statement`."""
+        rows, next_cursor = split_page(rows, self.page)
+        return _page_result(rows, self.fields, next_cursor)
+
+
+def _parse_list_request(args: Any) -> ListRequest:
+    """Parse the query arguments of a list request; raises ValueError."""
+    return ListRequest(
+        page=parse_page_args(args),
+        fields=_parse_fields(args.get("fields")),
+        search=parse_search_args(args),
+        raw_fields=args.get("fields"),
+    )
+
+
+def _list_response(
+    list_request: ListRequest, result: Dict[str, Any], media_type: str, if_none_match: ETags, web: Framework = FLASK
+) -> Any:
+    """Answer a list request from its (possibly cached) result.
+
+    The ETag is derived from the page itself, so a cached page answers a
+    conditional request without touching the database.
+    """
+    etag = _list_etag(result["fingerprint"], media_type, list_request.params)
+    if matches_if_none_match(if_none_match, etag):
+        return _not_modified(etag, web)
+
+    response = _rows_response(result["rows"], media_type, list_request.fields, web)
+    response.vary.add("Accept")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    if result["next"] is not None:
+        page, search = list_request.page, list_request.search
+        next_url = web.url_for(
+            "api.list_banks",
+            after=result["next"],
+            limit=page.limit,
+            fields=list_request.raw_fields,
+            name=search.name,
+            location=search.location,
+            q=search.q,
+        )
+        response.headers["X-Next-Cursor"] = str(result["next"])
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response, 200
+
+
 @api_bp.get("/banks")
 def list_banks():
-    """List all banks ordered by ID."""
-    session = _get_session()
+    """List one page of banks ordered by ID, optionally filtered.
+
+    Pages are addressed with a keyset cursor (`after` = last seen ID) rather
+    than an offset. The cursor for the next page is returned in the
+    `X-Next-Cursor` and `Link` headers while the body stays a JSON array.
+    `name` and `location` filter by prefix, `q` by substring of either.
+    The body format (JSON, MessagePack or Arrow) follows the Accept header.
+    """
     try:
-        banks = session.query(Bank).order_by(Bank.id).all()
-        return jsonify([_serialize_bank(bank) for bank in banks]), 200
-    finally:
-        session.close()
+        list_request = _parse_list_request(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    media_type = negotiate_format(request.accept_mimetypes, offered_formats(*LIST_FORMATS))
+    session = get_session()
+
+    def load_page() -> Dict[str, Any]:
+        stmt = list_request.statement(session.get_bind().dialect.name, current_app.config["SEARCH_FULL_TEXT"])
+        return list_request.result(session.execute(stmt).all())
+
+    result = _get_cache().get_list(list_request.params, load_page)
+    return _list_response(list_request, result, media_type, request.if_none_match)
+
+
+def _stream_export(media_type: str, dumps: Callable[[Any], str]) -> Iterator[Any]:
+    """Yield the banks table in `media_type`, one chunk per batch of rows.
+
+    Rows are fetched through a server-side cursor in batches of
+    EXPORT_BATCH_SIZE, so memory stays flat regardless of table size. The
+    session is opened inside the generator: the view's own context is torn
+    down before streaming starts, and only a session created here is closed
+    by the teardown that runs when the stream ends.
+    """
+    result = get_session().execute(
+        select(Bank.id, Bank.name, Bank.location)
+        .order_by(Bank.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    keys = list(result.keys())
+    batches = ([dict(zip(keys, row)) for row in batch] for batch in result.partitions())
+    if media_type == NDJSON:
+        for batch in batches:
+            yield "".join(dumps(row) + "\n" for row in batch)
+        return
+    if media_type != JSON:
+        yield from stream_rows(media_type, batches, list(BANK_FIELDS.values()))
+        return
+
+    # Each batch is encoded with one dumps() call; the brackets of the batch
+    # array are stripped so the chunks join into a single array.
+    yield "["
+    separator = ""
+    for batch in batches:
+        yield separator + dumps(batch)[1:-1]
+        separator = ","
+    yield "]"
+
+
+@api_bp.get("/banks/export")
+def export_banks():
+    """Stream every bank as NDJSON (default), JSON, MessagePack or Arrow.
+
+    The format is taken from `format` or, when absent, from the Accept header.
+    """
+    offered = offered_formats(NDJSON, JSON, MSGPACK, ARROW)
+    export_format = request.args.get("format")
+    if export_format is None:
+        media_type = negotiate_format(request.accept_mimetypes, offered)
+    else:
+        media_type = EXPORT_FORMATS.get(export_format.lower())
+        if media_type not in offered:
+            names = [name for name, value in EXPORT_FORMATS.items() if value in offered]
+            return jsonify({"error": f"format must be one of: {', '.join(names)}."}), 400
+
+    stream = _stream_export(media_type, current_app.json.dumps)
+    response = Response(stream_with_context(stream), mimetype=media_type)
+    response.vary.add("Accept")
+    return response, 200
+
+
+def _queue_full(web: Framework = FLASK) -> Tuple[Response, int]:
+    """503 telling the client to back off while the write-behind queue is full."""
+    response = web.jsonify({"error": "Too many pending writes; retry later."})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
+def _wait_for_commit(config: Any, headers: Any) -> bool:
+    """Whether to answer a queued create only once it is committed.
+
+    Durable mode waits unless the client sends `Prefer: respond-async`.
+    """
+    return config["WRITE_BEHIND_DURABLE"] and "respond-async" not in headers.get("Prefer", "")
+
+
+def _pending_response(write_behind: WriteBehindQueue, ticket: str, web: Framework = FLASK) -> Tuple[Response, int]:
+    """202 Accepted pointing at the status of a queued create."""
+    response = web.jsonify(write_behind.status(ticket))
+    response.headers["Location"] = web.url_for("api.write_status", ticket=ticket)
+    return response, 202
+
+
+def _created_response(bank: Dict[str, Any], web: Framework = FLASK) -> Tuple[Response, int]:
+    """201 Created with the new bank and its first ETag."""
+    response = web.jsonify(bank)
+    # a freshly inserted row always has the server default version
+    response.set_etag(_bank_etag(bank["id"], 1))
+    return response, 201
+
+
+def _status_response(
+    write_behind: Optional[WriteBehindQueue], ticket: str, web: Framework = FLASK
+) -> Tuple[Response, int]:
+    """The status of a queued create, with the bank's URL once it is committed."""
+    status = write_behind.status(ticket) if write_behind is not None else None
+    if status is None:
+        return web.jsonify({"error": "Unknown ticket."}), 404
+    response = web.jsonify(status)
+    if status["status"] == "committed":
+        response.headers["Location"] = web.url_for("api.get_bank", bank_id=status["bank"]["id"])
+    return response, 200
+
+
+def _enqueue_bank(write_behind: WriteBehindQueue, name: str, location: str) -> Tuple[Response, int]:
+    """Create a bank through the write-behind queue.
+
+    Durable mode waits for the group commit and answers 201 like the direct
+    path, or 202 if the commit takes longer than WRITE_BEHIND_WAIT_SECONDS.
+    Otherwise the answer is an immediate 202 with a ticket to poll.
+    """
+    try:
+        write = write_behind.submit(name, location)
+    except WriteBehindFull:
+        return _queue_full()
+    if _wait_for_commit(current_app.config, request.headers):
+        try:
+            return _created_response(write.future.result(current_app.config["WRITE_BEHIND_WAIT_SECONDS"]))
+        except FutureTimeout:
+            pass
+        except Exception:
+            return jsonify({"error": "Failed to create bank."}), 400
+    return _pending_response(write_behind, write.ticket)
 
 
 @api_bp.post("/banks")
 def create_bank():
-    """Create a new bank from the request payload."""
-    payload = request.get_json(silent=True) or {}
-    name = (payload.get("name") or "").strip()
-    location = (payload.get("location") or "").strip()
-    if not name or not location:
-        return jsonify({"error": "name and location are required."}), 400
+    """Create a new bank from the request payload.
 
-    session = _get_session()
+    With WRITE_BEHIND_ENABLED the bank is queued and group-committed instead
+    of being inserted in a transaction of its own.
+    """
+    try:
+        name, location = _parse_bank_payload(request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    write_behind = current_app.config.get("WRITE_BEHIND_QUEUE")
+    if write_behind is not None:
+        return _enqueue_bank(write_behind, name, location)
+
+    session = get_session()
     try:
         bank = Bank(name=name, location=location)
         session.add(bank)
         session.commit()
         session.refresh(bank)
-        return jsonify(_serialize_bank(bank)), 201
+        _get_cache().invalidate()
+        response = jsonify(_serialize_bank(bank))
+        response.set_etag(_bank_etag(bank.id, bank.version))
+        return response, 201
     except SQLAlchemyError:
         session.rollback()
         return jsonify({"error": "Failed to create bank."}), 400
-    finally:
-        session.close()
+
+
+@api_bp.get("/banks/pending/<ticket>")
+def write_status(ticket: str):
+    """Return the status of a bank creation queued by the write-behind mode."""
+    return _status_response(current_app.config.get("WRITE_BEHIND_QUEUE"), ticket)
 
 
 @api_bp.get("/banks/<int:bank_id>")
 def get_bank(bank_id: int):
     """Return a single bank by ID."""
-    session = _get_session()
-    try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
-            return jsonify({"error": "Bank not found."}), 404
-        return jsonify(_serialize_bank(bank)), 200
-    finally:
-        session.close()
+
+    def load_bank() -> Optional[Dict[str, Any]]:
+        return load_bank_row(get_session(), bank_id)
+
+    bank = _get_cache().get_bank(bank_id, load_bank)
+    if not bank:
+        return jsonify({"error": "Bank not found."}), 404
+
+    etag = _bank_etag(bank_id, bank["version"])
+    if matches_if_none_match(request.if_none_match, etag):
+        return _not_modified(etag)
+    response = jsonify({field: bank[field] for field in BANK_FIELDS})
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response, 200
 
 
 @api_bp.put("/banks/<int:bank_id>")
 def update_bank(bank_id: int):
-    """Update an existing bank by ID."""
-    payload = request.get_json(silent=True) or {}
-    name = (payload.get("name") or "").strip()
-    location = (payload.get("location") or "").strip()
-    if not name or not location:
-        return jsonify({"error": "name and location are required."}), 400
+    """Update an existing bank by ID.
 
-    session = _get_session()
+    The update is a single UPDATE statement returning the new row. With
+    If-Match it only applies while the bank still has that ETag's version;
+    otherwise the response is 412 with the current ETag.
+    """
     try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
-            return jsonify({"error": "Bank not found."}), 404
-        bank.name = name
-        bank.location = location
+        name, location = _parse_bank_payload(request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if current_app.config["REQUIRE_IF_MATCH"] and not request.if_match:
+        return jsonify({"error": "If-Match header is required."}), 428
+    versions = _if_match_versions(request.if_match, bank_id)
+
+    session = get_session()
+    try:
+        row = session.execute(update_bank_statement(bank_id, name, location, versions)).first()
+        if row is None:
+            session.rollback()
+            if versions is None:
+                return jsonify({"error": "Bank not found."}), 404
+            return _precondition_failed(bank_id, session.scalar(current_version_statement(bank_id)))
         session.commit()
-        return jsonify(_serialize_bank(bank)), 200
+        _get_cache().invalidate(bank_id)
+        response = jsonify({field: getattr(row, field) for field in BANK_FIELDS})
+        response.set_etag(_bank_etag(bank_id, row.version))
+        return response, 200
     except SQLAlchemyError:
         session.rollback()
         return jsonify({"error": "Failed to update bank."}), 400
-    finally:
-        session.close()
 
 
 @api_bp.delete("/banks/<int:bank_id>")
 def delete_bank(bank_id: int):
-    """Delete a bank by ID."""
-    session = _get_session()
-    try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
+    """Delete a bank by ID with a single DELETE statement; honours If-Match like PUT."""
+    if current_app.config["REQUIRE_IF_MATCH"] and not request.if_match:
+        return jsonify({"error": "If-Match header is required."}), 428
+    versions = _if_match_versions(request.if_match, bank_id)
+
+    session = get_session()
+    if session.execute(delete_bank_statement(bank_id, versions)).first() is None:
+        session.rollback()
+        if versions is None:
             return jsonify({"error": "Bank not found."}), 404
-        session.delete(bank)
-        session.commit()
-        return "", 204
-    finally:
-        session.close()
+        return _precondition_failed(bank_id, session.scalar(current_version_statement(bank_id)))
+    session.commit()
+    _get_cache().invalidate(bank_id)
+    return "", 204
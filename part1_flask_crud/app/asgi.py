@@ -0,0 +1,170 @@
+"""
+Optional ASGI serving mode.
+
+`create_asgi_app` serves the single-bank and list routes of the REST API
+from async Quart views on an `AsyncSession`, so a worker can keep many
+requests in flight while they wait on the database. Every other route (the
+HTML UI, bulk, export, health and stats endpoints) is passed through to the
+regular Flask app, which runs in a thread pool.
+
+The Flask request hooks do not run for the async routes. Compression and
+admission control are registered on the Quart app as well (sharing the
+Flask app's settings and admission counters), and so is the
+read-your-writes cookie, so a write through either app sends the client's
+following reads to the primary; instrumentation (Server-Timing,
+/metrics) and the query budget are not, so they only see routes served by
+Flask.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from flask import Flask
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from quart import Quart, Response, current_app, g, request
+from sqlalchemy.ext.asyncio import AsyncSession
+from werkzeug.exceptions import HTTPException
+
+from . import create_app
+from .admission import _refuse
+from .config import AppConfig
+from .db import DEFAULT_READ_YOUR_WRITES_SECONDS, _stick_to_primary, create_async_session_factory, get_engine
+from .negotiation import DEFAULT_COMPRESSION_MIN_SIZE, _choose_encoding, _mark_compressed, available_encodings, compress
+
+# Bulk requests may carry up to 10,000 items
+MAX_WSGI_BODY_SIZE = 16 * 1024 * 1024
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def get_async_session() -> AsyncSession:
+    """Return the async session bound to the current request."""
+    if "db_session" not in g:
+        g.db_session = current_app.config["ASYNC_DB_SESSION_FACTORY"]()
+    return g.db_session
+
+
+class RouteDispatcher:
+    """ASGI app sending requests the Quart app can route to it, others to Flask."""
+
+    def __init__(self, asgi_app: Quart, wsgi_app: Flask) -> None:
+        self.asgi_app = asgi_app
+        self.wsgi_app = AsyncioWSGIMiddleware(wsgi_app, max_body_size=MAX_WSGI_BODY_SIZE)
+        self._urls = asgi_app.url_map.bind("")
+
+    def handles(self, path: str, method: str) -> bool:
+        try:
+            self._urls.match(path, method=method)
+        except HTTPException:
+            return False
+        return True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not self.handles(scope["path"], scope["method"]):
+            await self.wsgi_app(scope, receive, send)
+        else:
+            await self.asgi_app(scope, receive, send)
+
+
+def _init_admission(app: Quart, wsgi_app: Flask) -> None:
+    """Admit async requests through the Flask app's controller, so limits are shared."""
+    admission = wsgi_app.config.get("ADMISSION")
+    if admission is None:
+        return
+
+    @app.before_request
+    async def admit_request() -> Any:
+        # admit() may wait for a free slot, which must not block the event loop
+        status, retry_after = await asyncio.to_thread(
+            admission.admit, request.remote_addr or "unknown", request.endpoint
+        )
+        if status:
+            return _refuse(status, retry_after)
+        g.admitted = True
+        return None
+
+    @app.teardown_request
+    async def release_slot(exc: Optional[BaseException]) -> None:
+        if g.pop("admitted", False):
+            admission.release()
+
+
+def _init_read_your_writes(app: Quart, wsgi_app: Flask) -> None:
+    """Set the read-your-writes cookie on async writes, as `db.init_app` does on Flask's."""
+    if wsgi_app.config.get("DB_REPLICAS") is None:
+        return
+    window_seconds = wsgi_app.config.get("DB_READ_YOUR_WRITES_SECONDS", DEFAULT_READ_YOUR_WRITES_SECONDS)
+    if window_seconds <= 0:
+        return
+
+    @app.after_request
+    async def stick_to_primary(response: Response) -> Response:
+        return _stick_to_primary(response, request.method, window_seconds)
+
+
+def _init_compression(app: Quart, wsgi_app: Flask) -> None:
+    """Compress async responses like `negotiation.init_app` does Flask's."""
+    if not wsgi_app.config.get("COMPRESSION_ENABLED", True):
+        return
+    encodings = available_encodings()
+    min_size = wsgi_app.config.get("COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE)
+
+    @app.after_request
+    async def compress_response(response: Response) -> Response:
+        encoding = _choose_encoding(response, request.accept_encodings, encodings)
+        if encoding is None:
+            return response
+        body = await response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(compress(encoding, body))
+        _mark_compressed(response, encoding)
+        return response
+
+
+def create_asgi_app(config_override: Optional[dict] = None) -> RouteDispatcher:
+    """Create the ASGI application.
+
+    With `config_override`, `ASYNC_DB_SESSION_FACTORY` must be an
+    `async_sessionmaker` and the rest is passed on to `create_app`.
+    """
+    wsgi_app = create_app(None if config_override is None else dict(config_override))
+    app = Quart(__name__, static_folder=None)
+
+    if config_override is None:
+        app.config["ASYNC_DB_SESSION_FACTORY"] = create_async_session_factory(AppConfig.from_env())
+    else:
+        app.config.update(config_override)
+    # The cache is shared so writes through either app invalidate it
+    app.config["BANK_CACHE"] = wsgi_app.config["BANK_CACHE"]
+    app.config["SEARCH_FULL_TEXT"] = wsgi_app.config["SEARCH_FULL_TEXT"]
+    app.config["REQUIRE_IF_MATCH"] = wsgi_app.config["REQUIRE_IF_MATCH"]
+    # One write-behind queue per process, so either app can report a ticket's status
+    app.config["WRITE_BEHIND_QUEUE"] = wsgi_app.config.get("WRITE_BEHIND_QUEUE")
+    app.config["WRITE_BEHIND_DURABLE"] = wsgi_app.config["WRITE_BEHIND_DURABLE"]
+    app.config["WRITE_BEHIND_WAIT_SECONDS"] = wsgi_app.config["WRITE_BEHIND_WAIT_SECONDS"]
+
+    @app.teardown_appcontext
+    async def close_session(exc: Optional[BaseException]) -> None:
+        session = g.pop("db_session", None)
+        if session is not None:
+            await session.close()
+
+    @app.after_serving
+    async def dispose_engine() -> None:
+        engine = get_engine(app.config["ASYNC_DB_SESSION_FACTORY"])
+        if engine is not None:
+            await engine.dispose()
+
+    _init_admission(app, wsgi_app)
+    _init_read_your_writes(app, wsgi_app)
+    _init_compression(app, wsgi_app)
+
+    from .async_api import api_bp  # imported here and not at the top to avoid circular imports
+    app.register_blueprint(api_bp, url_prefix="/api")
+
+    return RouteDispatcher(app, wsgi_app)
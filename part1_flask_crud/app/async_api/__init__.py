@@ -0,0 +1,5 @@
+from quart import Blueprint
+
+api_bp = Blueprint("api", __name__)
+
+from . import routes  # noqa: F401
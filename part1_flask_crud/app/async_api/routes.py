@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from quart import Response, current_app, jsonify, request, url_for
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..api.routes import (
+    BANK_FIELDS,
+    LIST_FORMATS,
+    Framework,
+    _bank_etag,
+    _created_response,
+    _if_match_versions,
+    _list_response,
+    _not_modified,
+    _parse_bank_payload,
+    _parse_list_request,
+    _pending_response,
+    _precondition_failed,
+    _queue_full,
+    _serialize_bank,
+    _status_response,
+    _wait_for_commit,
+)
+from ..asgi import get_async_session
+from ..cache import BankCache
+from ..models import Bank
+from ..negotiation import matches_if_none_match, negotiate_format, offered_formats
+from ..write_behind import WriteBehindFull, WriteBehindQueue
+from ..writes import current_version_statement, delete_bank_statement, update_bank_statement
+from . import api_bp
+
+QUART = Framework(Response, jsonify, url_for)
+
+
+def _get_cache() -> BankCache:
+    """Return the bank cache from the app config."""
+    return current_app.config["BANK_CACHE"]
+
+
+@api_bp.get("/banks")
+async def list_banks():
+    """List one page of banks; same contract as the sync `api.list_banks`."""
+    try:
+        list_request = _parse_list_request(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    media_type = negotiate_format(request.accept_mimetypes, offered_formats(*LIST_FORMATS))
+    session = get_async_session()
+
+    async def load_page() -> Dict[str, Any]:
+        stmt = list_request.statement(session.bind.dialect.name, current_app.config["SEARCH_FULL_TEXT"])
+        return list_request.result((await session.execute(stmt)).all())
+
+    result = await _get_cache().get_list_async(list_request.params, load_page)
+    return _list_response(list_request, result, media_type, request.if_none_match, QUART)
+
+
+async def _enqueue_bank(write_behind: WriteBehindQueue, name: str, location: str):
+    """Like the sync `_enqueue_bank`; waits for the group commit without blocking the loop."""
+    try:
+        write = write_behind.submit(name, location)
+    except WriteBehindFull:
+        return _queue_full(QUART)
+    if _wait_for_commit(current_app.config, request.headers):
+        try:
+            bank = await asyncio.wait_for(
+                asyncio.wrap_future(write.future), current_app.config["WRITE_BEHIND_WAIT_SECONDS"]
+            )
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            return jsonify({"error": "Failed to create bank."}), 400
+        else:
+            return _created_response(bank, QUART)
+    return _pending_response(write_behind, write.ticket, QUART)
+
+
+@api_bp.post("/banks")
+async def create_bank():
+    """Create a new bank from the request payload."""
+    try:
+        name, location = _parse_bank_payload(await request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    write_behind = current_app.config.get("WRITE_BEHIND_QUEUE")
+    if write_behind is not None:
+        return await _enqueue_bank(write_behind, name, location)
+
+    session = get_async_session()
+    try:
+        bank = Bank(name=name, location=location)
+        session.add(bank)
+        await session.commit()
+        await _get_cache().invalidate_async()
+        response = jsonify(_serialize_bank(bank))
+        response.set_etag(_bank_etag(bank.id, bank.version))
+        return response, 201
+    except SQLAlchemyError:
+        await session.rollback()
+        return jsonify({"error": "Failed to create bank."}), 400
+
+
+@api_bp.get("/banks/pending/<ticket>")
+async def write_status(ticket: str):
+    """Return the status of a bank creation queued by the write-behind mode."""
+    return _status_response(current_app.config.get("WRITE_BEHIND_QUEUE"), ticket, QUART)
+
+
+@api_bp.get("/banks/<int:bank_id>")
+async def get_bank(bank_id: int):
+    """Return a single bank by ID."""
+
+    async def load_bank() -> Optional[Dict[str, Any]]:
+        row = (
+            await get_async_session().execute(
+                select(Bank.id, Bank.name, Bank.location, Bank.version).where(Bank.id == bank_id)
+            )
+        ).first()
+        return row._asdict() if row else None
+
+    bank = await _get_cache().get_bank_async(bank_id, load_bank)
+    if not bank:
+        return jsonify({"error": "Bank not found."}), 404
+
+    etag = _bank_etag(bank_id, bank["version"])
+    if matches_if_none_match(request.if_none_match, etag):
+        return _not_modified(etag, QUART)
+    response = jsonify({field: bank[field] for field in BANK_FIELDS})
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response, 200
+
+
+@api_bp.put("/banks/<int:bank_id>")
+async def update_bank(bank_id: int):
+    """Update an existing bank by ID; same contract as the sync `api.update_bank`."""
+    try:
+        name, location = _parse_bank_payload(await request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if current_app.config["REQUIRE_IF_MATCH"] and not request.if_match:
+        return jsonify({"error": "If-Match header is required."}), 428
+    versions = _if_match_versions(request.if_match, bank_id)
+
+    session = get_async_session()
+    try:
+        row = (await session.execute(update_bank_statement(bank_id, name, location, versions))).first()
+        if row is None:
+            await session.rollback()
+            if versions is None:
+                return jsonify({"error": "Bank not found."}), 404
+            return _precondition_failed(bank_id, await session.scalar(current_version_statement(bank_id)), QUART)
+        await session.commit()
+        await _get_cache().invalidate_async(bank_id)
+        response = jsonify({field: getattr(row, field) for field in BANK_FIELDS})
+        response.set_etag(_bank_etag(bank_id, row.version))
+        return response, 200
+    except SQLAlchemyError:
+        await session.rollback()
+        return jsonify({"error": "Failed to update bank."}), 400
+
+
+@api_bp.delete("/banks/<int:bank_id>")
+async def delete_bank(bank_id: int):
+    """Delete a bank by ID; same contract as the sync `api.delete_bank`."""
+    if current_app.config["REQUIRE_IF_MATCH"] and not request.if_match:
+        return jsonify({"error": "If-Match header is required."}), 428
+    versions = _if_match_versions(request.if_match, bank_id)
+
+    session = get_async_session()
+    if (await session.execute(delete_bank_statement(bank_id, versions))).first() is None:
+        await session.rollback()
+        if versions is None:
+            return jsonify({"error": "Bank not found."}), 404
+        return _precondition_failed(bank_id, await session.scalar(current_version_statement(bank_id)), QUART)
+    await session.commit()
+    await _get_cache().invalidate_async(bank_id)
+    return "", 204
@@ -1,26 +1,58 @@
 from __future__ import annotations
 
-from flask import current_app, redirect, render_template, request, url_for
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import current_app, redirect, render_template, request, stream_template, url_for
 from flask import abort
+from markupsafe import Markup
 
+from ..cache import BankCache
+from ..db import get_session
 from ..models import Bank
+from ..pagination import PageRequest, keyset_select, parse_page_args, split_page
+from ..writes import current_version_statement, delete_bank_statement, load_bank_row, update_bank_statement
 from . import banks_bp
 
 
-def _get_session() -> Session:
-    session_factory = current_app.config["DB_SESSION_FACTORY"]
-    return session_factory()
+def _get_cache() -> BankCache:
+    return current_app.config["BANK_CACHE"]
+
+
+def _form_versions(raw: Optional[str]) -> Optional[List[int]]:
+    """The row version a form was rendered with, as `versions` for the write
+    statements; None (unconditional) for forms that carry none."""
+    return [int(raw)] if raw and raw.isdigit() else None
+
+
+class _PageRows:
+    """Rendered `<li>` rows of one keyset page, produced while iterating.
+
+    The page query runs on first iteration, i.e. inside the streamed
+    response, so its session is the one closed when the stream ends. Each
+    row comes from the fragment cache; only rows that changed are rendered.
+    `next_cursor` is set once the rows have been produced.
+    """
+
+    def __init__(self, page: PageRequest) -> None:
+        self.page = page
+        self.next_cursor: Optional[int] = None
+
+    def __iter__(self) -> Iterator[Markup]:
+        stmt = keyset_select([Bank.id, Bank.name, Bank.location, Bank.version], self.page)
+        rows, self.next_cursor = split_page(get_session().execute(stmt).all(), self.page)
+        cache = _get_cache()
+        template = current_app.jinja_env.get_template("bank_row.html")
+        for row in rows:
+            yield Markup(cache.get_row_fragment(row.id, row.version, lambda: template.render(bank=row)))
 
 
 @banks_bp.get("/")
 def list_banks():
-    session = _get_session()
     try:
-        banks = session.query(Bank).order_by(Bank.id).all()
-        return render_template("banks_list.html", banks=banks)
-    finally:
-        session.close()
+        page = parse_page_args(request.args)
+    except ValueError:
+        abort(400)
+    return stream_template("banks_list.html", rows=_PageRows(page), page=page)
 
 
 @banks_bp.get("/new")
@@ -35,38 +67,32 @@ def create_bank():
     if not name or not location:
         return render_template("bank_form.html", error="Name and location are required.")
 
-    session = _get_session()
-    try:
-        bank = Bank(name=name, location=location)
-        session.add(bank)
-        session.commit()
-        return redirect(url_for("banks.list_banks"))
-    finally:
-        session.close()
+    session = get_session()
+    bank = Bank(name=name, location=location)
+    session.add(bank)
+    session.commit()
+    _get_cache().invalidate()
+    return redirect(url_for("banks.list_banks"))
 
 
 @banks_bp.get("/<int:bank_id>")
 def bank_detail(bank_id: int):
-    session = _get_session()
-    try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
-            return render_template("bank_detail.html", bank=None), 404
-        return render_template("bank_detail.html", bank=bank)
-    finally:
-        session.close()
+    # same loader as the API: both share the `bank:<id>` cache entry
+    def load_bank() -> Optional[Dict[str, Any]]:
+        return load_bank_row(get_session(), bank_id)
+
+    bank = _get_cache().get_bank(bank_id, load_bank)
+    if not bank:
+        return render_template("bank_detail.html", bank=None), 404
+    return render_template("bank_detail.html", bank=bank)
 
 
 @banks_bp.get("/<int:bank_id>/edit")
 def edit_bank_form(bank_id: int):
-    session = _get_session()
-    try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
-            abort(404)
-        return render_template("bank_form.html", bank=bank, mode="edit")
-    finally:
-        session.close()
+    bank = get_session().get(Bank, bank_id)
+    if not bank:
+        abort(404)
+    return render_template("bank_form.html", bank=bank, mode="edit")
 
 
 @banks_bp.post("/<int:bank_id>/edit")
@@ -78,32 +104,39 @@ def update_bank_ui(bank_id: int):
         return render_template(
             "bank_form.html",
             error="Name and location are required.",
-            bank={"id": bank_id, "name": name, "location": location},
+            bank={"id": bank_id, "name": name, "location": location, "version": request.form.get("version")},
             mode="edit",
         ), 400
 
-    session = _get_session()
-    try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
+    # A single UPDATE that only applies while the bank still has the version
+    # the form was rendered with; a conflict re-renders the form.
+    session = get_session()
+    versions = _form_versions(request.form.get("version"))
+    if session.execute(update_bank_statement(bank_id, name, location, versions)).first() is None:
+        session.rollback()
+        version = session.scalar(current_version_statement(bank_id))
+        if version is None:
             abort(404)
-        bank.name = name
-        bank.location = location
-        session.commit()
-        return redirect(url_for("banks.bank_detail", bank_id=bank_id))
-    finally:
-        session.close()
+        return render_template(
+            "bank_form.html",
+            error="This bank was changed by someone else. Submit again to overwrite it.",
+            bank={"id": bank_id, "name": name, "location": location, "version": version},
+            mode="edit",
+        ), 409
+    session.commit()
+    _get_cache().invalidate(bank_id)
+    return redirect(url_for("banks.bank_detail", bank_id=bank_id))
 
 
 @banks_bp.post("/<int:bank_id>/delete")
 def delete_bank(bank_id: int):
-    session = _get_session()
-    try:
-        bank = session.get(Bank, bank_id)
-        if not bank:
+    session = get_session()
+    versions = _form_versions(request.args.get("version"))
+    if session.execute(delete_bank_statement(bank_id, versions)).first() is None:
+        session.rollback()
+        if session.scalar(current_version_statement(bank_id)) is None:
             abort(404)
-        session.delete(bank)
-        session.commit()
-        return redirect(url_for("banks.list_banks"))
-    finally:
-        session.close()
+        abort(409, description="This bank was changed by someone else. Reload the list and try again.")
+    session.commit()
+    _get_cache().invalidate(bank_id)
+    return redirect(url_for("banks.list_banks"))
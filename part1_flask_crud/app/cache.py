@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class CacheBackend(ABC):
+    """Minimal key/value interface implemented by every cache backend."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the cached value or `_MISSING`."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` under `key` for `ttl_seconds`."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove `key` if it is cached."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + amount)
+
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything (caching disabled)."""
+
+    def __init__(self) -> None:
+        super().__init__(ttl_seconds=0)
+
+    def get(self, key: str) -> Any:
+        return _MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0) -> None:
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.record("evictions")
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.record("evictions")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileCache(CacheBackend):
+    """Cache stored as JSON files in a local directory.
+
+    Every worker process on the host sees the same entries. Point `directory`
+    at a tmpfs mount such as `/dev/shm` to keep it in shared memory.
+
+    Entries nobody reads again, such as list pages of an old generation, are
+    removed by `sweep`. A write runs it at most once per TTL. A sweep
+    deletes expired files, then the oldest ones beyond `max_entries`.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = 60.0, max_entries: int = 10000) -> None:
+        super().__init__(ttl_seconds)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._last_sweep = time.monotonic()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return _MISSING
+        if entry["expires_at"] <= time.time():
+            self._unlink(path)
+            self.record("evictions")
+            return _MISSING
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        entry = {"expires_at": time.time() + self.ttl_seconds, "value": value}
+        # write to a temp file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp_path, self._path(key))
+        if time.monotonic() - self._last_sweep >= self.ttl_seconds:
+            self.sweep()
+
+    def delete(self, key: str) -> None:
+        self._unlink(self._path(key))
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            self._unlink(path)
+
+    def sweep(self) -> int:
+        """Delete expired entries and the oldest beyond `max_entries`; return how many."""
+        self._last_sweep = time.monotonic()
+        # an entry expires one TTL after it was written, i.e. after its mtime
+        cutoff = time.time() - self.ttl_seconds
+        live = []
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime <= cutoff:
+                self._unlink(path)
+                removed += 1
+            else:
+                live.append((mtime, path))
+        if len(live) > self.max_entries:
+            live.sort()
+            for _, path in live[: len(live) - self.max_entries]:
+                self._unlink(path)
+                removed += 1
+        if removed:
+            self.record("evictions", removed)
+        return removed
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def create_cache_backend(
+    backend: str,
+    ttl_seconds: float = 60.0,
+    max_entries: int = 10000,
+    directory: Optional[str] = None,
+) -> CacheBackend:
+    """Build a cache backend by name ('memory', 'file' or 'none')."""
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "file":
+        directory = directory or os.path.join(tempfile.gettempdir(), "validata-cache")
+        return FileCache(directory, ttl_seconds=ttl_seconds, max_entries=max_entries)
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend '{backend}'.")
+
+
+class BankCache:
+    """Read-through cache for bank lookups, bank list pages and HTML rows.
+
+    Single banks and their rendered HTML list rows are stored under their ID.
+    Each write to a bank also replaces its generation token, and a loaded
+    bank is only stored while the token is the one read before loading.
+    List pages are stored under a generation token that is replaced on every
+    write, which invalidates all cached pages at once without having to
+    enumerate them.
+    """
+
+    GENERATION_KEY = "banks:generation"
+
+    def __init__(self, backend: CacheBackend, should_store: Callable[[], bool] = lambda: True) -> None:
+        self.backend = backend
+        # Asked before a loaded bank or list page is stored; the app uses it
+        # to keep rows read from a lagging replica out of the shared cache.
+        self.should_store = should_store
+
+    def _lookup(self, key: str) -> Any:
+        """Return the cached value of `key`, or _MISSING, counting the hit or miss."""
+        value = self.backend.get(key)
+        self.backend.record("hits" if value is not _MISSING else "misses")
+        return value
+
+    def _store(self, key: str, value: Any) -> None:
+        if value is not None and self.should_store():
+            self.backend.set(key, value)
+
+    def _read_through(self, key: str, loader: Callable[[], Any], generation_key: Optional[str] = None) -> Any:
+        """Return the cached value of `key`, calling `loader` on a miss.
+
+        With `generation_key`, the loaded value is only stored if that token
+        is unchanged after loading: a write that committed while the loader
+        ran has replaced it, and the value may predate the write.
+        """
+        value = self._lookup(key)
+        if value is _MISSING:
+            generation = self.backend.get(generation_key) if generation_key else None
+            value = loader()
+            if generation_key is None or self.backend.get(generation_key) == generation:
+                self._store(key, value)
+        return value
+
+    async def _read_through_async(
+        self, key: str, loader: Callable[[], Awaitable[Any]], generation_key: Optional[str] = None
+    ) -> Any:
+        # Backend calls may block on disk (FileCache), so they run in a
+        # worker thread rather than on the event loop.
+        value = await asyncio.to_thread(self._lookup, key)
+        if value is _MISSING:
+            generation = await asyncio.to_thread(self.backend.get, generation_key) if generation_key else None
+            value = await loader()
+            if generation_key is None or await asyncio.to_thread(self.backend.get, generation_key) == generation:
+                await asyncio.to_thread(self._store, key, value)
+        return value
+
+    def _generation(self) -> str:
+        generation = self.backend.get(self.GENERATION_KEY)
+        if generation is _MISSING:
+            generation = uuid.uuid4().hex
+            self.backend.set(self.GENERATION_KEY, generation)
+        return generation
+
+    def get_bank(self, bank_id: int, loader: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Return a serialized bank, calling `loader` on a miss."""
+        return self._read_through(f"bank:{bank_id}", loader, self._bank_generation_key(bank_id))
+
+    def get_list(self, params: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """Return a cached list result for the given query parameters."""
+        return self._read_through(self._list_key(params), loader)
+
+    async def get_bank_async(
+        self, bank_id: int, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Like `get_bank`, awaiting `loader` on a miss."""
+        return await self._read_through_async(f"bank:{bank_id}", loader, self._bank_generation_key(bank_id))
+
+    async def get_list_async(self, params: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Like `get_list`, awaiting `loader` on a miss."""
+        # the key reads the list generation from the backend
+        key = await asyncio.to_thread(self._list_key, params)
+        return await self._read_through_async(key, loader)
+
+    def get_row_fragment(self, bank_id: int, version: int, render: Callable[[], str]) -> str:
+        """Return the rendered HTML list row of a bank, calling `render` on a miss.
+
+        The row version is stored with the fragment and must match, so a
+        fragment rendered from an older row is never served, even when the
+        render raced with an invalidation.
+        """
+        key = f"bank:{bank_id}:row"
+        entry = self.backend.get(key)
+        if entry is not _MISSING and entry["version"] == version:
+            self.backend.record("hits")
+            return entry["html"]
+        self.backend.record("misses")
+        html = render()
+        self.backend.set(key, {"version": version, "html": html})
+        return html
+
+    @staticmethod
+    def _bank_generation_key(bank_id: int) -> str:
+        return f"bank:{bank_id}:generation"
+
+    def _list_key(self, params: Tuple[Hashable, ...]) -> str:
+        return f"banks:list:{self._generation()}:{params!r}"
+
+    def invalidate(self, *bank_ids: int) -> None:
+        """Drop the given banks, their HTML rows and every cached list page."""
+        for bank_id in bank_ids:
+            self.backend.delete(f"bank:{bank_id}")
+            self.backend.delete(f"bank:{bank_id}:row")
+            # stops readers that loaded the row before this write from caching it
+            self.backend.set(self._bank_generation_key(bank_id), uuid.uuid4().hex)
+        self.backend.set(self.GENERATION_KEY, uuid.uuid4().hex)
+        self.backend.record("invalidations")
+
+    async def invalidate_async(self, *bank_ids: int) -> None:
+        """Like `invalidate`, without blocking the event loop on the backend."""
+        await asyncio.to_thread(self.invalidate, *bank_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the backend counters as a plain dict."""
+        stats = asdict(self.backend.stats)
+        stats["backend"] = type(self.backend).__name__
+        return stats
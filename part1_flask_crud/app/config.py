@@ -1,12 +1,72 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
 from dotenv import load_dotenv
 load_dotenv()
 
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, raising ValueError if malformed."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.") from None
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, raising ValueError if malformed."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number.") from None
+
+
+def _env_budgets(name: str) -> Dict[str, int]:
+    """Parse 'endpoint=budget,...' (e.g. 'api.list_banks=2') into a dict."""
+    budgets: Dict[str, int] = {}
+    for item in os.getenv(name, "").split(","):
+        if not item.strip():
+            continue
+        endpoint, sep, value = item.partition("=")
+        try:
+            if not sep:
+                raise ValueError
+            budgets[endpoint.strip()] = int(value)
+        except ValueError:
+            raise ValueError(f"{name} must look like 'endpoint=budget,endpoint=budget'.") from None
+    return budgets
+
+
+def _env_rates(name: str) -> Dict[str, float]:
+    """Parse 'endpoint=rate,...' (e.g. 'api.create_bank=50') into a dict."""
+    rates: Dict[str, float] = {}
+    for item in os.getenv(name, "").split(","):
+        if not item.strip():
+            continue
+        endpoint, sep, value = item.partition("=")
+        try:
+            if not sep:
+                raise ValueError
+            rates[endpoint.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"{name} must look like 'endpoint=rate,endpoint=rate'.") from None
+    return rates
+
+
+def _env_list(name: str) -> Tuple[str, ...]:
+    """Parse a comma-separated environment variable, skipping empty items."""
+    return tuple(item.strip() for item in os.getenv(name, "").split(",") if item.strip())
+
+
 @dataclass(frozen=True)
 class AppConfig:
     """Application configuration loaded from environment variables."""
@@ -17,6 +77,39 @@ class AppConfig:
     db_user: Optional[str]
     db_password: Optional[str]
     db_trust_server_cert: bool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 1800
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_read_replicas: Tuple[str, ...] = ()
+    db_replica_strategy: str = "round_robin"
+    db_read_your_writes_seconds: float = 5.0
+    cache_backend: str = "memory"
+    cache_ttl_seconds: float = 60.0
+    cache_max_entries: int = 10000
+    cache_dir: Optional[str] = None
+    instrumentation_enabled: bool = False
+    query_budget_enabled: bool = False
+    query_budget_mode: str = "log"
+    query_budget_default: int = 10
+    query_budgets: Dict[str, int] = field(default_factory=dict)
+    search_full_text: bool = True
+    json_provider: str = "auto"
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    require_if_match: bool = False
+    write_behind_enabled: bool = False
+    write_behind_durable: bool = True
+    write_behind_interval_ms: float = 10.0
+    write_behind_max_batch: int = 500
+    write_behind_max_queue: int = 10000
+    write_behind_wait_seconds: float = 10.0
+    admission_enabled: bool = False
+    rate_limit_per_client: float = 0.0
+    rate_limit_burst: int = 20
+    rate_limits: Dict[str, float] = field(default_factory=dict)
+    admission_max_concurrent: int = 0
 
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -27,6 +120,39 @@ class AppConfig:
         db_user = os.getenv("DB_USER")
         db_password = os.getenv("DB_PASSWORD")
         db_trust_server_cert = os.getenv("DB_TRUST_SERVER_CERT", "true").strip().lower() == "true"
+        db_pool_size = _env_int("DB_POOL_SIZE", 5)
+        db_max_overflow = _env_int("DB_MAX_OVERFLOW", 10)
+        db_pool_recycle = _env_int("DB_POOL_RECYCLE", 1800)
+        db_pool_timeout = _env_float("DB_POOL_TIMEOUT", 30.0)
+        db_pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").strip().lower() == "true"
+        db_read_replicas = _env_list("DB_READ_REPLICAS")
+        db_replica_strategy = os.getenv("DB_REPLICA_STRATEGY", "round_robin").strip().lower()
+        db_read_your_writes_seconds = _env_float("DB_READ_YOUR_WRITES_SECONDS", 5.0)
+        cache_backend = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+        cache_ttl_seconds = _env_float("CACHE_TTL_SECONDS", 60.0)
+        cache_max_entries = _env_int("CACHE_MAX_ENTRIES", 10000)
+        cache_dir = os.getenv("CACHE_DIR") or None
+        instrumentation_enabled = os.getenv("INSTRUMENTATION_ENABLED", "false").strip().lower() == "true"
+        query_budget_enabled = os.getenv("QUERY_BUDGET_ENABLED", "false").strip().lower() == "true"
+        query_budget_mode = os.getenv("QUERY_BUDGET_MODE", "log").strip().lower()
+        query_budget_default = _env_int("QUERY_BUDGET_DEFAULT", 10)
+        query_budgets = _env_budgets("QUERY_BUDGETS")
+        search_full_text = os.getenv("SEARCH_FULL_TEXT", "true").strip().lower() == "true"
+        json_provider = os.getenv("JSON_PROVIDER", "auto").strip().lower()
+        compression_enabled = os.getenv("COMPRESSION_ENABLED", "true").strip().lower() == "true"
+        compression_min_size = _env_int("COMPRESSION_MIN_SIZE", 1024)
+        require_if_match = os.getenv("REQUIRE_IF_MATCH", "false").strip().lower() == "true"
+        write_behind_enabled = os.getenv("WRITE_BEHIND_ENABLED", "false").strip().lower() == "true"
+        write_behind_durable = os.getenv("WRITE_BEHIND_DURABLE", "true").strip().lower() == "true"
+        write_behind_interval_ms = _env_float("WRITE_BEHIND_INTERVAL_MS", 10.0)
+        write_behind_max_batch = _env_int("WRITE_BEHIND_MAX_BATCH", 500)
+        write_behind_max_queue = _env_int("WRITE_BEHIND_MAX_QUEUE", 10000)
+        write_behind_wait_seconds = _env_float("WRITE_BEHIND_WAIT_SECONDS", 10.0)
+        admission_enabled = os.getenv("ADMISSION_ENABLED", "false").strip().lower() == "true"
+        rate_limit_per_client = _env_float("RATE_LIMIT_PER_CLIENT", 0.0)
+        rate_limit_burst = _env_int("RATE_LIMIT_BURST", 20)
+        rate_limits = _env_rates("RATE_LIMITS")
+        admission_max_concurrent = _env_int("ADMISSION_MAX_CONCURRENT", 0)
 
         if not db_server:
             raise ValueError("DB_SERVER is required.")
@@ -39,6 +165,34 @@ class AppConfig:
                 raise ValueError("DB_USER is required when DB_AUTH_MODE=sql.")
             if not (db_password and db_password.strip()):
                 raise ValueError("DB_PASSWORD is required when DB_AUTH_MODE=sql.")
+        if db_pool_size < 1:
+            raise ValueError("DB_POOL_SIZE must be at least 1.")
+        if db_replica_strategy not in {"round_robin", "least_connections"}:
+            raise ValueError("DB_REPLICA_STRATEGY must be 'round_robin' or 'least_connections'.")
+        if db_read_your_writes_seconds < 0:
+            raise ValueError("DB_READ_YOUR_WRITES_SECONDS must not be negative.")
+        if db_max_overflow < 0:
+            raise ValueError("DB_MAX_OVERFLOW must not be negative.")
+        if query_budget_mode not in {"log", "raise"}:
+            raise ValueError("QUERY_BUDGET_MODE must be 'log' or 'raise'.")
+        if cache_backend not in {"memory", "file", "none"}:
+            raise ValueError("CACHE_BACKEND must be 'memory', 'file' or 'none'.")
+        if json_provider not in {"auto", "orjson", "msgspec", "stdlib"}:
+            raise ValueError("JSON_PROVIDER must be 'auto', 'orjson', 'msgspec' or 'stdlib'.")
+        if compression_min_size < 0:
+            raise ValueError("COMPRESSION_MIN_SIZE must not be negative.")
+        if write_behind_interval_ms < 0:
+            raise ValueError("WRITE_BEHIND_INTERVAL_MS must not be negative.")
+        if write_behind_max_batch < 1:
+            raise ValueError("WRITE_BEHIND_MAX_BATCH must be at least 1.")
+        if write_behind_max_queue < 1:
+            raise ValueError("WRITE_BEHIND_MAX_QUEUE must be at least 1.")
+        if rate_limit_per_client < 0 or any(rate <= 0 for rate in rate_limits.values()):
+            raise ValueError("Rate limits must be positive (RATE_LIMIT_PER_CLIENT may be 0 to disable it).")
+        if rate_limit_burst < 1:
+            raise ValueError("RATE_LIMIT_BURST must be at least 1.")
+        if admission_max_concurrent < 0:
+            raise ValueError("ADMISSION_MAX_CONCURRENT must not be negative.")
 
         return cls(
             db_server=db_server,
@@ -47,4 +201,37 @@ class AppConfig:
             db_user=db_user,
             db_password=db_password,
             db_trust_server_cert=db_trust_server_cert,
+            db_pool_size=db_pool_size,
+            db_max_overflow=db_max_overflow,
+            db_pool_recycle=db_pool_recycle,
+            db_pool_timeout=db_pool_timeout,
+            db_pool_pre_ping=db_pool_pre_ping,
+            db_read_replicas=db_read_replicas,
+            db_replica_strategy=db_replica_strategy,
+            db_read_your_writes_seconds=db_read_your_writes_seconds,
+            cache_backend=cache_backend,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache_max_entries=cache_max_entries,
+            cache_dir=cache_dir,
+            instrumentation_enabled=instrumentation_enabled,
+            query_budget_enabled=query_budget_enabled,
+            query_budget_mode=query_budget_mode,
+            query_budget_default=query_budget_default,
+            query_budgets=query_budgets,
+            search_full_text=search_full_text,
+            json_provider=json_provider,
+            compression_enabled=compression_enabled,
+            compression_min_size=compression_min_size,
+            require_if_match=require_if_match,
+            write_behind_enabled=write_behind_enabled,
+            write_behind_durable=write_behind_durable,
+            write_behind_interval_ms=write_behind_interval_ms,
+            write_behind_max_batch=write_behind_max_batch,
+            write_behind_max_queue=write_behind_max_queue,
+            write_behind_wait_seconds=write_behind_wait_seconds,
+            admission_enabled=admission_enabled,
+            rate_limit_per_client=rate_limit_per_client,
+            rate_limit_burst=rate_limit_burst,
+            rate_limits=rate_limits,
+            admission_max_concurrent=admission_max_concurrent,
         )
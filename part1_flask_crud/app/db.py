@@ -1,23 +1,82 @@
 from __future__ import annotations
 
 import logging
-from typing import Callable
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from urllib.parse import quote_plus
 
+from flask import Flask, Response, current_app, g, has_app_context, has_request_context, request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from .config import AppConfig
 
 logger = logging.getLogger(__name__)
 
+REPLICA_STRATEGIES = ("round_robin", "least_connections")
+DEFAULT_READ_YOUR_WRITES_SECONDS = 5.0
+# Holds the time until which a client that just wrote reads from the primary
+STICKY_COOKIE = "db_primary_until"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-def build_connection_string(config: AppConfig) -> str:
-    """Build the SQL Server ODBC connection string from config."""
+
+@dataclass
+class PoolMetrics:
+    """Checkout wait-time counters collected by InstrumentedQueuePool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def observe(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args: Any, max_overflow: int = 10, **kwargs: Any) -> None:
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # QueuePool keeps this private; admission and pool stats need it
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+
+def build_connection_string(config: AppConfig, server: Optional[str] = None) -> str:
+    """Build the SQL Server ODBC connection string from config.
+
+    `server` overrides `config.db_server`, e.g. for a read replica.
+    """
     driver = "ODBC Driver 18 for SQL Server"
     base = (
         f"Driver={{{driver}}};"
-        f"Server={config.db_server};"
+        f"Server={server or config.db_server};"
         f"Database={config.db_name};"
         f"TrustServerCertificate={'yes' if config.db_trust_server_cert else 'no'};"
     )
@@ -26,13 +85,227 @@ def build_connection_string(config: AppConfig) -> str:
     return base + f"UID={config.db_user};PWD={config.db_password};"
 
 
-def create_session_factory(config: AppConfig) -> Callable[[], Session]:
-    """Create a SQLAlchemy session factory for the configured database."""
-    conn_str = build_connection_string(config)
+def create_session_factory(config: AppConfig, server: Optional[str] = None) -> Callable[[], Session]:
+    """Create a SQLAlchemy session factory for the configured database.
+
+    `server` selects another server with the same settings (a read replica).
+    """
+    server = server or config.db_server
+    conn_str = build_connection_string(config, server)
     engine = create_engine(
         f"mssql+pyodbc:///?odbc_connect={quote_plus(conn_str)}",
-        pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_recycle=config.db_pool_recycle,
+        pool_timeout=config.db_pool_timeout,
+        pool_pre_ping=config.db_pool_pre_ping,
+        fast_executemany=True,
         future=True,
     )
-    logger.info("Database engine initialized for server '%s'.", config.db_server)
+    logger.info(
+        "Database engine initialized for server '%s' (pool_size=%s, max_overflow=%s).",
+        server,
+        config.db_pool_size,
+        config.db_max_overflow,
+    )
     return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
+def create_async_session_factory(config: AppConfig) -> Callable[[], Any]:
+    """Create an `AsyncSession` factory for the configured database.
+
+    Uses the aioodbc driver with the same connection string and pool
+    settings as `create_session_factory`. Sessions do not expire objects on
+    commit, so attributes can be read afterwards without implicit I/O.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    conn_str = build_connection_string(config)
+    engine = create_async_engine(
+        f"mssql+aioodbc:///?odbc_connect={quote_plus(conn_str)}",
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_recycle=config.db_pool_recycle,
+        pool_timeout=config.db_pool_timeout,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+    logger.info("Async database engine initialized for server '%s'.", config.db_server)
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def get_engine(session_factory: Callable[[], Session]) -> Optional[Engine]:
+    """Return the engine a sessionmaker is bound to, if any."""
+    kw = getattr(session_factory, "kw", {})
+    return kw.get("bind")
+
+
+def pool_capacity(engine: Optional[Engine]) -> Optional[int]:
+    """Connections the engine's pool can hand out at once.
+
+    None when the pool is unbounded (negative max_overflow) or its limit is
+    unknown, i.e. it is not an InstrumentedQueuePool.
+    """
+    pool = engine.pool if engine is not None else None
+    max_overflow = getattr(pool, "max_overflow", None)
+    if not isinstance(pool, QueuePool) or max_overflow is None or max_overflow < 0:
+        return None
+    return pool.size() + max_overflow
+
+
+def pool_stats(engine: Optional[Engine]) -> Dict[str, Any]:
+    """Describe pool occupancy and checkout wait times for an engine."""
+    if engine is None:
+        return {}
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        capacity = pool_capacity(engine)
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            saturation=pool.checkedout() / capacity if capacity else None,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            checkout_timeouts=metrics.timeouts,
+            checkout_wait_seconds_total=metrics.wait_seconds_total,
+            checkout_wait_seconds_max=metrics.wait_seconds_max,
+        )
+    return stats
+
+
+class ReplicaRouter:
+    """Chooses the read replica that serves a read-only request.
+
+    `round_robin` cycles through the replicas; `least_connections` picks the
+    one with the fewest requests in flight from this process. Every
+    `acquire` must be paired with a `release`.
+    """
+
+    def __init__(self, session_factories: Sequence[Callable[[], Session]], strategy: str = "round_robin") -> None:
+        if not session_factories:
+            raise ValueError("At least one replica session factory is required.")
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy {strategy!r}.")
+        self.session_factories = list(session_factories)
+        self.strategy = strategy
+        self.active = [0] * len(self.session_factories)
+        self.served = [0] * len(self.session_factories)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        """Pick a replica for one request and return its index."""
+        with self._lock:
+            if self.strategy == "least_connections":
+                # ties go to the replica that has served least, so idle replicas still rotate
+                index = min(range(len(self.active)), key=lambda i: (self.active[i], self.served[i]))
+            else:
+                index = self._next
+                self._next = (index + 1) % len(self.session_factories)
+            self.active[index] += 1
+            self.served[index] += 1
+        return index
+
+    def release(self, index: int) -> None:
+        with self._lock:
+            self.active[index] -= 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Describe each replica: requests in flight and served, and its pool."""
+        with self._lock:
+            counts = list(zip(self.active, self.served))
+        return [
+            {"active": active, "served": served, **pool_stats(get_engine(factory))}
+            for (active, served), factory in zip(counts, self.session_factories)
+        ]
+
+
+def _reads_from_replica() -> bool:
+    """Whether the current request may be served by a read replica.
+
+    Only read-only methods are, and not within the read-your-writes window
+    that follows a write by the same client.
+    """
+    if not has_request_context() or request.method not in READ_METHODS:
+        return False
+    primary_until = request.cookies.get(STICKY_COOKIE)
+    if not primary_until:
+        return True
+    try:
+        return float(primary_until) <= time.time()
+    except ValueError:
+        return True
+
+
+def served_by_primary() -> bool:
+    """Whether the current request has read nothing from a read replica."""
+    return not has_app_context() or "db_replica" not in g
+
+
+def get_session() -> Session:
+    """Return the session bound to the current request.
+
+    The session is created on first use and closed by the teardown hook
+    registered in `init_app`, so routes never have to close it themselves.
+    With read replicas configured, read-only requests get a replica session.
+    """
+    if "db_session" not in g:
+        replicas: Optional[ReplicaRouter] = current_app.config.get("DB_REPLICAS")
+        if replicas is not None and _reads_from_replica():
+            g.db_replica = replicas.acquire()
+            g.db_session = replicas.session_factories[g.db_replica]()
+        else:
+            g.db_session = current_app.config["DB_SESSION_FACTORY"]()
+    return g.db_session
+
+
+def _stick_to_primary(response: Response, method: str, window_seconds: float) -> Response:
+    """After a successful write, send the client's reads to the primary for a while.
+
+    Takes the request method rather than reading `request`, so the async
+    app can register it on its own responses too.
+    """
+    if method not in READ_METHODS and response.status_code < 400:
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + window_seconds:.3f}",
+            max_age=math.ceil(window_seconds),
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+def init_app(app: Flask) -> None:
+    """Register the request-scoped session teardown on the app.
+
+    When `DB_REPLICA_SESSION_FACTORIES` is set, read-only requests are
+    routed to those replicas (`DB_REPLICA_STRATEGY`). A client that writes
+    reads from the primary for `DB_READ_YOUR_WRITES_SECONDS` afterwards,
+    tracked by a cookie, so it sees its own changes despite replication lag.
+    """
+    replica_factories = app.config.get("DB_REPLICA_SESSION_FACTORIES")
+    if replica_factories:
+        replicas = ReplicaRouter(replica_factories, app.config.get("DB_REPLICA_STRATEGY", "round_robin"))
+        app.config["DB_REPLICAS"] = replicas
+        window_seconds = app.config.get("DB_READ_YOUR_WRITES_SECONDS", DEFAULT_READ_YOUR_WRITES_SECONDS)
+        if window_seconds > 0:
+
+            @app.after_request
+            def stick_to_primary(response: Response) -> Response:
+                return _stick_to_primary(response, request.method, window_seconds)
+
+    @app.teardown_appcontext
+    def close_session(exc: Optional[BaseException]) -> None:
+        session = g.pop("db_session", None)
+        if session is not None:
+            session.close()
+        replica = g.pop("db_replica", None)
+        if replica is not None:
+            current_app.config["DB_REPLICAS"].release(replica)
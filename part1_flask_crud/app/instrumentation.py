@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, has_app_context, request, template_rendered, before_render_template
+from flask.json.provider import JSONProvider
+from werkzeug.wsgi import ClosingIterator
+
+from .db import get_engine, pool_stats
+from .sql_events import observe_statements
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Sequence[str] = ()) -> None:
+        key = tuple(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.label_names + ("le",), key + (repr(float(bound)),))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.label_names + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                plain = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{plain} {total}")
+                lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Sequence[str] = (), amount: float = 1) -> None:
+        key = tuple(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+def _render_gauges(prefix: str, values: Dict[str, Any], kind: str = "gauge") -> List[str]:
+    """Render the numeric entries of a stats dict as unlabelled metrics."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}_total" if kind == "counter" else f"{prefix}_{key}"
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return lines
+
+
+class MetricsRegistry:
+    """Request metrics collected by the instrumentation middleware."""
+
+    def __init__(self) -> None:
+        labels = ("method", "endpoint")
+        self.requests = Counter("http_requests_total", "Requests handled.", labels + ("status",))
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Wall time per request.", labels, LATENCY_BUCKETS
+        )
+        self.sql_duration = Histogram(
+            "http_request_sql_duration_seconds", "Time spent in SQL per request.", labels, LATENCY_BUCKETS
+        )
+        self.sql_queries = Histogram(
+            "http_request_sql_queries", "SQL statements per request.", labels, QUERY_COUNT_BUCKETS
+        )
+        self.serialize_duration = Histogram(
+            "http_request_serialize_duration_seconds", "JSON serialization time per request.", labels, LATENCY_BUCKETS
+        )
+        self.render_duration = Histogram(
+            "http_request_render_duration_seconds", "Template render time per request.", labels, LATENCY_BUCKETS
+        )
+
+    def metrics(self) -> Iterable[Any]:
+        return (
+            self.requests,
+            self.duration,
+            self.sql_duration,
+            self.sql_queries,
+            self.serialize_duration,
+            self.render_duration,
+        )
+
+    def render(self, extra_lines: Iterable[str] = ()) -> str:
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        lines.extend(extra_lines)
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class RequestTimings:
+    """Timings accumulated while a single request is handled."""
+
+    start: float
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    render_seconds: float = 0.0
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the timings of the current request, if it is instrumented."""
+    if not has_app_context():
+        return None
+    return g.get("request_timings")
+
+
+def _record_statement(statement: str, seconds: float) -> None:
+    timings = current_timings()
+    if timings is not None:
+        timings.sql_count += 1
+        timings.sql_seconds += seconds
+
+
+def _before_render(sender, template, context, **extra) -> None:
+    if current_timings() is not None:
+        g.setdefault("render_start_times", []).append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra) -> None:
+    timings = current_timings()
+    starts = g.get("render_start_times") if timings is not None else None
+    if starts:
+        timings.render_seconds += time.perf_counter() - starts.pop()
+
+
+class TimedJSONProvider(JSONProvider):
+    """Delegating JSON provider that records serialization time."""
+
+    def __init__(self, app: Flask, inner: JSONProvider) -> None:
+        super().__init__(app)
+        self.inner = inner
+
+    def _timed(self, func, *args: Any, **kwargs: Any) -> Any:
+        timings = current_timings()
+        if timings is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.serialize_seconds += time.perf_counter() - start
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._timed(self.inner.dumps, obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return self.inner.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        return self._timed(self.inner.response, *args, **kwargs)
+
+
+def _server_timing(timings: RequestTimings, total_seconds: float) -> str:
+    return ", ".join(
+        [
+            f"total;dur={total_seconds * 1000:.3f}",
+            f'db;dur={timings.sql_seconds * 1000:.3f};desc="{timings.sql_count} queries"',
+            f"serialize;dur={timings.serialize_seconds * 1000:.3f}",
+            f"render;dur={timings.render_seconds * 1000:.3f}",
+        ]
+    )
+
+
+def init_app(app: Flask) -> None:
+    """Enable per-request timing, Server-Timing headers and GET /metrics.
+
+    Streamed responses (the HTML bank list, exports) are recorded in
+    /metrics once the server closes the stream, but carry no Server-Timing
+    header: it would have to be sent before the body is produced.
+    SQL statements are counted through the shared engine hook in
+    `sql_events`, so this works the same with SQLite in tests as with SQL
+    Server in production.
+    """
+    registry = MetricsRegistry()
+    app.config["METRICS"] = registry
+    app.json = TimedJSONProvider(app, app.json)
+
+    observe_statements(_record_statement)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def start_timer() -> None:
+        g.request_timings = RequestTimings(start=time.perf_counter())
+
+    def record(timings: RequestTimings, labels: Tuple[str, str], status_code: int) -> float:
+        total = time.perf_counter() - timings.start
+        registry.requests.inc(labels + (str(status_code),))
+        registry.duration.observe(total, labels)
+        registry.sql_duration.observe(timings.sql_seconds, labels)
+        registry.sql_queries.observe(timings.sql_count, labels)
+        registry.serialize_duration.observe(timings.serialize_seconds, labels)
+        registry.render_duration.observe(timings.render_seconds, labels)
+        return total
+
+    @app.after_request
+    def record_timings(response: Response) -> Response:
+        timings = g.get("request_timings")
+        if timings is None:
+            return response
+        labels = (request.method, request.url_rule.rule if request.url_rule else "<unmatched>")
+        if response.is_streamed:
+            # A streamed body runs its queries and templates after this
+            # hook, so it is recorded when the server closes the stream;
+            # its headers are already sent by then, so no Server-Timing.
+            status_code = response.status_code
+            response.response = ClosingIterator(response.response, lambda: record(timings, labels, status_code))
+            return response
+        del g.request_timings
+        response.headers["Server-Timing"] = _server_timing(timings, record(timings, labels, response.status_code))
+        return response
+
+    @app.get("/metrics")
+    def metrics():
+        """Expose request histograms, cache counters and pool gauges."""
+        extra = _render_gauges("bank_cache", app.config["BANK_CACHE"].stats(), kind="counter")
+        extra += _render_gauges("db_pool", pool_stats(get_engine(app.config["DB_SESSION_FACTORY"])))
+        admission = app.config.get("ADMISSION")
+        if admission is not None:
+            extra += _render_gauges("admission", admission.stats())
+        return Response(registry.render(extra), mimetype="text/plain; version=0.0.4")
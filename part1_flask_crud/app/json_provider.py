@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Type
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+logger = logging.getLogger(__name__)
+
+JSON_PROVIDERS = ("auto", "orjson", "msgspec", "stdlib")
+
+
+class _BytesJSONProvider(JSONProvider, ABC):
+    """Base for providers whose encoder produces bytes.
+
+    `response()` hands the bytes straight to the response instead of going
+    through `dumps()`, which must return a str.
+    """
+
+    mimetype = "application/json"
+
+    @abstractmethod
+    def encode(self, obj: Any, indent: bool = False) -> bytes:
+        """Encode `obj` as UTF-8 JSON bytes."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.encode(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.encode(obj, indent=self._app.debug) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class OrjsonProvider(_BytesJSONProvider):
+    """JSON provider backed by orjson."""
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, obj: Any, indent: bool = False) -> bytes:
+        option = self._orjson.OPT_NON_STR_KEYS | (self._orjson.OPT_INDENT_2 if indent else 0)
+        return self._orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return self._orjson.loads(s)
+
+
+class MsgspecProvider(_BytesJSONProvider):
+    """JSON provider backed by msgspec."""
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder(enc_hook=DefaultJSONProvider.default)
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: Any, indent: bool = False) -> bytes:
+        body = self._encoder.encode(obj)
+        return self._msgspec.json.format(body, indent=2) if indent else body
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return self._decoder.decode(s)
+
+
+_PROVIDERS: Dict[str, Type[JSONProvider]] = {
+    "orjson": OrjsonProvider,
+    "msgspec": MsgspecProvider,
+    "stdlib": DefaultJSONProvider,
+}
+
+
+def _is_installed(name: str) -> bool:
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def select_json_provider(name: str = "auto") -> Type[JSONProvider]:
+    """Return the provider class for `name`.
+
+    'auto' picks orjson, then msgspec, whichever is installed first, and
+    falls back to Flask's stdlib provider. Asking for a library that is not
+    installed also falls back to stdlib, with a warning.
+    """
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"JSON provider must be one of: {', '.join(JSON_PROVIDERS)}.")
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            if _is_installed(candidate):
+                return _PROVIDERS[candidate]
+        return DefaultJSONProvider
+    if name != "stdlib" and not _is_installed(name):
+        logger.warning("JSON provider '%s' is not installed; using the stdlib provider.", name)
+        return DefaultJSONProvider
+    return _PROVIDERS[name]
+
+
+def init_app(app: Flask) -> None:
+    """Install the JSON provider named by `JSON_PROVIDER` on the app.
+
+    Must run before instrumentation, which wraps whatever provider is set.
+    """
+    provider = select_json_provider(app.config.get("JSON_PROVIDER", "auto"))
+    if not isinstance(app.json, provider):
+        app.json = provider(app)
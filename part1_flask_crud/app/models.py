@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Integer, String
+from sqlalchemy import DDL, Integer, String, event
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -12,5 +12,36 @@ class Bank(Base):
     __tablename__ = "banks"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(String(255), nullable=False)
-    location: Mapped[str] = mapped_column(String(255), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    location: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    # Row version, incremented by the ORM on every UPDATE
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+BANK_SEARCH_TABLE = "banks_search"
+
+# SQLite stand-in for the SQL Server full-text index: an FTS5 trigram index
+# over name and location, kept in sync with `banks` by triggers. It serves
+# case-insensitive prefix and substring searches (see app/search.py).
+_SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE {BANK_SEARCH_TABLE} USING fts5("
+    "name, location, content='banks', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER banks_search_insert AFTER INSERT ON banks BEGIN "
+    f"INSERT INTO {BANK_SEARCH_TABLE} (rowid, name, location) VALUES (new.id, new.name, new.location); END",
+    f"CREATE TRIGGER banks_search_delete AFTER DELETE ON banks BEGIN "
+    f"INSERT INTO {BANK_SEARCH_TABLE} ({BANK_SEARCH_TABLE}, rowid, name, location) "
+    f"VALUES ('delete', old.id, old.name, old.location); END",
+    f"CREATE TRIGGER banks_search_update AFTER UPDATE OF name, location ON banks BEGIN "
+    f"INSERT INTO {BANK_SEARCH_TABLE} ({BANK_SEARCH_TABLE}, rowid, name, location) "
+    f"VALUES ('delete', old.id, old.name, old.location); "
+    f"INSERT INTO {BANK_SEARCH_TABLE} (rowid, name, location) VALUES (new.id, new.name, new.location); END",
+)
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(Bank.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Bank.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {BANK_SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
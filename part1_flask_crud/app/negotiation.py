@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import io
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from flask import Flask, Response, request
+from werkzeug.datastructures import Accept, ETags, MIMEAccept
+
+from .json_provider import _is_installed
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Binary formats are only offered when their library is installed
+_FORMAT_LIBRARIES = {MSGPACK: "msgpack", ARROW: "pyarrow"}
+
+# Content codings in server preference order, with the library each needs
+_ENCODING_LIBRARIES = {"zstd": "zstandard", "br": "brotli", "gzip": None}
+GZIP_LEVEL = 6
+# Brotli's default quality (11) is meant for static assets and far too slow
+# for dynamic responses; 4-5 compresses better than gzip at similar speed.
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "application/javascript",
+    JSON,
+    NDJSON,
+    MSGPACK,
+    ARROW,
+}
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+
+
+# ---------------------------------------------------------------------------
+# Content formats
+# ---------------------------------------------------------------------------
+
+
+def offered_formats(*media_types: str) -> List[str]:
+    """Return the given media types that can be produced, in the same order."""
+    return [
+        media_type
+        for media_type in media_types
+        if media_type not in _FORMAT_LIBRARIES or _is_installed(_FORMAT_LIBRARIES[media_type])
+    ]
+
+
+def negotiate_format(accept: MIMEAccept, offered: Sequence[str]) -> str:
+    """Pick the best of `offered` for an Accept header.
+
+    The first offered type is the default. It is also returned when nothing
+    matches: sending the default beats a 406 for clients with odd headers.
+    """
+    return accept.best_match(offered, default=offered[0])
+
+
+def _arrow_schema(columns: Sequence[Any]) -> Any:
+    import pyarrow as pa
+
+    types = {int: pa.int64(), str: pa.string()}
+    return pa.schema([pa.field(column.key, types[column.type.python_type]) for column in columns])
+
+
+def encode_rows(media_type: str, rows: Sequence[Dict[str, Any]], columns: Sequence[Any]) -> bytes:
+    """Encode a list of row dicts as MessagePack or an Arrow IPC stream.
+
+    `columns` are the selected SQLAlchemy columns, in field order; Arrow
+    derives its schema from their types so an empty page still has one.
+    """
+    if media_type == MSGPACK:
+        import msgpack
+
+        return msgpack.packb(list(rows))
+    if media_type == ARROW:
+        return b"".join(stream_rows(ARROW, [rows], columns))
+    raise ValueError(f"Cannot encode rows as {media_type}.")
+
+
+def stream_rows(
+    media_type: str, batches: Iterable[Sequence[Dict[str, Any]]], columns: Sequence[Any]
+) -> Iterator[bytes]:
+    """Encode batches of row dicts incrementally, one chunk per batch.
+
+    MessagePack is written as a stream of maps (read it with
+    `msgpack.Unpacker`); Arrow as one record batch per chunk.
+    """
+    if media_type == MSGPACK:
+        import msgpack
+
+        packer = msgpack.Packer()
+        for batch in batches:
+            yield b"".join(packer.pack(row) for row in batch)
+        return
+    if media_type != ARROW:
+        raise ValueError(f"Cannot stream rows as {media_type}.")
+
+    import pyarrow as pa
+
+    schema = _arrow_schema(columns)
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            if batch:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                yield drain()
+    yield drain()
+
+
+# ---------------------------------------------------------------------------
+# Compression
+# ---------------------------------------------------------------------------
+
+
+class Compressor(NamedTuple):
+    """Incremental compressor for one response.
+
+    `chunk` compresses data and flushes it so it can be sent right away;
+    `finish` ends the compressed stream.
+    """
+
+    chunk: Callable[[bytes], bytes]
+    finish: Callable[[], bytes]
+
+
+def _gzip() -> Compressor:
+    obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return Compressor(lambda data: obj.compress(data) + obj.flush(zlib.Z_SYNC_FLUSH), obj.flush)
+
+
+def _brotli() -> Compressor:
+    import brotli
+
+    obj = brotli.Compressor(quality=BROTLI_QUALITY)
+    return Compressor(lambda data: obj.process(data) + obj.flush(), obj.finish)
+
+
+def _zstd() -> Compressor:
+    import zstandard
+
+    obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return Compressor(
+        lambda data: obj.compress(data) + obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), obj.flush
+    )
+
+
+_COMPRESSORS: Dict[str, Callable[[], Compressor]] = {"gzip": _gzip, "br": _brotli, "zstd": _zstd}
+
+
+def available_encodings() -> List[str]:
+    """Return the content codings that can be produced, most preferred first."""
+    return [name for name, library in _ENCODING_LIBRARIES.items() if library is None or _is_installed(library)]
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    """Compress a whole body with `encoding` (gzip, br or zstd)."""
+    compressor = _COMPRESSORS[encoding]()
+    return compressor.chunk(data) + compressor.finish()
+
+
+def _compress_stream(chunks: Iterable[Any], encoding: str) -> Iterator[bytes]:
+    compressor = _COMPRESSORS[encoding]()
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield compressor.chunk(chunk)
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _choose_encoding(response: Any, accept: Accept, encodings: Sequence[str]) -> Optional[str]:
+    """Content coding to compress `response` with, or None to send it as is."""
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.status_code in (204, 304):
+        return None
+    if "Content-Encoding" in response.headers or response.status_code < 200:
+        return None
+    response.vary.add("Accept-Encoding")
+    return accept.best_match(encodings, default=None)
+
+
+def _mark_compressed(response: Any, encoding: str) -> None:
+    response.headers["Content-Encoding"] = encoding
+    # A compressed body is a different representation, so it gets its own
+    # strong ETag: the uncompressed one with the coding appended.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+
+
+def identity_etag(etag: str) -> str:
+    """Strip the content-coding suffix compression adds to an ETag, if any."""
+    for encoding in _ENCODING_LIBRARIES:
+        if etag.endswith(f"-{encoding}"):
+            return etag[: -len(encoding) - 1]
+    return etag
+
+
+def matches_if_none_match(if_none_match: ETags, etag: str) -> bool:
+    """Whether If-None-Match matches `etag` or a compressed variant of it.
+
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+    """
+    if if_none_match.star_tag:
+        return True
+    return any(identity_etag(tag) == etag for tag in if_none_match.as_set(include_weak=True))
+
+
+def _compress_response(response: Response, encodings: Sequence[str], min_size: int) -> Response:
+    encoding = _choose_encoding(response, request.accept_encodings, encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        # The size of a stream is unknown up front, so it is always compressed
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(compress(encoding, body))
+
+    _mark_compressed(response, encoding)
+    return response
+
+
+def init_app(app: Flask) -> None:
+    """Compress responses for clients that send a matching Accept-Encoding.
+
+    Only bodies of at least `COMPRESSION_MIN_SIZE` bytes are compressed;
+    smaller ones are not worth the CPU time. Set `COMPRESSION_ENABLED` to
+    False when a proxy in front of the app already compresses.
+    """
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    encodings = available_encodings()
+    min_size = app.config.get("COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE)
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        return _compress_response(response, encodings, min_size)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, select
+
+from .models import Bank
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """A keyset page request: at most `limit` rows with `Bank.id > after`."""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    after: Optional[int] = None
+
+
+def parse_page_args(args: Mapping[str, Any]) -> PageRequest:
+    """Parse `limit` and `after` query arguments into a PageRequest."""
+    raw_limit = args.get("limit")
+    raw_after = args.get("after")
+
+    try:
+        limit = int(raw_limit) if raw_limit not in (None, "") else DEFAULT_PAGE_SIZE
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer.") from None
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}.")
+
+    try:
+        after = int(raw_after) if raw_after not in (None, "") else None
+    except (TypeError, ValueError):
+        raise ValueError("after must be an integer bank ID.") from None
+
+    return PageRequest(limit=limit, after=after)
+
+
+def keyset_select(columns: Sequence[Any], page: PageRequest) -> Select:
+    """Build a keyset query for one page.
+
+    One extra row is requested so the caller can tell whether a next page
+    exists without issuing a COUNT query. The cost of the query depends only
+    on the page size, never on how deep into the table the cursor is.
+    """
+    stmt = select(*columns).order_by(Bank.id).limit(page.limit + 1)
+    if page.after is not None:
+        stmt = stmt.where(Bank.id > page.after)
+    return stmt
+
+
+def split_page(rows: Sequence[Any], page: PageRequest) -> Tuple[Sequence[Any], Optional[int]]:
+    """Trim the look-ahead row and return `(rows, next_cursor)`."""
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[: page.limit]
+    return rows, rows[-1].id
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, Response, g, has_app_context, request
+from werkzeug.wsgi import ClosingIterator
+
+from .sql_events import observe_statements
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGET = 10
+DEFAULT_MAX_REPEATS = 2
+DEFAULT_SLOW_QUERY_SECONDS = 0.1
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a request runs more SQL statements than its budget allows."""
+
+
+@dataclass
+class QueryLog:
+    """SQL statements executed while handling a single request."""
+
+    statements: Counter = field(default_factory=Counter)
+    slow: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self, max_repeats: int) -> Dict[str, int]:
+        """Statements executed more than `max_repeats` times (likely N+1)."""
+        return {sql: n for sql, n in self.statements.items() if n > max_repeats}
+
+
+@dataclass
+class EndpointReport:
+    budget: int
+    requests: int = 0
+    total_statements: int = 0
+    max_statements: int = 0
+    violations: int = 0
+    repeated: Dict[str, int] = field(default_factory=dict)
+    slow: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class QueryBudgetReport:
+    """Per-endpoint statement counts aggregated over many requests."""
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointReport] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, budget: int, log: QueryLog, max_repeats: int) -> None:
+        with self._lock:
+            report = self.endpoints.setdefault(endpoint, EndpointReport(budget=budget))
+            report.requests += 1
+            report.total_statements += log.count
+            report.max_statements = max(report.max_statements, log.count)
+            if log.count > budget:
+                report.violations += 1
+            for sql, n in log.repeated(max_repeats).items():
+                report.repeated[sql] = max(report.repeated.get(sql, 0), n)
+            report.slow.extend(log.slow)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "budget": report.budget,
+                    "requests": report.requests,
+                    "max_statements": report.max_statements,
+                    "avg_statements": report.total_statements / report.requests,
+                    "violations": report.violations,
+                    "repeated_statements": report.repeated,
+                    "slow_statements": report.slow,
+                }
+                for endpoint, report in sorted(self.endpoints.items())
+            }
+
+    def write(self, path: Path) -> None:
+        path.write_text(json.dumps(self.as_dict(), indent=2), encoding="utf-8")
+
+
+def _current_log() -> Optional[QueryLog]:
+    if not has_app_context():
+        return None
+    return g.get("query_log")
+
+
+def _record_statement(statement: str, seconds: float) -> None:
+    log = _current_log()
+    if log is None:
+        return
+    log.statements[statement] += 1
+    if seconds >= g.query_budget_slow_seconds:
+        log.slow.append({"sql": statement, "seconds": round(seconds, 6)})
+
+
+def init_app(app: Flask) -> None:
+    """Count SQL statements per request and enforce per-endpoint budgets.
+
+    Config keys:
+    - QUERY_BUDGET_MODE: 'raise' (fail the request, for tests) or 'log'
+    - QUERY_BUDGETS: {endpoint: max statements}; QUERY_BUDGET_DEFAULT otherwise
+    - QUERY_BUDGET_MAX_REPEATS: identical statements allowed before flagging
+    - QUERY_BUDGET_SLOW_SECONDS: statements slower than this are reported
+    - QUERY_BUDGET_REPORT: QueryBudgetReport that aggregates every request
+
+    Streamed responses are checked once the server closes the stream, so
+    the statements run while producing the body count too.
+    """
+    app.config.setdefault("QUERY_BUDGET_MODE", "log")
+    app.config.setdefault("QUERY_BUDGETS", {})
+    app.config.setdefault("QUERY_BUDGET_DEFAULT", DEFAULT_QUERY_BUDGET)
+    app.config.setdefault("QUERY_BUDGET_MAX_REPEATS", DEFAULT_MAX_REPEATS)
+    app.config.setdefault("QUERY_BUDGET_SLOW_SECONDS", DEFAULT_SLOW_QUERY_SECONDS)
+    app.config.setdefault("QUERY_BUDGET_REPORT", QueryBudgetReport())
+
+    observe_statements(_record_statement)
+
+    @app.before_request
+    def start_query_log() -> None:
+        g.query_log = QueryLog()
+        g.query_budget_slow_seconds = app.config["QUERY_BUDGET_SLOW_SECONDS"]
+
+    def check(log: QueryLog, endpoint: str) -> None:
+        budget = app.config["QUERY_BUDGETS"].get(endpoint, app.config["QUERY_BUDGET_DEFAULT"])
+        max_repeats = app.config["QUERY_BUDGET_MAX_REPEATS"]
+        app.config["QUERY_BUDGET_REPORT"].record(endpoint, budget, log, max_repeats)
+
+        for sql, n in log.repeated(max_repeats).items():
+            logger.warning("%s executed the same statement %d times (possible N+1): %s", endpoint, n, sql)
+        for slow in log.slow:
+            logger.warning("%s ran a slow statement (%.3fs): %s", endpoint, slow["seconds"], slow["sql"])
+
+        if log.count > budget:
+            message = f"{endpoint} executed {log.count} SQL statements, budget is {budget}."
+            if app.config["QUERY_BUDGET_MODE"] == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    @app.after_request
+    def check_query_budget(response: Response) -> Response:
+        log = g.get("query_log")
+        if log is None:
+            return response
+        endpoint = request.endpoint or "<unmatched>"
+        if response.is_streamed:
+            # a streamed body queries after this hook, still logging to
+            # g.query_log; check it when the server closes the stream
+            response.response = ClosingIterator(response.response, lambda: check(log, endpoint))
+        else:
+            del g.query_log
+            check(log, endpoint)
+        return response
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Tuple
+
+from sqlalchemy import ColumnElement, Select, column, or_, select, table, text
+
+from .models import BANK_SEARCH_TABLE, Bank
+from .pagination import PageRequest
+
+MAX_SEARCH_LENGTH = 255
+# The trigram index can only serve patterns of at least three characters
+TRIGRAM_MIN_LENGTH = 3
+LIKE_ESCAPE = "/"
+
+_search_table = table(BANK_SEARCH_TABLE, column("rowid"), column("name"), column("location"))
+
+
+@dataclass(frozen=True)
+class SearchRequest:
+    """Search filters for the bank list; every given filter must match.
+
+    - name / location: case-insensitive prefix of that column
+    - q: case-insensitive substring of name or location; on SQL Server with
+      the full-text index, a word of name or location starting with it
+    """
+
+    name: Optional[str] = None
+    location: Optional[str] = None
+    q: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return any((self.name, self.location, self.q))
+
+    def as_tuple(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        return (self.name, self.location, self.q)
+
+
+def parse_search_args(args: Mapping[str, Any]) -> SearchRequest:
+    """Parse `name`, `location` and `q` query arguments into a SearchRequest."""
+    values = {}
+    for key in ("name", "location", "q"):
+        value = (args.get(key) or "").strip()
+        if len(value) > MAX_SEARCH_LENGTH:
+            raise ValueError(f"{key} must be at most {MAX_SEARCH_LENGTH} characters.")
+        values[key] = value or None
+    return SearchRequest(**values)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards, including SQL Server's `[` character class."""
+    for char in (LIKE_ESCAPE, "%", "_", "["):
+        value = value.replace(char, LIKE_ESCAPE + char)
+    return value
+
+
+def _prefix(column_: Any, value: str) -> ColumnElement[bool]:
+    # Without an ESCAPE clause both SQL Server and SQLite's trigram index can
+    # use the pattern directly, so only escape when the value needs it.
+    escaped = _escape_like(value)
+    if escaped == value:
+        return column_.like(f"{value}%")
+    return column_.like(f"{escaped}%", escape=LIKE_ESCAPE)
+
+
+def _substring(column_: Any, value: str) -> ColumnElement[bool]:
+    return column_.like(f"%{_escape_like(value)}%", escape=LIKE_ESCAPE)
+
+
+def _sqlite_filters(search: SearchRequest, page: Optional[PageRequest]) -> List[ColumnElement[bool]]:
+    """Filters served by the FTS5 trigram table `banks_search`.
+
+    The trigram index answers LIKE (prefix) and MATCH (substring) lookups;
+    substrings shorter than three characters cannot use it and fall back to
+    a scan of `banks`. When every filter is served by the index, the keyset
+    page is applied inside the subquery too: FTS5 yields matches in rowid
+    order, so it stops after one page instead of collecting every match.
+    """
+    fts = []
+    if search.name:
+        fts.append(_prefix(_search_table.c.name, search.name))
+    if search.location:
+        fts.append(_prefix(_search_table.c.location, search.location))
+
+    filters: List[ColumnElement[bool]] = []
+    if search.q and len(search.q) >= TRIGRAM_MIN_LENGTH:
+        phrase = '"' + search.q.replace('"', '""') + '"'
+        fts.append(text(f"{BANK_SEARCH_TABLE} MATCH :search_q").bindparams(search_q=phrase))
+    elif search.q:
+        filters.append(or_(_substring(Bank.name, search.q), _substring(Bank.location, search.q)))
+
+    if fts:
+        matches = select(_search_table.c.rowid).where(*fts)
+        if page is not None and not filters:
+            if page.after is not None:
+                matches = matches.where(_search_table.c.rowid > page.after)
+            matches = matches.order_by(_search_table.c.rowid).limit(page.limit + 1)
+        filters.append(Bank.id.in_(matches))
+    return filters
+
+
+def _mssql_filters(search: SearchRequest, full_text: bool) -> List[ColumnElement[bool]]:
+    """Filters for SQL Server.
+
+    Prefixes seek on the non-clustered name/location indexes. With the
+    full-text index, `q` matches words starting with the term (CONTAINS);
+    otherwise it falls back to a substring scan.
+    """
+    filters: List[ColumnElement[bool]] = []
+    if search.name:
+        filters.append(_prefix(Bank.name, search.name))
+    if search.location:
+        filters.append(_prefix(Bank.location, search.location))
+    if search.q and full_text:
+        term = '"' + search.q.replace('"', '""') + '*"'
+        filters.append(text("CONTAINS((name, location), :search_q)").bindparams(search_q=term))
+    elif search.q:
+        filters.append(or_(_substring(Bank.name, search.q), _substring(Bank.location, search.q)))
+    return filters
+
+
+def apply_search(
+    stmt: Select,
+    search: SearchRequest,
+    dialect: str,
+    full_text: bool = True,
+    page: Optional[PageRequest] = None,
+) -> Select:
+    """Add the WHERE clauses for `search` to a bank query.
+
+    Pass the `page` that `stmt` was built for (see `keyset_select`) so the
+    SQLite index lookup can be limited to that page.
+    """
+    if not search:
+        return stmt
+    if dialect == "sqlite":
+        return stmt.where(*_sqlite_filters(search, page))
+    if dialect == "mssql":
+        return stmt.where(*_mssql_filters(search, full_text))
+    return stmt.where(*_mssql_filters(search, full_text=False))
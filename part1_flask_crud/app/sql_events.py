@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, List
+
+from flask import has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Called with the SQL text and its duration in seconds, inside an app context
+StatementObserver = Callable[[str, float], None]
+
+_observers: List[StatementObserver] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if has_app_context():
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("query_start_time")
+    if not starts or not has_app_context():
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for observer in _observers:
+        observer(statement, elapsed)
+
+
+def observe_statements(observer: StatementObserver) -> None:
+    """Call `observer` after every SQL statement executed during a request.
+
+    One pair of engine listeners times each statement for every feature
+    that needs it (instrumentation, query budget). Observers check their
+    own per-request state on `g` and ignore statements outside a request
+    they track. Registering the same observer twice has no effect.
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
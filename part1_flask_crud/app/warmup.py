@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict
+
+from flask import Flask
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+
+from .db import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_engine(engine: Engine) -> int:
+    size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    connections = [engine.connect() for _ in range(size)]
+    for connection in connections:
+        connection.close()
+    return size
+
+
+def warm_pool(app: Flask) -> int:
+    """Open the pool's steady-state connections so first requests skip the connect.
+
+    All connections are checked out at once (forcing a new connect for each)
+    and then returned, leaving `pool_size` idle connections in the pool.
+    Read replica pools are warmed the same way.
+    """
+    factories = [app.config["DB_SESSION_FACTORY"], *app.config.get("DB_REPLICA_SESSION_FACTORIES", ())]
+    engines = [engine for engine in map(get_engine, factories) if engine is not None]
+    return sum(_warm_engine(engine) for engine in engines)
+
+
+def warm_templates(app: Flask) -> int:
+    """Compile every template into the Jinja cache."""
+    names = app.jinja_env.list_templates()
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def warm_up(app: Flask) -> Dict[str, float]:
+    """Prepare a freshly started worker before it accepts traffic.
+
+    Returns the seconds spent per step, so startup cost can be logged and
+    benchmarked.
+    """
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    configure_mappers()
+    timings["mappers_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    connections = warm_pool(app)
+    timings["pool_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    templates = warm_templates(app)
+    timings["templates_seconds"] = time.perf_counter() - start
+
+    logger.info(
+        "Warmed up %d pool connections and %d templates in %.3fs.",
+        connections,
+        templates,
+        sum(timings.values()),
+    )
+    return timings
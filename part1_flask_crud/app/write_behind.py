@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import Flask
+from sqlalchemy.orm import Session
+
+from .cache import BankCache
+from .writes import insert_banks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MS = 10
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_WAIT_SECONDS = 10.0
+# Finished writes whose status can still be polled, per process
+STATUS_RETENTION = 100000
+
+
+class WriteBehindFull(Exception):
+    """Raised when the queue is full; the caller should retry later."""
+
+
+@dataclass
+class WriteBehindStats:
+    """Counters describing the write-behind queue."""
+
+    enqueued: int = 0
+    committed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    batches: int = 0
+
+
+@dataclass
+class PendingWrite:
+    """A validated bank waiting to be inserted."""
+
+    row: Dict[str, str]
+    ticket: str = field(default_factory=lambda: uuid.uuid4().hex)
+    future: "Future[Dict[str, Any]]" = field(default_factory=Future)
+
+
+class WriteBehindQueue:
+    """Bounded queue of bank creations committed in groups by one writer thread.
+
+    The writer takes the first waiting write, then keeps collecting until
+    `max_batch` rows are gathered or `interval_ms` have passed, and inserts
+    the whole group in one transaction. Each write carries a future that
+    resolves to the created bank (or the error), and a ticket under which
+    its status can be polled.
+
+    A batch that fails is retried one row at a time, so a bad row only
+    fails its own write.
+
+    The queue, the writer and the ticket registry live in one process, so
+    the app must run in a single worker; `gunicorn.conf.py` refuses to start
+    several.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        cache: BankCache,
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ) -> None:
+        self.session_factory = session_factory
+        self.cache = cache
+        self.interval_seconds = interval_ms / 1000
+        self.max_batch = max_batch
+        self.counters = WriteBehindStats()
+        self._queue: "queue.Queue[PendingWrite]" = queue.Queue(maxsize=max_queue)
+        self._tickets: "OrderedDict[str, PendingWrite]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, name: str, location: str) -> PendingWrite:
+        """Enqueue a validated bank; raises WriteBehindFull when the queue is full."""
+        write = PendingWrite({"name": name, "location": location})
+        self._ensure_started()
+        with self._lock:
+            self._tickets[write.ticket] = write
+            while len(self._tickets) > STATUS_RETENTION:
+                self._tickets.popitem(last=False)
+        try:
+            self._queue.put_nowait(write)
+        except queue.Full:
+            with self._lock:
+                self._tickets.pop(write.ticket, None)
+                self.counters.rejected += 1
+            raise WriteBehindFull() from None
+        with self._lock:
+            self.counters.enqueued += 1
+        return write
+
+    def status(self, ticket: str) -> Optional[Dict[str, Any]]:
+        """Return `pending`, `committed` (with the bank) or `failed`, or None if unknown."""
+        with self._lock:
+            write = self._tickets.get(ticket)
+        if write is None:
+            return None
+        if not write.future.done():
+            return {"ticket": ticket, "status": "pending"}
+        error = write.future.exception()
+        if error is not None:
+            return {"ticket": ticket, "status": "failed", "error": str(error)}
+        return {"ticket": ticket, "status": "committed", "bank": write.future.result()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters and the current queue depth as a plain dict."""
+        with self._lock:
+            stats = asdict(self.counters)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _ensure_started(self) -> None:
+        # Started on first use rather than at app creation, so a worker
+        # forked from a preloaded app gets its own thread.
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="bank-write-behind", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[PendingWrite]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.interval_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._commit(batch)
+
+    def _insert(self, batch: List[PendingWrite]) -> List[Dict[str, Any]]:
+        session = self.session_factory()
+        try:
+            banks = insert_banks(session, [write.row for write in batch])
+            session.commit()
+            return banks
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _commit(self, batch: List[PendingWrite]) -> None:
+        try:
+            banks = self._insert(batch)
+        except Exception as exc:  # the writer thread must outlive any failed batch
+            if len(batch) == 1:
+                logger.exception("Write-behind insert of a bank failed")
+                self._fail(batch, exc)
+                return
+            # retry row by row, so one bad row does not fail the others
+            logger.exception("Write-behind batch of %d banks failed; retrying them one at a time", len(batch))
+            for write in batch:
+                self._commit([write])
+            return
+
+        self.cache.invalidate()
+        with self._lock:
+            self.counters.committed += len(batch)
+            self.counters.batches += 1
+        for write, bank in zip(batch, banks):
+            write.future.set_result(bank)
+
+    def _fail(self, writes: List[PendingWrite], error: BaseException) -> None:
+        with self._lock:
+            self.counters.failed += len(writes)
+        for write in writes:
+            write.future.set_exception(error)
+
+    def close(self, timeout: float = DEFAULT_WAIT_SECONDS) -> None:
+        """Commit everything still queued and stop the writer thread.
+
+        Writes still queued when `timeout` expires are failed, so every
+        waiting request and ticket gets an answer.
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        dropped = []
+        while True:
+            try:
+                dropped.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if dropped:
+            logger.error("Write-behind queue closed with %d banks not committed", len(dropped))
+            self._fail(dropped, RuntimeError("The server shut down before the bank was committed."))
+
+
+def init_app(app: Flask) -> None:
+    """Create the app's write-behind queue when `WRITE_BEHIND_ENABLED` is set.
+
+    Queued writes are committed before the process exits.
+    """
+    if not app.config.get("WRITE_BEHIND_ENABLED"):
+        return
+    write_behind = WriteBehindQueue(
+        app.config["DB_SESSION_FACTORY"],
+        app.config["BANK_CACHE"],
+        interval_ms=app.config.get("WRITE_BEHIND_INTERVAL_MS", DEFAULT_INTERVAL_MS),
+        max_batch=app.config.get("WRITE_BEHIND_MAX_BATCH", DEFAULT_MAX_BATCH),
+        max_queue=app.config.get("WRITE_BEHIND_MAX_QUEUE", DEFAULT_MAX_QUEUE),
+    )
+    app.config["WRITE_BEHIND_QUEUE"] = write_behind
+    atexit.register(write_behind.close)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Delete, Select, Update, case, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from .models import Bank
+
+# Columns returned by a successful update (OUTPUT inserted.* on SQL Server)
+RETURNED_COLUMNS = (Bank.id, Bank.name, Bank.location, Bank.version)
+
+
+def insert_banks(session: Session, rows: Sequence[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Insert banks with batched multi-row INSERTs; return them with IDs, in order.
+
+    RETURNING is requested unordered, which lets every dialect batch the rows;
+    generated IDs are matched back to rows by content instead. Rows with the
+    same name and location are interchangeable, so any assignment among them
+    is correct. The caller commits.
+    """
+    inserted = session.execute(insert(Bank).returning(Bank.id, Bank.name, Bank.location), list(rows)).all()
+    ids_by_content: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    # descending, so that pop() hands out the lowest remaining ID first
+    for bank_id, name, location in sorted(inserted, reverse=True):
+        ids_by_content[(name, location)].append(bank_id)
+    return [{"id": ids_by_content[(row["name"], row["location"])].pop(), **row} for row in rows]
+
+
+def update_bank_statement(
+    bank_id: int, name: str, location: str, versions: Optional[Iterable[int]] = None
+) -> Update:
+    """Build a single-statement update of one bank that bumps its row version.
+
+    With `versions`, the row is only updated while its version is one of
+    them (optimistic concurrency); no row is returned otherwise. The new
+    row comes back through RETURNING / OUTPUT, so a successful update costs
+    one round trip.
+    """
+    table = Bank.__table__
+    stmt = update(table).where(table.c.id == bank_id)
+    if versions is not None:
+        stmt = stmt.where(table.c.version.in_(list(versions)))
+    return stmt.values(name=name, location=location, version=table.c.version + 1).returning(
+        *(table.c[column.key] for column in RETURNED_COLUMNS)
+    )
+
+
+def delete_bank_statement(bank_id: int, versions: Optional[Iterable[int]] = None) -> Delete:
+    """Build a single-statement delete of one bank, returning its ID.
+
+    With `versions`, the row is only deleted while its version is one of them.
+    """
+    table = Bank.__table__
+    stmt = delete(table).where(table.c.id == bank_id)
+    if versions is not None:
+        stmt = stmt.where(table.c.version.in_(list(versions)))
+    return stmt.returning(table.c.id)
+
+
+def load_bank_row(session: Session, bank_id: int) -> Optional[Dict[str, Any]]:
+    """Load one bank with its version as a plain dict, or None.
+
+    Shared by the API and the HTML views, which cache the same row.
+    """
+    row = session.execute(select(*RETURNED_COLUMNS).where(Bank.id == bank_id)).first()
+    return row._asdict() if row else None
+
+
+def current_version_statement(bank_id: int) -> Select:
+    """Select a bank's current version.
+
+    Only needed after a conditional write matched no row, to tell a missing
+    bank (404) from a version conflict (409/412).
+    """
+    return select(Bank.version).where(Bank.id == bank_id)
+
+
+def _matches_expected_version(table: Any, versions: Mapping[int, int]) -> Any:
+    """Condition that each row listed in `versions` still has its expected version.
+
+    Rows not listed compare their version with itself, so they always match.
+    """
+    return table.c.version == case(dict(versions), value=table.c.id, else_=table.c.version)
+
+
+def bulk_update_statement(rows: Sequence[Dict[str, Any]], versions: Optional[Mapping[int, int]] = None) -> Update:
+    """Build one UPDATE of many banks that bumps their versions and returns them.
+
+    Each bank's new name and location are picked by a CASE on its ID, so the
+    whole chunk is a single set-based statement that can still return the
+    stored rows (an executemany UPDATE cannot). IDs must be unique. Banks
+    listed in `versions` are only updated while they have that version.
+    """
+    table = Bank.__table__
+    stmt = update(table).where(table.c.id.in_([row["id"] for row in rows]))
+    if versions:
+        stmt = stmt.where(_matches_expected_version(table, versions))
+    return stmt.values(
+        name=case({row["id"]: row["name"] for row in rows}, value=table.c.id),
+        location=case({row["id"]: row["location"] for row in rows}, value=table.c.id),
+        version=table.c.version + 1,
+    ).returning(*(table.c[column.key] for column in RETURNED_COLUMNS))
+
+
+def bulk_delete_statement(bank_ids: Sequence[int], versions: Optional[Mapping[int, int]] = None) -> Delete:
+    """Build one DELETE of many banks, returning the IDs actually deleted.
+
+    Banks listed in `versions` are only deleted while they have that version.
+    """
+    table = Bank.__table__
+    stmt = delete(table).where(table.c.id.in_(list(bank_ids)))
+    if versions:
+        stmt = stmt.where(_matches_expected_version(table, versions))
+    return stmt.returning(table.c.id)
+
+
+def current_versions_statement(bank_ids: Sequence[int]) -> Select:
+    """Select the current version of each of `bank_ids` that still exists.
+
+    The bulk counterpart of `current_version_statement`, used to tell missing
+    banks from version conflicts after a conditional bulk write.
+    """
+    return select(Bank.id, Bank.version).where(Bank.id.in_(list(bank_ids)))
@@ -0,0 +1,13 @@
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
+
+if __name__ == "__main__":
+    import asyncio
+
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = ["127.0.0.1:5000"]
+    asyncio.run(serve(app, config))
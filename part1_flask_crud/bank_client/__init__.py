@@ -0,0 +1,14 @@
+"""
+Client library for the banks REST API.
+
+`BankClient` is a blocking client on a pooled `requests.Session`;
+`AsyncBankClient` is an httpx/asyncio client for running thousands of
+operations concurrently (data migration, replay). Both retry transient
+failures with exponential backoff and page through `/api/banks` by cursor.
+"""
+
+from .aio import AsyncBankClient
+from .base import ApiError, RetryPolicy
+from .sync import BankClient
+
+__all__ = ["ApiError", "AsyncBankClient", "BankClient", "RetryPolicy"]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+import httpx
+
+from .base import (
+    COMMIT_POLL_SECONDS,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_TIMEOUT,
+    ApiError,
+    RetryPolicy,
+    bank_payload,
+    committed_bank,
+    decode,
+    next_cursor,
+    offset_chunks,
+    page_params,
+    pending_path,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AsyncBankClient:
+    """Asyncio banks API client on a keep-alive `httpx.AsyncClient`.
+
+    At most `max_concurrency` requests are in flight at once; further calls
+    wait on a semaphore instead of opening more connections, so thousands of
+    operations can be scheduled together without overwhelming the server.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_concurrency: int = 50,
+        retry: Optional[RetryPolicy] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> AsyncBankClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    async def request(self, method: str, path: str, expected: Tuple[int, ...] = (200,), **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying transient failures, and check its status.
+
+        The concurrency slot is released while backing off so a retrying
+        request does not hold up the others.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self._semaphore:
+                    response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if not self.retry.should_retry(method, attempt):
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.warning("%s %s failed to connect, retrying in %.2fs", method, path, delay)
+                await asyncio.sleep(delay)
+                continue
+            if response.status_code in expected:
+                return response
+            if self.retry.should_retry(method, attempt, response.status_code):
+                delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                logger.warning("%s %s -> %s, retrying in %.2fs", method, path, response.status_code, delay)
+                await asyncio.sleep(delay)
+                continue
+            raise ApiError(method, path, response.status_code, decode(response.content, response.headers.get("Content-Type", "")))
+
+    async def create_bank(self, name: str, location: str) -> Dict[str, Any]:
+        """Create a bank and return it.
+
+        A write-behind server may answer 202 with a ticket; the ticket is then
+        polled until the bank is committed, for at most the client timeout.
+        """
+        response = await self.request("POST", "/banks", (201, 202), json=bank_payload(name, location))
+        if response.status_code == 201:
+            return response.json()
+        return await self._wait_for_commit(response.json()["ticket"])
+
+    async def _wait_for_commit(self, ticket: str) -> Dict[str, Any]:
+        path = pending_path(ticket)
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        while True:
+            status = (await self.request("GET", path)).json()
+            bank = committed_bank(status)
+            if bank is not None:
+                return bank
+            if asyncio.get_running_loop().time() >= deadline:
+                raise ApiError("POST", "/banks", 202, status)
+            await asyncio.sleep(COMMIT_POLL_SECONDS)
+
+    async def get_bank(self, bank_id: int) -> Optional[Dict[str, Any]]:
+        response = await self.request("GET", f"/banks/{bank_id}", (200, 404))
+        return response.json() if response.status_code == 200 else None
+
+    async def update_bank(self, bank_id: int, name: str, location: str) -> Dict[str, Any]:
+        return (await self.request("PUT", f"/banks/{bank_id}", json=bank_payload(name, location))).json()
+
+    async def delete_bank(self, bank_id: int) -> bool:
+        """Delete a bank; returns False if it did not exist."""
+        return (await self.request("DELETE", f"/banks/{bank_id}", (204, 404))).status_code == 204
+
+    async def list_banks(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return one page of banks and the cursor of the next page."""
+        response = await self.request("GET", "/banks", params=page_params(limit, after))
+        return response.json(), next_cursor(response.headers)
+
+    async def iter_banks(self, page_size: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every bank, following the keyset cursor page by page."""
+        while True:
+            rows, after = await self.list_banks(page_size, after)
+            for row in rows:
+                yield row
+            if after is None:
+                return
+
+    async def bulk_create(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create banks through /banks/bulk; chunks are sent concurrently."""
+        return await self._bulk("POST", list(items), (201, 207))
+
+    async def bulk_update(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._bulk("PUT", list(items), (200, 207))
+
+    async def bulk_delete(self, bank_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return await self._bulk("DELETE", list(bank_ids), (200, 207))
+
+    async def _bulk(self, method: str, items: List[Any], expected: Tuple[int, ...]) -> List[Dict[str, Any]]:
+        async def send(chunk: Tuple[int, List[Any]]) -> List[Dict[str, Any]]:
+            offset, batch = chunk
+            response = await self.request(method, "/banks/bulk", expected, json=batch)
+            return [{**result, "index": result["index"] + offset} for result in response.json()["results"]]
+
+        pages = await asyncio.gather(*(send(chunk) for chunk in offset_chunks(items)))
+        return [result for page in pages for result in page]
+
+    async def map(self, func: Callable[[T], Awaitable[R]], items: Iterable[T], return_exceptions: bool = False) -> List[Any]:
+        """Run `func` over `items` concurrently and return results in order.
+
+        Concurrency is bounded by the client's semaphore, e.g.
+        `await client.map(lambda b: client.update_bank(b["id"], ...), banks)`.
+        """
+        return await asyncio.gather(*(func(item) for item in items), return_exceptions=return_exceptions)
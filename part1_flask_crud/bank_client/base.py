@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_PAGE_SIZE = 1000
+# Matches BULK_MAX_ITEMS in app/api/bulk.py
+BULK_MAX_ITEMS = 10000
+# Interval between polls of a queued (write-behind) create
+COMMIT_POLL_SECONDS = 0.05
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+
+class ApiError(Exception):
+    """Raised when the API answers with an unexpected status code."""
+
+    def __init__(self, method: str, path: str, status: int, payload: Any) -> None:
+        super().__init__(f"{method} {path} -> {status}: {payload}")
+        self.method = method
+        self.path = path
+        self.status = status
+        self.payload = payload
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    429 responses are always retried: the server rejected the request before
+    handling it. Other retryable statuses and connection errors are only
+    retried for idempotent methods, so a POST is never applied twice.
+    """
+
+    attempts: int = 4
+    backoff_seconds: float = 0.2
+    max_backoff_seconds: float = 10.0
+    retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None) -> bool:
+        if attempt >= self.attempts:
+            return False
+        if status == 429:
+            return True
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to sleep before `attempt + 1`, honouring Retry-After."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff_seconds)
+            except ValueError:
+                pass
+        backoff = min(self.backoff_seconds * 2 ** (attempt - 1), self.max_backoff_seconds)
+        # full jitter keeps many concurrent clients from retrying in lockstep
+        return random.uniform(0, backoff)
+
+
+def next_cursor(headers: Mapping[str, str]) -> Optional[int]:
+    """Return the keyset cursor for the next page, if there is one."""
+    value = headers.get("X-Next-Cursor")
+    return int(value) if value else None
+
+
+def page_params(limit: int, after: Optional[int]) -> Dict[str, int]:
+    params = {"limit": limit}
+    if after is not None:
+        params["after"] = after
+    return params
+
+
+def bank_payload(name: str, location: str) -> Dict[str, str]:
+    return {"name": name, "location": location}
+
+
+def pending_path(ticket: str) -> str:
+    """Path of the status of a create queued by a write-behind server."""
+    return f"/banks/pending/{ticket}"
+
+
+def committed_bank(status: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the bank of a committed queued create, or None while it is pending.
+
+    Raises ApiError if the create failed, as the direct path answers 400.
+    """
+    if status["status"] == "committed":
+        return status["bank"]
+    if status["status"] == "failed":
+        raise ApiError("POST", "/banks", 400, status)
+    return None
+
+
+def offset_chunks(items: Sequence[Any], size: int = BULK_MAX_ITEMS) -> Iterator[Tuple[int, List[Any]]]:
+    """Split a batch into request-sized chunks, with each chunk's offset."""
+    for start in range(0, len(items), size):
+        yield start, list(items[start:start + size])
+
+
+def decode(body: bytes, content_type: str) -> Any:
+    """Decode a JSON response body, falling back to text."""
+    if not body:
+        return None
+    if "json" in content_type:
+        try:
+            return json.loads(body)
+        except ValueError:
+            pass
+    return body.decode("utf-8", errors="replace")
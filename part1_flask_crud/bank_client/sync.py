@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .base import (
+    COMMIT_POLL_SECONDS,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_TIMEOUT,
+    ApiError,
+    RetryPolicy,
+    bank_payload,
+    committed_bank,
+    decode,
+    next_cursor,
+    offset_chunks,
+    page_params,
+    pending_path,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BankClient:
+    """Blocking banks API client backed by a pooled `requests.Session`.
+
+    Connections are kept alive and reused across calls, and the session is
+    safe to share between threads; size `pool_size` to the number of
+    threads that use it.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = 10,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> BankClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def request(self, method: str, path: str, expected: Tuple[int, ...] = (200,), **kwargs: Any) -> requests.Response:
+        """Send a request, retrying transient failures, and check its status."""
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            except requests.ConnectionError:
+                if not self.retry.should_retry(method, attempt):
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.warning("%s %s failed to connect, retrying in %.2fs", method, path, delay)
+                time.sleep(delay)
+                continue
+            if response.status_code in expected:
+                return response
+            if self.retry.should_retry(method, attempt, response.status_code):
+                delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                logger.warning("%s %s -> %s, retrying in %.2fs", method, path, response.status_code, delay)
+                response.close()
+                time.sleep(delay)
+                continue
+            raise ApiError(method, path, response.status_code, decode(response.content, response.headers.get("Content-Type", "")))
+
+    def create_bank(self, name: str, location: str) -> Dict[str, Any]:
+        """Create a bank and return it.
+
+        A write-behind server may answer 202 with a ticket; the ticket is then
+        polled until the bank is committed, for at most the client timeout.
+        """
+        response = self.request("POST", "/banks", (201, 202), json=bank_payload(name, location))
+        if response.status_code == 201:
+            return response.json()
+        return self._wait_for_commit(response.json()["ticket"])
+
+    def _wait_for_commit(self, ticket: str) -> Dict[str, Any]:
+        path = pending_path(ticket)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            status = self.request("GET", path).json()
+            bank = committed_bank(status)
+            if bank is not None:
+                return bank
+            if time.monotonic() >= deadline:
+                raise ApiError("POST", "/banks", 202, status)
+            time.sleep(COMMIT_POLL_SECONDS)
+
+    def get_bank(self, bank_id: int) -> Optional[Dict[str, Any]]:
+        response = self.request("GET", f"/banks/{bank_id}", (200, 404))
+        return response.json() if response.status_code == 200 else None
+
+    def update_bank(self, bank_id: int, name: str, location: str) -> Dict[str, Any]:
+        return self.request("PUT", f"/banks/{bank_id}", json=bank_payload(name, location)).json()
+
+    def delete_bank(self, bank_id: int) -> bool:
+        """Delete a bank; returns False if it did not exist."""
+        return self.request("DELETE", f"/banks/{bank_id}", (204, 404)).status_code == 204
+
+    def list_banks(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return one page of banks and the cursor of the next page."""
+        response = self.request("GET", "/banks", params=page_params(limit, after))
+        return response.json(), next_cursor(response.headers)
+
+    def iter_banks(self, page_size: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield every bank, following the keyset cursor page by page."""
+        while True:
+            rows, after = self.list_banks(page_size, after)
+            yield from rows
+            if after is None:
+                return
+
+    def bulk_create(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create banks through /banks/bulk; returns per-item results in order."""
+        return self._bulk("POST", list(items), (201, 207))
+
+    def bulk_update(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self._bulk("PUT", list(items), (200, 207))
+
+    def bulk_delete(self, bank_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return self._bulk("DELETE", list(bank_ids), (200, 207))
+
+    def _bulk(self, method: str, items: List[Any], expected: Tuple[int, ...]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for offset, batch in offset_chunks(items):
+            for result in self.request(method, "/banks/bulk", expected, json=batch).json()["results"]:
+                results.append({**result, "index": result["index"] + offset})
+        return results
@@ -8,8 +8,26 @@ GO
 
 -- Create banks table
 CREATE TABLE banks (
-    id INT IDENTITY(1,1) PRIMARY KEY,  -- (seed, increment)
+    id INT IDENTITY(1,1) CONSTRAINT pk_banks PRIMARY KEY,  -- (seed, increment)
     name NVARCHAR(255) NOT NULL,
-    location NVARCHAR(255) NOT NULL
+    location NVARCHAR(255) NOT NULL,
+    version INT NOT NULL DEFAULT 1     -- row version, incremented on every update
 );
 GO
+
+-- Search indexes for GET /api/banks?name=...&location=... (prefix seeks)
+CREATE NONCLUSTERED INDEX ix_banks_name ON banks (name);
+GO
+
+CREATE NONCLUSTERED INDEX ix_banks_location ON banks (location);
+GO
+
+-- Full-text index for GET /api/banks?q=... (requires the Full-Text Search
+-- feature; without it, skip this block and set SEARCH_FULL_TEXT=false)
+CREATE FULLTEXT CATALOG banks_catalog AS DEFAULT;
+GO
+
+CREATE FULLTEXT INDEX ON banks (name, location)
+    KEY INDEX pk_banks
+    WITH CHANGE_TRACKING AUTO;
+GO
@@ -0,0 +1,58 @@
+"""
+Gunicorn configuration for production.
+
+Run from this directory:
+
+    gunicorn -c gunicorn.conf.py
+
+`kill -HUP <master pid>` reloads gracefully: new workers start (and warm up)
+with the current code while old workers finish their in-flight requests.
+"""
+
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+# Read .env as the app does, so the checks below see the same settings
+load_dotenv()
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("BIND", "127.0.0.1:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# The in-process memory cache would leave every other worker serving stale
+# banks and ETags after a write, so default to the cache shared by all
+# workers. Workers read the environment when they load the app.
+if workers > 1 and not os.getenv("CACHE_BACKEND"):
+    os.environ["CACHE_BACKEND"] = "file"
+    if os.path.isdir("/dev/shm"):
+        os.environ.setdefault("CACHE_DIR", "/dev/shm/validata-cache")
+
+# Write-behind tickets and queued banks live in the worker that accepted
+# them, so a ticket polled on any other worker would be unknown.
+if workers > 1 and os.getenv("WRITE_BEHIND_ENABLED", "false").strip().lower() == "true":
+    raise RuntimeError("WRITE_BEHIND_ENABLED=true requires a single worker; set WEB_CONCURRENCY=1.")
+
+# Load the app in each worker, after fork: database connections are never
+# shared between processes, and HUP picks up new code.
+preload_app = False
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+# Recycle workers periodically to bound memory growth; jitter avoids
+# restarting all of them at once.
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+# Heartbeat files on tmpfs so a slow disk cannot stall workers.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def post_worker_init(worker):
+    """Warm the pool and template cache before the worker accepts requests."""
+    from app.warmup import warm_up
+
+    timings = warm_up(worker.wsgi)
+    worker.log.info("Worker %s warm: %s", worker.pid, {k: round(v, 4) for k, v in timings.items()})
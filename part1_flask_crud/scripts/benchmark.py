@@ -0,0 +1,491 @@
+"""
+Load-testing benchmark for the banks CRUD API and HTML UI.
+
+The app is driven in-process (Flask test clients, one per worker thread)
+against a local SQLite database that stands in for SQL Server, so runs are
+repeatable on any machine. Results (p50/p95/p99 latency and throughput per
+operation) can be saved as JSON baselines and compared between commits.
+
+Examples (from the repository root):
+
+    python part1_flask_crud/scripts/benchmark.py --rows 10000 --concurrency 8
+    python part1_flask_crud/scripts/benchmark.py --mix api_get=80,api_update=20 --save
+    python part1_flask_crud/scripts/benchmark.py --compare part1_flask_crud/benchmarks/abc1234.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.cache import BankCache, create_cache_backend  # noqa: E402
+from app.models import Bank, Base  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+BASELINE_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+SEED_BATCH_SIZE = 5000
+BULK_BATCH_SIZE = 100
+
+DEFAULT_MIX = {
+    "api_get": 30,
+    "api_list": 10,
+    "api_list_page": 10,
+    "api_search": 5,
+    "api_create": 8,
+    "api_update": 8,
+    "api_delete": 4,
+    "api_bulk_create": 1,
+    "api_bulk_update": 1,
+    "api_bulk_delete": 1,
+    "api_export": 1,
+    "ui_list": 1,
+    "ui_detail": 10,
+    "ui_new_form": 2,
+    "ui_create": 3,
+    "ui_edit_form": 4,
+    "ui_update": 4,
+    "ui_delete": 2,
+}
+
+
+class BankIds:
+    """Thread-safe pool of bank IDs known to exist."""
+
+    def __init__(self, ids: Sequence[int]) -> None:
+        self._ids = list(ids)
+        self._lock = threading.Lock()
+
+    def pick(self, rng: random.Random) -> int:
+        with self._lock:
+            return rng.choice(self._ids) if self._ids else 0
+
+    def take(self, rng: random.Random) -> Optional[int]:
+        """Remove and return a random ID so no other worker deletes it too."""
+        with self._lock:
+            if not self._ids:
+                return None
+            index = rng.randrange(len(self._ids))
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def add(self, *ids: int) -> None:
+        with self._lock:
+            self._ids.extend(ids)
+
+
+# Every operation returns (response status, statuses considered a success).
+Operation = Callable[[Any, BankIds, random.Random], Tuple[int, Tuple[int, ...]]]
+
+
+def _payload(rng: random.Random) -> Dict[str, str]:
+    n = rng.randrange(1_000_000)
+    return {"name": f"Bench Bank {n}", "location": f"City {n % 500}"}
+
+
+def _api_get(client, ids, rng):
+    return client.get(f"/api/banks/{ids.pick(rng)}").status_code, (200, 404)
+
+
+def _api_list(client, ids, rng):
+    return client.get("/api/banks?limit=100").status_code, (200,)
+
+
+def _api_list_page(client, ids, rng):
+    return client.get(f"/api/banks?limit=100&after={ids.pick(rng)}").status_code, (200,)
+
+
+def _api_search(client, ids, rng):
+    n = rng.randrange(1000)
+    query = rng.choice([f"name=Bench%20Bank%20{n}", f"location=City%20{n % 500}", f"q={n:03d}"])
+    return client.get(f"/api/banks?{query}").status_code, (200,)
+
+
+def _api_create(client, ids, rng):
+    r = client.post("/api/banks", json=_payload(rng))
+    if r.status_code == 201:
+        ids.add(r.get_json()["id"])
+    return r.status_code, (201,)
+
+
+def _api_update(client, ids, rng):
+    return client.put(f"/api/banks/{ids.pick(rng)}", json=_payload(rng)).status_code, (200, 404)
+
+
+def _api_delete(client, ids, rng):
+    bank_id = ids.take(rng)
+    if bank_id is None:
+        return _api_create(client, ids, rng)
+    return client.delete(f"/api/banks/{bank_id}").status_code, (204,)
+
+
+def _api_bulk_create(client, ids, rng):
+    r = client.post("/api/banks/bulk", json=[_payload(rng) for _ in range(BULK_BATCH_SIZE)])
+    if r.status_code == 201:
+        ids.add(*(item["bank"]["id"] for item in r.get_json()["results"]))
+    return r.status_code, (201,)
+
+
+def _api_bulk_update(client, ids, rng):
+    items = [{"id": ids.pick(rng), **_payload(rng)} for _ in range(BULK_BATCH_SIZE)]
+    return client.put("/api/banks/bulk", json=items).status_code, (200, 207)
+
+
+def _api_bulk_delete(client, ids, rng):
+    bank_ids = [bank_id for bank_id in (ids.take(rng) for _ in range(BULK_BATCH_SIZE // 10)) if bank_id]
+    if not bank_ids:
+        return _api_bulk_create(client, ids, rng)
+    return client.delete("/api/banks/bulk", json=bank_ids).status_code, (200,)
+
+
+def _api_export(client, ids, rng):
+    # Closing the streamed response releases its request-scoped session.
+    with client.get("/api/banks/export") as r:
+        r.get_data()
+        return r.status_code, (200,)
+
+
+def _ui_list(client, ids, rng):
+    # The page is streamed; reading it runs the query and renders the rows.
+    with client.get("/banks/") as r:
+        r.get_data()
+        return r.status_code, (200,)
+
+
+def _ui_detail(client, ids, rng):
+    return client.get(f"/banks/{ids.pick(rng)}").status_code, (200, 404)
+
+
+def _ui_new_form(client, ids, rng):
+    return client.get("/banks/new").status_code, (200,)
+
+
+def _ui_create(client, ids, rng):
+    return client.post("/banks/new", data=_payload(rng)).status_code, (302,)
+
+
+def _ui_edit_form(client, ids, rng):
+    return client.get(f"/banks/{ids.pick(rng)}/edit").status_code, (200, 404)
+
+
+def _ui_update(client, ids, rng):
+    return client.post(f"/banks/{ids.pick(rng)}/edit", data=_payload(rng)).status_code, (302, 404)
+
+
+def _ui_delete(client, ids, rng):
+    bank_id = ids.take(rng)
+    if bank_id is None:
+        return _ui_create(client, ids, rng)
+    return client.post(f"/banks/{bank_id}/delete").status_code, (302,)
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "api_get": _api_get,
+    "api_list": _api_list,
+    "api_list_page": _api_list_page,
+    "api_search": _api_search,
+    "api_create": _api_create,
+    "api_update": _api_update,
+    "api_delete": _api_delete,
+    "api_bulk_create": _api_bulk_create,
+    "api_bulk_update": _api_bulk_update,
+    "api_bulk_delete": _api_bulk_delete,
+    "api_export": _api_export,
+    "ui_list": _ui_list,
+    "ui_detail": _ui_detail,
+    "ui_new_form": _ui_new_form,
+    "ui_create": _ui_create,
+    "ui_edit_form": _ui_edit_form,
+    "ui_update": _ui_update,
+    "ui_delete": _ui_delete,
+}
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    """Parse 'op=weight,...' into a mix dict, validating operation names."""
+    mix: Dict[str, float] = {}
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'. Choose from: {', '.join(OPERATIONS)}.")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("The mix must contain at least one operation with a positive weight.")
+    return mix
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _sqlite_engine(db: str, pool_size: int) -> Tuple[Engine, Optional[Path]]:
+    """Create a SQLite engine tuned for concurrent benchmark traffic.
+
+    'memory' places the database file on /dev/shm (RAM-backed) when available.
+    A real file is used rather than ':memory:' because every worker thread
+    needs its own connection to the same database.
+    """
+    cleanup: Optional[Path] = None
+    if db == "memory":
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, path = tempfile.mkstemp(prefix="banks-bench-", suffix=".db", dir=directory)
+        os.close(fd)
+        cleanup = Path(path)
+    else:
+        path = db
+
+    engine = create_engine(
+        f"sqlite+pysqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return engine, cleanup
+
+
+def seed(session_factory, rows: int) -> List[int]:
+    """Reset the banks table and insert `rows` synthetic banks."""
+    rng = random.Random(0)
+    with session_factory() as session:
+        session.query(Bank).delete()
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            batch = [_payload(rng) for _ in range(min(SEED_BATCH_SIZE, rows - start))]
+            session.execute(insert(Bank), batch)
+        session.commit()
+        return list(session.scalars(Bank.__table__.select().with_only_columns(Bank.id)))
+
+
+def run_benchmark(
+    rows: int = 1000,
+    requests: int = 2000,
+    concurrency: int = 4,
+    mix: Optional[Dict[str, float]] = None,
+    db: str = "memory",
+    cache: str = "none",
+    seed_value: int = 42,
+) -> Dict[str, Any]:
+    """Run the benchmark and return a JSON-serializable result dict."""
+    mix = mix or DEFAULT_MIX
+    engine, cleanup = _sqlite_engine(db, pool_size=concurrency)
+    try:
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+        ids = BankIds(seed(session_factory, rows))
+        app = create_app(
+            {
+                "DB_SESSION_FACTORY": session_factory,
+                "BANK_CACHE": BankCache(create_cache_backend(cache)),
+            }
+        )
+
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        stats = {name: OperationStats() for name in names}
+        stats_lock = threading.Lock()
+        per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+
+        def worker(index: int) -> None:
+            rng = random.Random(seed_value + index)
+            client = app.test_client()
+            local = {name: OperationStats() for name in names}
+            for name in rng.choices(names, weights=weights, k=per_worker[index]):
+                start = time.perf_counter()
+                status, expected = OPERATIONS[name](client, ids, rng)
+                local[name].latencies.append(time.perf_counter() - start)
+                if status not in expected:
+                    local[name].errors += 1
+            with stats_lock:
+                for name, result in local.items():
+                    stats[name].latencies.extend(result.latencies)
+                    stats[name].errors += result.errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+        elapsed = time.perf_counter() - started
+    finally:
+        engine.dispose()
+        if cleanup is not None:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{cleanup}{suffix}").unlink(missing_ok=True)
+
+    results = {}
+    all_latencies: List[float] = []
+    for name, result in stats.items():
+        if not result.latencies:
+            continue
+        latencies = sorted(result.latencies)
+        all_latencies.extend(latencies)
+        results[name] = _summarize(latencies, result.errors, elapsed)
+    total_errors = sum(result.errors for result in stats.values())
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": rows,
+            "requests": requests,
+            "concurrency": concurrency,
+            "db": db,
+            "cache": cache,
+            "mix": mix,
+            "elapsed_seconds": round(elapsed, 3),
+        },
+        "results": results,
+        "total": _summarize(sorted(all_latencies), total_errors, elapsed),
+    }
+
+
+def _summarize(sorted_latencies: Sequence[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    count = len(sorted_latencies)
+    return {
+        "count": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(sorted_latencies) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(sorted_latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(sorted_latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(sorted_latencies, 99) * 1000, 3),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[str]:
+    """Return a message for every operation whose p95 regressed past `tolerance`."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["p95_ms"]:
+            continue
+        change = result["p95_ms"] / base["p95_ms"] - 1
+        if change > tolerance:
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']:.3f} ms -> {result['p95_ms']:.3f} ms ({change:+.0%})"
+            )
+    base_total = baseline.get("total", {}).get("throughput_rps")
+    if base_total and current["total"]["throughput_rps"] < base_total * (1 - tolerance):
+        regressions.append(
+            f"throughput: {base_total:.1f} rps -> {current['total']['throughput_rps']:.1f} rps"
+        )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    header = f"{'operation':<18}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["results"].items()) + [("TOTAL", report["total"])]
+    for name, r in rows:
+        print(
+            f"{name:<18}{r['count']:>8}{r['errors']:>8}{r['throughput_rps']:>10.1f}"
+            f"{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="banks seeded before the run")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests across all workers")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of worker threads")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="weights, e.g. api_get=80,api_update=20")
+    parser.add_argument("--db", default="memory", help="'memory' (RAM-backed file) or a SQLite file path")
+    parser.add_argument("--cache", choices=["none", "memory"], default="none", help="bank cache backend")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--save",
+        nargs="?",
+        const="",
+        default=None,
+        help="save results as JSON (default: benchmarks/<commit>.json)",
+    )
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed p95 regression (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    report = run_benchmark(
+        rows=args.rows,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        mix=args.mix,
+        db=args.db,
+        cache=args.cache,
+        seed_value=args.seed,
+    )
+    _print_report(report)
+
+    if args.save is not None:
+        path = Path(args.save) if args.save else BASELINE_DIR / f"{report['meta']['commit'] or 'baseline'}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nSaved results: {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Micro-benchmark for the JSON serialization path of the bank list API.
+
+Compares, for one page of banks:
+
+- orm:   ORM objects -> `_serialize_bank` dicts -> Flask's stdlib provider
+         (the path used before rows were built from column tuples)
+- tuple: `select(Bank.id, Bank.name, Bank.location)` tuples -> dicts,
+         encoded by each installed JSON provider (stdlib, orjson, msgspec)
+
+Fetch and encode are timed separately so the two effects can be told apart.
+A local SQLite database stands in for SQL Server.
+
+Examples (from the repository root):
+
+    python part1_flask_crud/scripts/json_benchmark.py
+    python part1_flask_crud/scripts/json_benchmark.py --rows 50000 --page-size 1000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.api.routes import _serialize_bank  # noqa: E402
+from app.json_provider import _is_installed  # noqa: E402
+from app.models import Bank, Base  # noqa: E402
+
+
+def _fetch_orm(session: Session, limit: int) -> List[Dict[str, Any]]:
+    banks = session.scalars(select(Bank).order_by(Bank.id).limit(limit)).all()
+    return [_serialize_bank(bank) for bank in banks]
+
+
+def _fetch_tuples(session: Session, limit: int) -> List[Dict[str, Any]]:
+    fields = ("id", "name", "location")
+    rows = session.execute(select(Bank.id, Bank.name, Bank.location).order_by(Bank.id).limit(limit)).all()
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def _median_ms(func: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def run_json_benchmark(rows: int = 10000, page_size: int = 1000, repeat: int = 30) -> Dict[str, Any]:
+    """Time fetch and encode of one `page_size` page for each path."""
+    engine = create_engine("sqlite+pysqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Bank), [{"name": f"Bank {i}", "location": f"City {i}"} for i in range(rows)])
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    providers = ["stdlib"] + [name for name in ("orjson", "msgspec") if _is_installed(name)]
+    apps = {
+        name: create_app({"DB_SESSION_FACTORY": session_factory, "JSON_PROVIDER": name, "TESTING": True})
+        for name in providers
+    }
+
+    def timed(fetch: Callable[[Session, int], List[Dict[str, Any]]], provider: str) -> Dict[str, float]:
+        app = apps[provider]
+        with app.app_context(), session_factory() as session:
+            # expunge between runs so the ORM path hydrates fresh objects
+            def fetch_page() -> List[Dict[str, Any]]:
+                session.expunge_all()
+                return fetch(session, page_size)
+
+            page = fetch_page()
+            fetch_ms = _median_ms(fetch_page, repeat)
+            encode_ms = _median_ms(lambda: app.json.response(page).get_data(), repeat)
+        return {"fetch_ms": fetch_ms, "encode_ms": encode_ms, "total_ms": round(fetch_ms + encode_ms, 3)}
+
+    results = {"orm+stdlib": timed(_fetch_orm, "stdlib")}
+    for provider in providers:
+        results[f"tuple+{provider}"] = timed(_fetch_tuples, provider)
+    engine.dispose()
+    return {
+        "meta": {"rows": rows, "page_size": page_size, "repeat": repeat, "python": sys.version.split()[0]},
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the table")
+    parser.add_argument("--page-size", type=int, default=1000, help="rows serialized per run")
+    parser.add_argument("--repeat", type=int, default=30, help="runs per measurement")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_json_benchmark(args.rows, args.page_size, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    baseline = report["results"]["orm+stdlib"]["total_ms"]
+    print(f"{'median ms':<18}{'fetch':>10}{'encode':>10}{'total':>10}{'speedup':>10}")
+    for name, timings in report["results"].items():
+        speedup = baseline / timings["total_ms"] if timings["total_ms"] else 0.0
+        print(
+            f"{name:<18}{timings['fetch_ms']:>10.3f}{timings['encode_ms']:>10.3f}"
+            f"{timings['total_ms']:>10.3f}{speedup:>9.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Payload size and encode-time benchmark for the list/export formats.
+
+Encodes a large banks table once per response format (JSON through the
+configured JSON provider, MessagePack, Arrow IPC) and then compresses each
+body with every available content coding (gzip, br, zstd). Reports the
+median encode and compress times and the resulting sizes, which is what a
+bulk consumer of `/api/banks/export` pays on the wire.
+
+Examples (from the repository root):
+
+    python part1_flask_crud/scripts/payload_benchmark.py
+    python part1_flask_crud/scripts/payload_benchmark.py --rows 1000000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import create_app  # noqa: E402
+from app.api.routes import BANK_FIELDS  # noqa: E402
+from app.negotiation import ARROW, JSON, MSGPACK, available_encodings, compress, encode_rows, offered_formats  # noqa: E402
+
+FORMAT_NAMES = {JSON: "json", MSGPACK: "msgpack", ARROW: "arrow"}
+
+
+def _rows(count: int) -> List[Dict[str, Any]]:
+    return [{"id": i, "name": f"Bank {i}", "location": f"City {i % 500}"} for i in range(1, count + 1)]
+
+
+def _median(func: Callable[[], Any], repeat: int) -> Any:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return result, round(statistics.median(samples) * 1000, 3)
+
+
+def run_payload_benchmark(rows: int = 100000, repeat: int = 5, json_provider: str = "auto") -> Dict[str, Any]:
+    """Return encode/compress timings (ms) and sizes (bytes) per format and coding."""
+    app = create_app({"TESTING": True, "JSON_PROVIDER": json_provider})
+    data = _rows(rows)
+    columns = list(BANK_FIELDS.values())
+
+    encoders: Dict[str, Callable[[], bytes]] = {}
+    for media_type in offered_formats(JSON, MSGPACK, ARROW):
+        if media_type == JSON:
+            encoders["json"] = lambda: app.json.response(data).get_data()
+        else:
+            encoders[FORMAT_NAMES[media_type]] = lambda media_type=media_type: encode_rows(media_type, data, columns)
+
+    results: Dict[str, Any] = {}
+    with app.app_context():
+        for name, encode in encoders.items():
+            body, encode_ms = _median(encode, repeat)
+            results[f"{name}/identity"] = {"encode_ms": encode_ms, "compress_ms": 0.0, "bytes": len(body)}
+            for encoding in available_encodings():
+                compressed, compress_ms = _median(lambda: compress(encoding, body), repeat)
+                results[f"{name}/{encoding}"] = {
+                    "encode_ms": encode_ms,
+                    "compress_ms": compress_ms,
+                    "bytes": len(compressed),
+                }
+    return {
+        "meta": {
+            "rows": rows,
+            "repeat": repeat,
+            "json_provider": type(app.json).__name__,
+            "python": sys.version.split()[0],
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="rows to encode")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    parser.add_argument("--json-provider", default="auto", help="auto, orjson, msgspec or stdlib")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_payload_benchmark(args.rows, args.repeat, args.json_provider)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    baseline = report["results"]["json/identity"]["bytes"]
+    print(f"{report['meta']['rows']} rows, JSON via {report['meta']['json_provider']}")
+    print(f"{'format/coding':<20}{'encode ms':>12}{'compress ms':>14}{'bytes':>14}{'ratio':>8}")
+    for name, result in report["results"].items():
+        print(
+            f"{name:<20}{result['encode_ms']:>12.3f}{result['compress_ms']:>14.3f}"
+            f"{result['bytes']:>14,}{result['bytes'] / baseline:>8.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Startup-time benchmark for a worker process.
+
+Each run starts a fresh interpreter and measures what a gunicorn worker does
+after fork: importing the app, `create_app()`, `warm_up()` and the first
+requests. Runs with and without warm-up are compared so the effect of
+warming is visible. A local SQLite file stands in for SQL Server.
+
+Examples (from the repository root):
+
+    python part1_flask_crud/scripts/startup_benchmark.py --runs 10
+    python part1_flask_crud/scripts/startup_benchmark.py --save
+    python part1_flask_crud/scripts/startup_benchmark.py --compare part1_flask_crud/benchmarks/startup-abc1234.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_DIR = ROOT / "benchmarks"
+FIRST_REQUESTS = ("/api/banks", "/banks/", "/banks/1")
+
+
+def _child(db_path: str, warm: bool, pool_size: int) -> Dict[str, float]:
+    """Measure one worker start; runs in a fresh interpreter."""
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app import create_app
+    from app.warmup import warm_up
+
+    timings["import_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = create_engine(f"sqlite+pysqlite:///{db_path}", pool_size=pool_size)
+    app = create_app({"DB_SESSION_FACTORY": sessionmaker(bind=engine, autoflush=False)})
+    timings["create_app_seconds"] = time.perf_counter() - start
+
+    timings["warm_up_seconds"] = 0.0
+    if warm:
+        start = time.perf_counter()
+        warm_up(app)
+        timings["warm_up_seconds"] = time.perf_counter() - start
+
+    client = app.test_client()
+    start = time.perf_counter()
+    for path in FIRST_REQUESTS:
+        client.get(path)
+    timings["first_requests_seconds"] = time.perf_counter() - start
+    timings["startup_seconds"] = sum(timings.values())
+    return timings
+
+
+def _prepare_db(path: str) -> None:
+    sys.path.insert(0, str(ROOT))
+    from sqlalchemy import create_engine, insert
+
+    from app.models import Bank, Base
+
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Bank), [{"name": f"Bank {i}", "location": f"City {i}"} for i in range(1000)])
+    engine.dispose()
+
+
+def run_startup_benchmark(runs: int = 5, pool_size: int = 5) -> Dict[str, Any]:
+    """Start `runs` cold and `runs` warmed workers; return median timings."""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = str(Path(directory) / "banks.db")
+        _prepare_db(db_path)
+        results: Dict[str, Any] = {}
+        for mode in ("cold", "warm"):
+            samples: List[Dict[str, float]] = []
+            for _ in range(runs):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--child", db_path, "--pool-size", str(pool_size)]
+                    + (["--warm"] if mode == "warm" else []),
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                samples.append(json.loads(output.strip().splitlines()[-1]))
+            results[mode] = {
+                key.replace("_seconds", "_ms"): round(statistics.median(sample[key] for sample in samples) * 1000, 3)
+                for key in samples[0]
+            }
+    return {
+        "meta": {"commit": _git_commit(), "runs": runs, "pool_size": pool_size, "python": sys.version.split()[0]},
+        "results_ms": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    """Return a message for every median timing that regressed past `tolerance`."""
+    regressions = []
+    for mode, timings in current["results_ms"].items():
+        for key, value in timings.items():
+            base = baseline.get("results_ms", {}).get(mode, {}).get(key)
+            if base and value > base * (1 + tolerance):
+                regressions.append(f"{mode} {key}: {base:.3f} ms -> {value:.3f} ms")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=ROOT
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="worker starts per mode")
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--save", nargs="?", const="", default=None, help="default: benchmarks/startup-<commit>.json")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--child", metavar="DB_PATH", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.warm, args.pool_size)))
+        return 0
+
+    report = run_startup_benchmark(args.runs, args.pool_size)
+    keys = list(report["results_ms"]["cold"])
+    print(f"{'median ms':<24}{'cold':>10}{'warm':>10}")
+    for key in keys:
+        cold, warm = report["results_ms"]["cold"][key], report["results_ms"]["warm"][key]
+        print(f"{key.replace('_ms', ''):<24}{cold:>10.3f}{warm:>10.3f}")
+
+    if args.save is not None:
+        name = f"startup-{report['meta']['commit'] or 'baseline'}.json"
+        path = Path(args.save) if args.save else BASELINE_DIR / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nSaved results: {path}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,10 @@ from sqlalchemy.pool import StaticPool
 
 from app import create_app
 from app.models import Base, Bank
+from app.query_budget import QueryBudgetReport
+
+QUERY_BUDGET_REPORT = QueryBudgetReport()
+QUERY_BUDGET_REPORT_FILE = "query_budget_report.json"
 
 
 @pytest.fixture(scope="session")
@@ -39,6 +43,31 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture()
+def query_budget(session_factory):
+    """Test client whose requests fail when they exceed their SQL statement budget.
+
+    Budgets can be tightened per endpoint through
+    `query_budget.application.config["QUERY_BUDGETS"]`. Statement counts of
+    every request are aggregated into a report written when the session ends.
+    """
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "TESTING": True,
+            "QUERY_BUDGET_ENABLED": True,
+            "QUERY_BUDGET_MODE": "raise",
+            "QUERY_BUDGET_REPORT": QUERY_BUDGET_REPORT,
+        }
+    )
+    return app.test_client()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if QUERY_BUDGET_REPORT.endpoints:
+        QUERY_BUDGET_REPORT.write(session.config.rootpath / QUERY_BUDGET_REPORT_FILE)
+
+
 @pytest.fixture(autouse=True)
 def cleanup_db(session_factory):
     session = session_factory()
@@ -0,0 +1,136 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import create_app
+from app.admission import AdmissionController, TokenBucket
+from app.db import InstrumentedQueuePool
+
+
+def _app(session_factory, **config):
+    return create_app({"DB_SESSION_FACTORY": session_factory, "TESTING": True, "ADMISSION_ENABLED": True, **config})
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=2, burst=2, now=0.0)
+
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == 0.5
+    assert bucket.take(0.5) == 0
+
+
+def test_client_over_its_rate_gets_429(session_factory):
+    client = _app(session_factory, RATE_LIMIT_PER_CLIENT=0.001, RATE_LIMIT_BURST=2).test_client()
+
+    statuses = [client.get("/api/banks").status_code for _ in range(3)]
+    other = client.get("/api/banks", environ_base={"REMOTE_ADDR": "10.0.0.2"})
+
+    assert statuses == [200, 200, 429]
+    assert other.status_code == 200
+    limited = client.get("/api/banks")
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert limited.get_json() == {"error": "Too many requests; slow down."}
+
+
+def test_route_limit_is_shared_by_all_clients(session_factory):
+    client = _app(session_factory, RATE_LIMITS={"api.create_bank": 1}).test_client()
+    payload = {"name": "Bank", "location": "NYC"}
+
+    first = client.post("/api/banks", json=payload)
+    second = client.post("/api/banks", json=payload, environ_base={"REMOTE_ADDR": "10.0.0.2"})
+
+    assert (first.status_code, second.status_code) == (201, 429)
+    # other routes are not affected
+    assert client.get("/api/banks").status_code == 200
+
+
+def test_requests_over_the_concurrency_cap_are_shed(session_factory):
+    app = _app(session_factory, ADMISSION_MAX_CONCURRENT=1)
+    admission = app.config["ADMISSION"]
+    client = app.test_client()
+    # another request is in flight
+    assert admission.admit("10.0.0.2", "api.list_banks") == (0, 0.0)
+
+    shed = client.get("/api/banks")
+    admission.release()
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert client.get("/api/banks").status_code == 200
+    stats = client.get("/admission/stats").get_json()
+    assert stats["shed"] == 1
+    assert stats["in_flight"] == 0
+
+
+def _pooled(path, pool_size, max_overflow):
+    engine = create_engine(
+        f"sqlite:///{path}", poolclass=InstrumentedQueuePool, pool_size=pool_size, max_overflow=max_overflow
+    )
+    return sessionmaker(bind=engine)
+
+
+def test_concurrency_cap_defaults_to_pool_capacity(tmp_path):
+    app = _app(_pooled(tmp_path / "db.sqlite", 3, 2))
+
+    assert app.config["ADMISSION"].max_concurrent == 5
+
+
+def test_concurrency_cap_includes_replica_pools(tmp_path):
+    app = _app(
+        _pooled(tmp_path / "primary.sqlite", 3, 2),
+        DB_REPLICA_SESSION_FACTORIES=[_pooled(tmp_path / "replica.sqlite", 4, 0)],
+    )
+
+    assert app.config["ADMISSION"].max_concurrent == 9
+
+
+def test_shed_requests_get_their_tokens_back():
+    admission = AdmissionController(client_rate=0.001, client_burst=1, max_concurrent=1, queue_seconds=0)
+    assert admission.admit("a", "api.list_banks") == (0, 0.0)
+
+    assert admission.admit("b", "api.list_banks") == (503, 1.0)
+    admission.release()
+
+    # b's one token was refunded, so it is admitted once a slot is free
+    assert admission.admit("b", "api.list_banks") == (0, 0.0)
+
+
+def test_route_limited_requests_get_their_client_token_back():
+    admission = AdmissionController(client_rate=0.001, client_burst=2, route_rates={"api.create_bank": 0.001})
+    assert admission.admit("a", "api.create_bank") == (0, 0.0)
+    admission.release()
+
+    assert admission.admit("a", "api.create_bank")[0] == 429
+    # the client still has the token the refused request took
+    assert admission.admit("a", "api.list_banks") == (0, 0.0)
+    assert admission.stats()["rate_limited_client"] == 0
+
+
+def test_health_and_stats_are_exempt(session_factory):
+    client = _app(session_factory, RATE_LIMIT_PER_CLIENT=0.001, RATE_LIMIT_BURST=1).test_client()
+
+    client.get("/api/banks")
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/admission/stats").get_json()["rate_limited_client"] == 0
+
+
+def test_streamed_export_holds_its_slot_until_sent(session_factory):
+    app = _app(session_factory, ADMISSION_MAX_CONCURRENT=5)
+    client = app.test_client()
+
+    client.get("/api/banks/export").get_data()
+
+    stats = client.get("/admission/stats").get_json()
+    assert stats["admitted"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_client_buckets_are_bounded():
+    admission = AdmissionController(client_rate=1, max_clients=2)
+
+    for client in ("a", "b", "c"):
+        assert admission.admit(client, "api.list_banks") == (0, 0.0)
+        admission.release()
+
+    assert admission.stats()["tracked_clients"] == 2
@@ -0,0 +1,128 @@
+from app import create_app
+
+
+def test_bulk_create_inserts_valid_items_and_reports_errors(client):
+    r = client.post(
+        "/api/banks/bulk",
+        json=[
+            {"name": "Alpha", "location": "NYC"},
+            {"name": "", "location": "LA"},
+            {"name": "Beta", "location": "SF"},
+        ],
+    )
+    assert r.status_code == 207
+    results = r.get_json()["results"]
+    assert [item["status"] for item in results] == [201, 400, 201]
+    assert results[0]["bank"]["name"] == "Alpha"
+    assert results[1]["error"] == "name and location are required."
+
+    r = client.get(f"/api/banks/{results[2]['bank']['id']}")
+    assert r.get_json()["location"] == "SF"
+
+
+def test_bulk_create_all_valid_returns_201(client):
+    r = client.post("/api/banks/bulk", json=[{"name": f"Bank {i}", "location": "NYC"} for i in range(5)])
+    assert r.status_code == 201
+    ids = [item["bank"]["id"] for item in r.get_json()["results"]]
+    assert ids == sorted(ids)
+    assert len(client.get("/api/banks").get_json()) == 5
+
+
+def test_bulk_update(client):
+    created = client.post("/api/banks/bulk", json=[{"name": "Alpha", "location": "NYC"}]).get_json()
+    bank_id = created["results"][0]["bank"]["id"]
+
+    r = client.put(
+        "/api/banks/bulk",
+        json=[
+            {"id": bank_id, "name": "Alpha Updated", "location": "LA"},
+            {"id": 999, "name": "Missing", "location": "Nowhere"},
+            {"name": "No id", "location": "Nowhere"},
+        ],
+    )
+    assert r.status_code == 207
+    results = r.get_json()["results"]
+    assert [item["status"] for item in results] == [200, 404, 400]
+    # the stored row, with the new version and its ETag for a follow-up write
+    assert results[0]["bank"] == {"id": bank_id, "name": "Alpha Updated", "location": "LA", "version": 2}
+    stored = client.get(f"/api/banks/{bank_id}")
+    assert stored.get_json()["location"] == "LA"
+    assert results[0]["etag"] == stored.headers["ETag"]
+
+
+def test_bulk_delete(client):
+    created = client.post("/api/banks/bulk", json=[{"name": "A", "location": "X"}, {"name": "B", "location": "Y"}])
+    ids = [item["bank"]["id"] for item in created.get_json()["results"]]
+
+    r = client.delete("/api/banks/bulk", json=ids)
+    assert r.status_code == 200
+    assert client.get("/api/banks").get_json() == []
+
+    r = client.delete("/api/banks/bulk", json=[ids[0], "x"])
+    assert r.status_code == 207
+    assert [item["status"] for item in r.get_json()["results"]] == [404, 400]
+
+
+def test_bulk_rejects_duplicate_ids(client):
+    created = client.post("/api/banks/bulk", json=[{"name": "A", "location": "X"}]).get_json()
+    bank_id = created["results"][0]["bank"]["id"]
+
+    r = client.put(
+        "/api/banks/bulk",
+        json=[{"id": bank_id, "name": "B", "location": "Y"}, {"id": bank_id, "name": "C", "location": "Z"}],
+    )
+    assert [item["status"] for item in r.get_json()["results"]] == [200, 400]
+    assert client.get(f"/api/banks/{bank_id}").get_json()["name"] == "B"
+
+    r = client.delete("/api/banks/bulk", json=[bank_id, bank_id])
+    assert r.status_code == 207
+    assert [item["status"] for item in r.get_json()["results"]] == [204, 400]
+
+
+def test_bulk_writes_check_item_versions(client):
+    created = client.post("/api/banks/bulk", json=[{"name": "A", "location": "X"}, {"name": "B", "location": "Y"}])
+    first, second = [item["bank"]["id"] for item in created.get_json()["results"]]
+
+    r = client.put(
+        "/api/banks/bulk",
+        json=[
+            {"id": first, "name": "A2", "location": "X", "version": 1},
+            {"id": second, "name": "B2", "location": "Y", "version": 7},
+            {"id": 999, "name": "C", "location": "Z", "version": 1},
+        ],
+    )
+    results = r.get_json()["results"]
+    assert [item["status"] for item in results] == [200, 412, 404]
+    # the conflicting item reports the current ETag, and its row is untouched
+    assert results[1]["etag"] == client.get(f"/api/banks/{second}").headers["ETag"]
+    assert client.get(f"/api/banks/{second}").get_json()["name"] == "B"
+
+    r = client.delete("/api/banks/bulk", json=[{"id": first, "version": 1}, {"id": second, "version": 1}])
+    assert [item["status"] for item in r.get_json()["results"]] == [412, 204]
+    assert client.get(f"/api/banks/{first}").status_code == 200
+
+
+def test_bulk_writes_require_versions_when_if_match_is_required(session_factory):
+    app = create_app({"DB_SESSION_FACTORY": session_factory, "TESTING": True, "REQUIRE_IF_MATCH": True})
+    client = app.test_client()
+    created = client.post("/api/banks/bulk", json=[{"name": "A", "location": "X"}, {"name": "B", "location": "Y"}])
+    first, second = [item["bank"]["id"] for item in created.get_json()["results"]]
+
+    r = client.put(
+        "/api/banks/bulk",
+        json=[
+            {"id": first, "name": "A2", "location": "X"},
+            {"id": second, "name": "B2", "location": "Y", "version": 1},
+        ],
+    )
+    assert [item["status"] for item in r.get_json()["results"]] == [428, 200]
+    assert client.get(f"/api/banks/{first}").get_json()["name"] == "A"
+
+    r = client.delete("/api/banks/bulk", json=[first, {"id": second, "version": 2}])
+    assert [item["status"] for item in r.get_json()["results"]] == [428, 204]
+    assert client.get(f"/api/banks/{first}").status_code == 200
+
+
+def test_bulk_rejects_non_array_body(client):
+    assert client.post("/api/banks/bulk", json={"name": "Alpha"}).status_code == 400
+    assert client.post("/api/banks/bulk", json=[]).status_code == 400
@@ -0,0 +1,142 @@
+from sqlalchemy import event
+
+from app import create_app
+
+
+def _create_bank(client, name="Alpha", location="NYC") -> int:
+    return client.post("/api/banks", json={"name": name, "location": location}).get_json()["id"]
+
+
+def test_get_bank_returns_304_when_unchanged(client):
+    bank_id = _create_bank(client)
+
+    r = client.get(f"/api/banks/{bank_id}")
+    etag = r.headers["ETag"]
+
+    r = client.get(f"/api/banks/{bank_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.data == b""
+
+
+def test_bank_etag_changes_on_update(client):
+    bank_id = _create_bank(client)
+    etag = client.get(f"/api/banks/{bank_id}").headers["ETag"]
+
+    r = client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "LA"})
+    assert r.headers["ETag"] != etag
+
+    r = client.get(f"/api/banks/{bank_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.get_json()["location"] == "LA"
+
+
+def test_list_etag_tracks_any_table_change(client):
+    bank_id = _create_bank(client)
+    etag = client.get("/api/banks").headers["ETag"]
+    assert client.get("/api/banks", headers={"If-None-Match": etag}).status_code == 304
+
+    # each kind of write, single or bulk, must invalidate the list ETag
+    writes = [
+        lambda: client.post("/api/banks", json={"name": "Beta", "location": "LA"}),
+        lambda: client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "SF"}),
+        lambda: client.put("/api/banks/bulk", json=[{"id": bank_id, "name": "Alpha", "location": "NYC"}]),
+        lambda: client.post(f"/banks/{bank_id}/edit", data={"name": "Alpha", "location": "LA"}),
+        lambda: client.delete(f"/api/banks/{bank_id}"),
+    ]
+    for write in writes:
+        write()
+        r = client.get("/api/banks", headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        etag = r.headers["ETag"]
+
+
+def test_list_etag_tracks_changes_on_the_page_only(client):
+    ids = [_create_bank(client, name) for name in ("Alpha", "Beta", "Gamma")]
+    first = client.get("/api/banks?limit=2").headers["ETag"]
+    second = client.get(f"/api/banks?limit=2&after={ids[1]}").headers["ETag"]
+
+    client.put(f"/api/banks/{ids[2]}", json={"name": "Gamma", "location": "LA"})
+
+    assert client.get("/api/banks?limit=2", headers={"If-None-Match": first}).status_code == 304
+    assert client.get(f"/api/banks?limit=2&after={ids[1]}", headers={"If-None-Match": second}).status_code == 200
+
+
+def test_list_etag_depends_on_query(client):
+    _create_bank(client)
+    etag = client.get("/api/banks").headers["ETag"]
+    r = client.get("/api/banks?fields=name", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+
+
+def test_bulk_update_bumps_row_version(client):
+    bank_id = _create_bank(client)
+    etag = client.get(f"/api/banks/{bank_id}").headers["ETag"]
+
+    client.put("/api/banks/bulk", json=[{"id": bank_id, "name": "Alpha", "location": "LA"}])
+    assert client.get(f"/api/banks/{bank_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_update_with_if_match_applies_only_to_current_version(client):
+    bank_id = _create_bank(client)
+    etag = client.get(f"/api/banks/{bank_id}").headers["ETag"]
+
+    r = client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "LA"}, headers={"If-Match": etag})
+    assert r.status_code == 200
+    current = r.headers["ETag"]
+
+    # a second writer still holding the old ETag loses instead of overwriting
+    r = client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "SF"}, headers={"If-Match": etag})
+    assert r.status_code == 412
+    assert r.headers["ETag"] == current
+    assert client.get(f"/api/banks/{bank_id}").get_json()["location"] == "LA"
+
+
+def test_if_match_uses_strong_comparison(client):
+    bank_id = _create_bank(client)
+    etag = client.get(f"/api/banks/{bank_id}").headers["ETag"]
+    payload = {"name": "Alpha", "location": "LA"}
+
+    r = client.put(f"/api/banks/{bank_id}", json=payload, headers={"If-Match": f"W/{etag}"})
+    assert r.status_code == 412
+    # the tag of a compressed response names the same row version
+    gzip_etag = etag[:-1] + '-gzip"'
+    assert client.put(f"/api/banks/{bank_id}", json=payload, headers={"If-Match": gzip_etag}).status_code == 200
+
+
+def test_delete_with_if_match(client):
+    bank_id = _create_bank(client)
+    stale = client.get(f"/api/banks/{bank_id}").headers["ETag"]
+    current = client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "LA"}).headers["ETag"]
+
+    assert client.delete(f"/api/banks/{bank_id}", headers={"If-Match": stale}).status_code == 412
+    assert client.delete(f"/api/banks/{bank_id}", headers={"If-Match": current}).status_code == 204
+    assert client.delete(f"/api/banks/{bank_id}", headers={"If-Match": current}).status_code == 404
+
+
+def test_writes_are_single_statements(client, session_factory):
+    bank_id = _create_bank(client)
+    etag = client.get(f"/api/banks/{bank_id}").headers["ETag"]
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "LA"}, headers={"If-Match": etag})
+        client.delete(f"/api/banks/{bank_id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # one statement per write, nothing else in the write transaction
+    assert statements == ["UPDATE", "DELETE"]
+
+
+def test_if_match_can_be_required(session_factory):
+    client = create_app({"DB_SESSION_FACTORY": session_factory, "TESTING": True, "REQUIRE_IF_MATCH": True}).test_client()
+    bank_id = _create_bank(client)
+
+    assert client.put(f"/api/banks/{bank_id}", json={"name": "A", "location": "B"}).status_code == 428
+    assert client.delete(f"/api/banks/{bank_id}").status_code == 428
+    assert client.delete(f"/api/banks/{bank_id}", headers={"If-Match": "*"}).status_code == 204
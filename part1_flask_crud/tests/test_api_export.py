@@ -0,0 +1,52 @@
+import json
+
+
+def _create_banks(client, count: int) -> list:
+    return [
+        client.post("/api/banks", json={"name": f"Bank {i}", "location": "NYC"}).get_json()["id"]
+        for i in range(count)
+    ]
+
+
+def test_export_ndjson_streams_every_bank(client):
+    ids = _create_banks(client, 3)
+
+    r = client.get("/api/banks/export")
+    assert r.status_code == 200
+    assert r.mimetype == "application/x-ndjson"
+    assert r.is_streamed
+    rows = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    assert [row["id"] for row in rows] == ids
+
+
+def test_export_json_array(client):
+    ids = _create_banks(client, 3)
+
+    r = client.get("/api/banks/export?format=json")
+    assert r.status_code == 200
+    assert [row["id"] for row in json.loads(r.get_data(as_text=True))] == ids
+
+
+def test_export_empty_table(client):
+    assert json.loads(client.get("/api/banks/export?format=json").get_data(as_text=True)) == []
+    assert client.get("/api/banks/export").get_data(as_text=True) == ""
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/api/banks/export?format=xml").status_code == 400
+
+
+def test_export_closes_its_session(app, session_factory):
+    sessions = []
+
+    def tracking_factory():
+        sessions.append(session_factory())
+        return sessions[-1]
+
+    app.config["DB_SESSION_FACTORY"] = tracking_factory
+    client = app.test_client()
+    _create_banks(client, 2)
+
+    with client.get("/api/banks/export") as r:
+        assert len(r.get_data(as_text=True).splitlines()) == 2
+    assert sessions and not any(session.in_transaction() for session in sessions)
@@ -0,0 +1,121 @@
+import gzip
+import json
+
+import pytest
+
+from app import create_app
+
+ARROW = "application/vnd.apache.arrow.stream"
+
+
+def _create_banks(client, count: int) -> list:
+    return [
+        client.post("/api/banks", json={"name": f"Bank {i}", "location": "NYC"}).get_json()
+        for i in range(count)
+    ]
+
+
+def test_list_returns_msgpack_when_accepted(client):
+    msgpack = pytest.importorskip("msgpack")
+    banks = _create_banks(client, 3)
+
+    r = client.get("/api/banks", headers={"Accept": "application/msgpack"})
+    assert r.status_code == 200
+    assert r.mimetype == "application/msgpack"
+    assert "Accept" in r.vary
+    assert msgpack.unpackb(r.get_data()) == banks
+
+
+def test_list_returns_arrow_stream_when_accepted(client):
+    pa = pytest.importorskip("pyarrow")
+    banks = _create_banks(client, 3)
+
+    r = client.get("/api/banks?fields=name,id", headers={"Accept": ARROW})
+    assert r.mimetype == ARROW
+    table = pa.ipc.open_stream(r.get_data()).read_all()
+    assert table.schema.names == ["name", "id"]
+    assert table.to_pylist() == [{"name": b["name"], "id": b["id"]} for b in banks]
+
+    empty = client.get(f"/api/banks?after={banks[-1]['id']}", headers={"Accept": ARROW})
+    assert pa.ipc.open_stream(empty.get_data()).read_all().schema.names == ["id", "name", "location"]
+
+
+def test_list_falls_back_to_json_and_varies_etag_by_format(client):
+    pytest.importorskip("msgpack")
+    _create_banks(client, 1)
+
+    r = client.get("/api/banks", headers={"Accept": "text/csv"})
+    assert r.mimetype == "application/json"
+    packed = client.get("/api/banks", headers={"Accept": "application/msgpack"})
+    assert packed.get_etag() != r.get_etag()
+
+
+def test_large_response_is_compressed(client):
+    banks = _create_banks(client, 30)
+
+    r = client.get("/api/banks", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.vary
+    assert json.loads(gzip.decompress(r.get_data())) == banks
+
+    # a strong ETag of its own, distinct from the uncompressed representation's
+    etag, weak = r.get_etag()
+    assert not weak
+    assert etag == client.get("/api/banks").get_etag()[0] + "-gzip"
+    cached = client.get("/api/banks", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{etag}"'})
+    assert cached.status_code == 304
+
+
+def test_small_response_is_not_compressed(client):
+    bank = _create_banks(client, 1)[0]
+
+    r = client.get(f"/api/banks/{bank['id']}", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+    assert r.get_json() == bank
+
+
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_preferred_encoding_is_used(client, encoding, module):
+    library = pytest.importorskip(module)
+    banks = _create_banks(client, 30)
+
+    r = client.get("/api/banks", headers={"Accept-Encoding": f"gzip;q=0.5, {encoding}"})
+    assert r.headers["Content-Encoding"] == encoding
+    if encoding == "br":
+        body = library.decompress(r.get_data())
+    else:
+        body = library.ZstdDecompressor().decompressobj().decompress(r.get_data())
+    assert json.loads(body) == banks
+
+
+def test_export_stream_is_compressed(client):
+    banks = _create_banks(client, 5)
+
+    r = client.get("/api/banks/export", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(r.get_data()).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == banks
+
+
+def test_export_binary_formats(client):
+    msgpack = pytest.importorskip("msgpack")
+    pa = pytest.importorskip("pyarrow")
+    banks = _create_banks(client, 3)
+
+    packed = client.get("/api/banks/export?format=msgpack")
+    assert packed.mimetype == "application/msgpack"
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(packed.get_data())
+    assert list(unpacker) == banks
+
+    arrow = client.get("/api/banks/export", headers={"Accept": ARROW})
+    assert arrow.mimetype == ARROW
+    assert pa.ipc.open_stream(arrow.get_data()).read_all().to_pylist() == banks
+
+
+def test_compression_can_be_disabled(session_factory):
+    app = create_app({"DB_SESSION_FACTORY": session_factory, "TESTING": True, "COMPRESSION_ENABLED": False})
+    client = app.test_client()
+    _create_banks(client, 30)
+
+    assert "Content-Encoding" not in client.get("/api/banks", headers={"Accept-Encoding": "gzip"}).headers
@@ -0,0 +1,52 @@
+def _create_banks(client, count: int) -> list:
+    ids = []
+    for i in range(count):
+        r = client.post("/api/banks", json={"name": f"Bank {i}", "location": f"City {i}"})
+        assert r.status_code == 201
+        ids.append(r.get_json()["id"])
+    return ids
+
+
+def test_list_banks_paginates_with_keyset_cursor(client):
+    ids = _create_banks(client, 5)
+
+    r = client.get("/api/banks?limit=2")
+    assert r.status_code == 200
+    assert [bank["id"] for bank in r.get_json()] == ids[:2]
+    assert r.headers["X-Next-Cursor"] == str(ids[1])
+    assert 'rel="next"' in r.headers["Link"]
+
+    r = client.get(f"/api/banks?limit=2&after={ids[1]}")
+    assert [bank["id"] for bank in r.get_json()] == ids[2:4]
+
+    r = client.get(f"/api/banks?limit=2&after={ids[3]}")
+    assert [bank["id"] for bank in r.get_json()] == ids[4:]
+    assert "X-Next-Cursor" not in r.headers
+
+
+def test_list_banks_follows_link_header(client):
+    ids = _create_banks(client, 3)
+
+    seen = []
+    url = "/api/banks?limit=1"
+    while url:
+        r = client.get(url)
+        seen.extend(bank["id"] for bank in r.get_json())
+        link = r.headers.get("Link")
+        url = link[1:link.index(">")] if link else None
+    assert seen == ids
+
+
+def test_list_banks_fields_projection(client):
+    _create_banks(client, 2)
+
+    r = client.get("/api/banks?fields=name")
+    assert r.status_code == 200
+    assert all(set(bank) == {"name"} for bank in r.get_json())
+
+
+def test_list_banks_rejects_bad_arguments(client):
+    assert client.get("/api/banks?limit=0").status_code == 400
+    assert client.get("/api/banks?limit=abc").status_code == 400
+    assert client.get("/api/banks?after=abc").status_code == 400
+    assert client.get("/api/banks?fields=password").status_code == 400
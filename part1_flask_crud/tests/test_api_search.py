@@ -0,0 +1,100 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import mssql
+
+from app.models import Bank
+from app.search import SearchRequest, apply_search
+
+BANKS = [
+    ("Validata Bank", "Seattle"),
+    ("First National", "Portland"),
+    ("Bank of Seattle", "Tacoma"),
+    ("100% Credit_Union", "Boise"),
+]
+
+
+def _create_banks(client) -> dict:
+    ids = {}
+    for name, location in BANKS:
+        r = client.post("/api/banks", json={"name": name, "location": location})
+        assert r.status_code == 201
+        ids[name] = r.get_json()["id"]
+    return ids
+
+
+def _names(client, query: str) -> list:
+    r = client.get(f"/api/banks?{query}")
+    assert r.status_code == 200
+    return [bank["name"] for bank in r.get_json()]
+
+
+def test_search_by_name_and_location_prefix(client):
+    _create_banks(client)
+
+    assert _names(client, "name=bank") == ["Bank of Seattle"]
+    assert _names(client, "location=seat") == ["Validata Bank"]
+    assert _names(client, "name=ban&location=tac") == ["Bank of Seattle"]
+    assert _names(client, "name=seattle") == []
+
+
+def test_search_q_matches_substring_of_name_or_location(client):
+    _create_banks(client)
+
+    assert _names(client, "q=seattle") == ["Validata Bank", "Bank of Seattle"]
+    assert _names(client, "q=ATIO") == ["First National"]
+    # shorter than a trigram: served by a scan instead of the index
+    assert _names(client, "q=ta") == ["Validata Bank", "Bank of Seattle"]
+
+
+def test_search_treats_wildcards_literally(client):
+    _create_banks(client)
+
+    assert _names(client, "name=100%25") == ["100% Credit_Union"]
+    assert _names(client, "q=t_u") == ["100% Credit_Union"]
+    assert _names(client, "name=%25") == []
+    assert _names(client, 'q="') == []
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    ids = _create_banks(client)
+
+    client.put(f"/api/banks/{ids['First National']}", json={"name": "Second National", "location": "Denver"})
+    client.delete(f"/api/banks/{ids['Validata Bank']}")
+
+    assert _names(client, "q=national") == ["Second National"]
+    assert _names(client, "location=port") == []
+    assert _names(client, "q=seattle") == ["Bank of Seattle"]
+
+
+def test_search_paginates_and_keeps_filters_in_link(client):
+    _create_banks(client)
+
+    r = client.get("/api/banks?q=seattle&limit=1")
+    assert [bank["name"] for bank in r.get_json()] == ["Validata Bank"]
+    link = r.headers["Link"]
+    assert "q=seattle" in link
+
+    r = client.get(link[1:link.index(">")])
+    assert [bank["name"] for bank in r.get_json()] == ["Bank of Seattle"]
+    assert "Link" not in r.headers
+
+
+def test_search_rejects_overlong_terms(client):
+    assert client.get(f"/api/banks?q={'x' * 256}").status_code == 400
+
+
+def _mssql_where(search: SearchRequest, full_text: bool) -> str:
+    stmt = apply_search(select(Bank.id), search, "mssql", full_text=full_text)
+    sql = str(stmt.compile(dialect=mssql.dialect(), compile_kwargs={"literal_binds": True}))
+    return sql.split("WHERE", 1)[1].strip()
+
+
+def test_mssql_q_uses_word_prefix_full_text_search():
+    # Not the substring match of SQLite: "seat" finds "Seattle" but "ttle" finds nothing
+    assert _mssql_where(SearchRequest(q="seat"), full_text=True) == """CONTAINS((name, location), '"seat*"')"""
+
+
+def test_mssql_q_without_full_text_matches_substrings_like_sqlite():
+    assert _mssql_where(SearchRequest(name="100%", q="t_u"), full_text=False) == (
+        "banks.name LIKE '100/%%' ESCAPE '/' AND "
+        "(banks.name LIKE '%t/_u%' ESCAPE '/' OR banks.location LIKE '%t/_u%' ESCAPE '/')"
+    )
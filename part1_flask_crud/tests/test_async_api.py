@@ -0,0 +1,201 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.asgi import create_asgi_app
+from app.cache import BankCache, MemoryCache
+from app.db import STICKY_COOKIE
+from app.models import Base
+from bank_client import AsyncBankClient, RetryPolicy
+
+
+@pytest.fixture()
+def asgi_app(session_factory, tmp_path):
+    """ASGI app whose async routes use aiosqlite and whose sync fallback shares the cache."""
+    # A file database, so concurrent requests get their own connections
+    # instead of interleaving statements on a single shared one.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+    yield create_asgi_app(
+        {
+            "ASYNC_DB_SESSION_FACTORY": async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False),
+            "DB_SESSION_FACTORY": session_factory,
+            "BANK_CACHE": BankCache(MemoryCache()),
+            "TESTING": True,
+        }
+    )
+    asyncio.run(engine.dispose())
+
+
+def _client(asgi_app) -> AsyncBankClient:
+    transport = httpx.ASGITransport(app=asgi_app)
+    return AsyncBankClient("http://test/api", transport=transport, retry=RetryPolicy(attempts=1))
+
+
+def test_async_routes_crud(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            created = await client.map(lambda i: client.create_bank(f"Bank {i}", "NYC"), range(5))
+            bank = created[0]
+            assert await client.get_bank(bank["id"]) == bank
+            updated = await client.update_bank(bank["id"], "Renamed", "LA")
+            assert await client.get_bank(bank["id"]) == updated
+            # created concurrently, so IDs follow commit order rather than submission order
+            expected = sorted([updated] + created[1:], key=lambda b: b["id"])
+            assert [b async for b in client.iter_banks(page_size=2)] == expected
+            assert await client.delete_bank(bank["id"]) is True
+            assert await client.get_bank(bank["id"]) is None
+
+    asyncio.run(scenario())
+
+
+def test_async_list_and_get_support_etags(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            bank = await client.create_bank("Bank", "NYC")
+            for path in (f"/banks/{bank['id']}", "/banks"):
+                first = await client.client.get(path)
+                second = await client.client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+                assert second.status_code == 304
+
+    asyncio.run(scenario())
+
+
+def test_async_writes_honour_if_match(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            bank = await client.create_bank("Bank", "NYC")
+            path = f"/banks/{bank['id']}"
+            etag = (await client.client.get(path)).headers["ETag"]
+            payload = {"name": "Bank", "location": "LA"}
+            assert (await client.client.put(path, json=payload, headers={"If-Match": etag})).status_code == 200
+            assert (await client.client.put(path, json=payload, headers={"If-Match": etag})).status_code == 412
+            assert (await client.client.delete(path, headers={"If-Match": etag})).status_code == 412
+
+    asyncio.run(scenario())
+
+
+def test_async_list_search(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            await client.create_bank("Validata Bank", "Seattle")
+            await client.create_bank("First National", "Portland")
+            response = await client.client.get("/banks", params={"q": "seattle"})
+            return [bank["name"] for bank in response.json()]
+
+    assert asyncio.run(scenario()) == ["Validata Bank"]
+
+
+def test_unrouted_requests_fall_through_to_flask(asgi_app):
+    async def scenario():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            health = await client.get("/health")
+            bulk = await client.post("/api/banks/bulk", json=[{"name": "Bank", "location": "NYC"}])
+            page = await client.get("/banks/")
+        return health, bulk, page
+
+    health, bulk, page = asyncio.run(scenario())
+    assert health.json() == {"status": "ok"}
+    assert bulk.status_code == 201
+    assert "Bank" in page.text
+
+
+def test_async_create_uses_the_shared_write_behind_queue(session_factory):
+    asgi_app = create_asgi_app(
+        {"DB_SESSION_FACTORY": session_factory, "TESTING": True, "WRITE_BEHIND_ENABLED": True}
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post("/api/banks", json={"name": "Queued", "location": "NYC"})
+            queued = await client.post(
+                "/api/banks", json={"name": "Later", "location": "NYC"}, headers={"Prefer": "respond-async"}
+            )
+            await asyncio.sleep(0.1)
+            status = await client.get(queued.headers["Location"])
+            return created, queued, status
+
+    created, queued, status = asyncio.run(scenario())
+    asgi_app.asgi_app.config["WRITE_BEHIND_QUEUE"].close()
+
+    assert created.status_code == 201
+    assert created.json()["name"] == "Queued"
+    assert queued.status_code == 202
+    assert status.json()["status"] == "committed"
+
+
+def test_async_responses_are_compressed(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            await client.map(lambda i: client.create_bank(f"Bank {i} " + "x" * 40, "NYC"), range(25))
+            return await client.client.get("/banks", headers={"Accept-Encoding": "gzip"})
+
+    response = asyncio.run(scenario())
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(response.json()) == 25
+
+
+def test_async_routes_share_the_admission_limits(session_factory):
+    asgi_app = create_asgi_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "TESTING": True,
+            "ADMISSION_ENABLED": True,
+            "RATE_LIMITS": {"api.create_bank": 1},
+        }
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # an invalid payload is refused before any database work
+            return [await client.post("/api/banks", json={}) for _ in range(2)]
+
+    first, second = asyncio.run(scenario())
+    assert first.status_code == 400
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "1"
+
+
+def test_async_writes_make_the_client_read_from_the_primary(tmp_path):
+    primary = tmp_path / "primary.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{primary}")
+    primary_sync = create_engine(f"sqlite+pysqlite:///{primary}")
+    replica = create_engine(f"sqlite+pysqlite:///{tmp_path / 'replica.db'}")
+    for sync_engine in (primary_sync, replica):
+        Base.metadata.create_all(sync_engine)
+    asgi_app = create_asgi_app(
+        {
+            "ASYNC_DB_SESSION_FACTORY": async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False),
+            "DB_SESSION_FACTORY": sessionmaker(bind=primary_sync),
+            # the replica has not caught up with the primary
+            "DB_REPLICA_SESSION_FACTORIES": [sessionmaker(bind=replica)],
+            "TESTING": True,
+        }
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post("/api/banks", json={"name": "Fresh", "location": "NYC"})
+            # served by the Flask fallback, which routes reads to the replica by default
+            page = await client.get("/banks/")
+        await engine.dispose()
+        return created, page
+
+    created, page = asyncio.run(scenario())
+    assert created.status_code == 201
+    assert STICKY_COOKIE in created.headers["Set-Cookie"]
+    assert "Fresh" in page.text
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.models import Base
+from bank_client import ApiError, AsyncBankClient, BankClient, RetryPolicy
+
+NO_WAIT = RetryPolicy(attempts=3, backoff_seconds=0)
+
+
+def _serve(tmp_path, **config):
+    """Serve the app over real HTTP with a threaded server and a SQLite file."""
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'banks.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(engine)
+    app = create_app({"DB_SESSION_FACTORY": sessionmaker(bind=engine, autoflush=False), "TESTING": True, **config})
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/api"
+    server.shutdown()
+    write_behind = app.config.get("WRITE_BEHIND_QUEUE")
+    if write_behind is not None:
+        write_behind.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def base_url(tmp_path):
+    yield from _serve(tmp_path)
+
+
+@pytest.fixture()
+def write_behind_url(tmp_path):
+    # not durable, so every create is answered 202 with a ticket
+    yield from _serve(tmp_path, WRITE_BEHIND_ENABLED=True, WRITE_BEHIND_DURABLE=False)
+
+
+def test_sync_client_crud_and_paging(base_url):
+    with BankClient(base_url, retry=NO_WAIT) as client:
+        bank = client.create_bank("Bank A", "NYC")
+        assert client.get_bank(bank["id"]) == bank
+        assert client.update_bank(bank["id"], "Bank B", "LA")["name"] == "Bank B"
+
+        results = client.bulk_create([{"name": f"Bank {i}", "location": "SF"} for i in range(5)])
+        assert [r["status"] for r in results] == [201] * 5
+        assert len(list(client.iter_banks(page_size=2))) == 6
+
+        assert client.delete_bank(bank["id"]) is True
+        assert client.delete_bank(bank["id"]) is False
+        assert client.get_bank(bank["id"]) is None
+        with pytest.raises(ApiError) as excinfo:
+            client.create_bank("", "")
+        assert excinfo.value.status == 400
+
+
+def test_async_client_runs_operations_concurrently(base_url):
+    async def scenario():
+        async with AsyncBankClient(base_url, max_concurrency=4, retry=NO_WAIT) as client:
+            created = await client.map(lambda i: client.create_bank(f"Bank {i}", "NYC"), range(20))
+            await client.map(lambda b: client.update_bank(b["id"], b["name"], "LA"), created)
+            banks = [bank async for bank in client.iter_banks(page_size=7)]
+            deleted = await client.bulk_delete([b["id"] for b in created])
+            return created, banks, deleted
+
+    created, banks, deleted = asyncio.run(scenario())
+    assert sorted(b["id"] for b in banks) == sorted(b["id"] for b in created)
+    assert {b["location"] for b in banks} == {"LA"}
+    assert [r["index"] for r in deleted] == list(range(20))
+
+
+def test_clients_wait_for_queued_creates(write_behind_url):
+    with BankClient(write_behind_url, retry=NO_WAIT) as client:
+        bank = client.create_bank("Bank A", "NYC")
+        assert client.get_bank(bank["id"]) == bank
+
+    async def scenario():
+        async with AsyncBankClient(write_behind_url, retry=NO_WAIT) as client:
+            return await client.map(lambda i: client.create_bank(f"Bank {i}", "SF"), range(5))
+
+    created = asyncio.run(scenario())
+    assert [bank["name"] for bank in created] == [f"Bank {i}" for i in range(5)]
+    assert len({bank["id"] for bank in created}) == 5
+
+
+def test_retry_policy():
+    policy = RetryPolicy(attempts=3)
+    assert policy.should_retry("POST", 1, 429)
+    assert not policy.should_retry("POST", 1, 503)
+    assert policy.should_retry("PUT", 1, 503)
+    assert policy.should_retry("GET", 2)
+    assert not policy.should_retry("GET", 3, 503)
+    assert not policy.should_retry("GET", 1, 400)
+    assert policy.delay(1, retry_after="2") == 2.0
+    assert 0 <= policy.delay(5) <= policy.max_backoff_seconds
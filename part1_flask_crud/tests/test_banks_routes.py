@@ -138,3 +138,43 @@ def test_ui_delete_bank_redirects_and_deletes(client):
 
     r = client.get(f"/api/banks/{bank_id}")
     assert r.status_code == 404
+
+
+def test_ui_list_is_streamed_in_keyset_pages(client):
+    ids = [_create_bank_via_api(client, name=f"Bank {i}") for i in range(3)]
+
+    r = client.get("/banks/?limit=2")
+    assert r.status_code == 200
+    assert r.is_streamed
+    body = r.get_data(as_text=True)
+    assert "Bank 0" in body and "Bank 1" in body and "Bank 2" not in body
+    assert f"after={ids[1]}" in body
+
+    body = client.get(f"/banks/?limit=2&after={ids[1]}").get_data(as_text=True)
+    assert "Bank 2" in body
+    assert "Next page" not in body
+
+
+def test_ui_list_rejects_invalid_page_args(client):
+    assert client.get("/banks/?limit=0").status_code == 400
+
+
+def test_ui_update_with_stale_version_conflicts(client):
+    bank_id = _create_bank_via_api(client)
+    client.put(f"/api/banks/{bank_id}", json={"name": "Changed", "location": "LA"})
+
+    r = client.post(f"/banks/{bank_id}/edit", data={"name": "Mine", "location": "NYC", "version": "1"})
+    assert r.status_code == 409
+    assert b'name="version" value="2"' in r.data
+    assert client.get(f"/api/banks/{bank_id}").get_json()["name"] == "Changed"
+
+    r = client.post(f"/banks/{bank_id}/edit", data={"name": "Mine", "location": "NYC", "version": "2"})
+    assert r.status_code in (302, 303)
+
+
+def test_ui_delete_with_stale_version_conflicts(client):
+    bank_id = _create_bank_via_api(client)
+    client.put(f"/api/banks/{bank_id}", json={"name": "Changed", "location": "LA"})
+
+    assert client.post(f"/banks/{bank_id}/delete?version=1").status_code == 409
+    assert client.post(f"/banks/{bank_id}/delete?version=2").status_code in (302, 303)
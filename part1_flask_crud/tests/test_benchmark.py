@@ -0,0 +1,28 @@
+import pytest
+
+from scripts.benchmark import OPERATIONS, compare, parse_mix, percentile, run_benchmark
+
+
+def test_benchmark_drives_every_operation_without_errors():
+    report = run_benchmark(rows=20, requests=len(OPERATIONS) * 3, concurrency=2, mix={op: 1 for op in OPERATIONS})
+
+    assert report["total"]["count"] == len(OPERATIONS) * 3
+    assert report["total"]["errors"] == 0
+    for result in report["results"].values():
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_compare_flags_p95_regressions():
+    baseline = {"results": {"api_get": {"p95_ms": 10.0}}, "total": {"throughput_rps": 100.0}}
+    current = {"results": {"api_get": {"p95_ms": 12.0}}, "total": {"throughput_rps": 99.0}}
+
+    assert compare(current, baseline, tolerance=0.25) == []
+    assert compare(current, baseline, tolerance=0.10) == ["api_get: p95 10.000 ms -> 12.000 ms (+20%)"]
+
+
+def test_parse_mix_and_percentile():
+    assert parse_mix("api_get=3,ui_list") == {"api_get": 3.0, "ui_list": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("api_unknown=1")
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4], 99) == 4
@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+
+from app import create_app
+from app.cache import BankCache, CacheBackend, FileCache, MemoryCache
+
+
+@pytest.fixture()
+def cached_client(session_factory):
+    cache = BankCache(MemoryCache(max_entries=100, ttl_seconds=60))
+    app = create_app({"DB_SESSION_FACTORY": session_factory, "BANK_CACHE": cache, "TESTING": True})
+    return app.test_client(), cache
+
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = MemoryCache(max_entries=2, ttl_seconds=60)
+    cache = BankCache(backend)
+    cache.get_bank(1, lambda: {"id": 1})
+    cache.get_bank(2, lambda: {"id": 2})
+    cache.get_bank(1, lambda: {"id": 1})  # hit, 1 becomes most recent
+    cache.get_bank(3, lambda: {"id": 3})  # evicts 2
+
+    assert cache.get_bank(1, lambda: None) == {"id": 1}
+    assert cache.get_bank(2, lambda: None) is None
+    assert backend.stats.evictions >= 1
+
+
+def test_memory_cache_expires_entries():
+    cache = BankCache(MemoryCache(ttl_seconds=0.01))
+    cache.get_bank(1, lambda: {"id": 1})
+    time.sleep(0.02)
+    assert cache.get_bank(1, lambda: {"id": 1, "fresh": True}) == {"id": 1, "fresh": True}
+
+
+def test_file_cache_shares_entries_between_instances(tmp_path):
+    first = BankCache(FileCache(str(tmp_path), ttl_seconds=60))
+    second = BankCache(FileCache(str(tmp_path), ttl_seconds=60))
+    first.get_bank(1, lambda: {"id": 1, "name": "Alpha"})
+
+    assert second.get_bank(1, lambda: None) == {"id": 1, "name": "Alpha"}
+    first.invalidate(1)
+    assert second.get_bank(1, lambda: None) is None
+
+
+def test_file_cache_sweeps_list_pages_of_old_generations(tmp_path):
+    backend = FileCache(str(tmp_path), ttl_seconds=0.05, max_entries=1000)
+    cache = BankCache(backend)
+    for _ in range(5):
+        cache.get_list(("page",), lambda: [{"id": 1}])
+        cache.invalidate()
+    assert len(list(tmp_path.glob("*.json"))) > 1
+
+    time.sleep(0.06)
+    cache.get_list(("page",), lambda: [{"id": 1}])  # the write triggers a sweep
+
+    # only the current generation token and its page remain
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert backend.stats.evictions > 0
+
+
+def test_file_cache_sweep_caps_entries(tmp_path):
+    backend = FileCache(str(tmp_path), ttl_seconds=60, max_entries=3)
+    for i in range(10):
+        backend.set(f"key:{i}", i)
+        time.sleep(0.001)  # distinct mtimes, so the oldest are removed first
+
+    assert backend.sweep() == 7
+    assert [backend.get(f"key:{i}") for i in (7, 8, 9)] == [7, 8, 9]
+
+
+def test_cache_backend_requires_every_method():
+    with pytest.raises(TypeError):
+        CacheBackend(ttl_seconds=60)
+
+
+def test_get_bank_is_served_from_cache(cached_client):
+    client, cache = cached_client
+    bank_id = client.post("/api/banks", json={"name": "Alpha", "location": "NYC"}).get_json()["id"]
+
+    client.get(f"/api/banks/{bank_id}")
+    client.get(f"/api/banks/{bank_id}")
+    r = client.get(f"/banks/{bank_id}")
+    assert b"Alpha" in r.data
+
+    stats = client.get("/cache/stats").get_json()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_writes_invalidate_cached_reads(cached_client):
+    client, _ = cached_client
+    bank_id = client.post("/api/banks", json={"name": "Alpha", "location": "NYC"}).get_json()["id"]
+    assert len(client.get("/api/banks").get_json()) == 1
+    client.get(f"/api/banks/{bank_id}")
+
+    client.put(f"/api/banks/{bank_id}", json={"name": "Alpha", "location": "LA"})
+    assert client.get(f"/api/banks/{bank_id}").get_json()["location"] == "LA"
+
+    client.post(f"/banks/{bank_id}/edit", data={"name": "Alpha", "location": "SF"})
+    assert client.get(f"/api/banks/{bank_id}").get_json()["location"] == "SF"
+
+    client.post("/banks/new", data={"name": "Beta", "location": "LA"})
+    assert len(client.get("/api/banks").get_json()) == 2
+
+    client.delete(f"/api/banks/{bank_id}")
+    assert client.get(f"/api/banks/{bank_id}").status_code == 404
+    assert len(client.get("/api/banks").get_json()) == 1
+
+
+def test_rows_loaded_before_a_concurrent_write_are_not_cached():
+    cache = BankCache(MemoryCache())
+
+    def load_during_write():
+        # the row was read, then a write committed and invalidated the bank
+        cache.invalidate(1)
+        return {"id": 1, "name": "Old"}
+
+    assert cache.get_bank(1, load_during_write) == {"id": 1, "name": "Old"}
+    assert cache.get_bank(1, lambda: {"id": 1, "name": "New"}) == {"id": 1, "name": "New"}
+    assert cache.get_bank(1, lambda: pytest.fail("should be cached")) == {"id": 1, "name": "New"}
+
+    async def load_during_write_async():
+        cache.invalidate(2)
+        return {"id": 2, "name": "Old"}
+
+    async def load_async():
+        return {"id": 2, "name": "New"}
+
+    assert asyncio.run(cache.get_bank_async(2, load_during_write_async)) == {"id": 2, "name": "Old"}
+    assert asyncio.run(cache.get_bank_async(2, load_async)) == {"id": 2, "name": "New"}
+
+
+def test_ui_list_rows_are_cached_and_invalidated_on_edit_and_delete(cached_client):
+    client, cache = cached_client
+    alpha = client.post("/api/banks", json={"name": "Alpha", "location": "NYC"}).get_json()["id"]
+    beta = client.post("/api/banks", json={"name": "Beta", "location": "LA"}).get_json()["id"]
+
+    client.get("/banks/").get_data()
+    before = cache.stats()
+    client.get("/banks/").get_data()
+    assert cache.stats()["hits"] - before["hits"] == 2
+
+    client.post(f"/banks/{alpha}/edit", data={"name": "Alpha Renamed", "location": "NYC"})
+    client.post(f"/banks/{beta}/delete")
+    body = client.get("/banks/").get_data(as_text=True)
+    assert "Alpha Renamed (NYC)" in body
+    assert "Beta" not in body
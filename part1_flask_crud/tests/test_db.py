@@ -0,0 +1,65 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import create_app
+from app.config import AppConfig
+from app.db import InstrumentedQueuePool
+from app.models import Base
+
+
+def test_one_session_per_request_closed_on_teardown(session_factory):
+    created = []
+
+    def factory():
+        session = session_factory()
+        created.append(session)
+        return session
+
+    app = create_app({"DB_SESSION_FACTORY": factory, "TESTING": True})
+    client = app.test_client()
+
+    bank_id = client.post("/api/banks", json={"name": "Alpha", "location": "NYC"}).get_json()["id"]
+    client.get(f"/api/banks/{bank_id}")
+    # the list page is streamed; its query runs while the body is read
+    client.get("/banks/").get_data()
+
+    assert len(created) == 3
+    assert not any(session.in_transaction() for session in created)
+
+
+def test_pool_stats_report_checkouts_and_saturation(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'banks.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    client = create_app({"DB_SESSION_FACTORY": factory, "TESTING": True}).test_client()
+
+    client.post("/api/banks", json={"name": "Alpha", "location": "NYC"})
+    client.get("/api/banks")
+
+    stats = client.get("/pool/stats").get_json()
+    assert stats["pool"] == "InstrumentedQueuePool"
+    assert stats["checkouts"] >= 2
+    assert stats["checked_out"] == 0
+    assert stats["saturation"] == 0.0
+    assert stats["checkout_wait_seconds_max"] >= 0.0
+
+
+def test_app_config_reads_pool_settings(monkeypatch):
+    monkeypatch.setenv("DB_SERVER", "localhost")
+    monkeypatch.setenv("DB_NAME", "validata")
+    monkeypatch.setenv("DB_AUTH_MODE", "windows")
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    config = AppConfig.from_env()
+    assert (config.db_pool_size, config.db_max_overflow) == (20, 5)
+    assert (config.db_pool_recycle, config.db_pool_timeout) == (600, 2.5)
+    assert config.db_pool_pre_ping is False
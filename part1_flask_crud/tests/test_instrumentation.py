@@ -0,0 +1,68 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture()
+def instrumented_client(session_factory):
+    app = create_app({"DB_SESSION_FACTORY": session_factory, "INSTRUMENTATION": True, "TESTING": True})
+    return app.test_client()
+
+
+def _server_timing(response) -> dict:
+    entries = {}
+    for entry in response.headers["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+def test_server_timing_reports_sql_and_serialization(instrumented_client):
+    instrumented_client.post("/api/banks", json={"name": "Alpha", "location": "NYC"})
+
+    r = instrumented_client.get("/api/banks")
+    timing = _server_timing(r)
+    assert set(timing) == {"total", "db", "serialize", "render"}
+    assert timing["db"]["desc"] == '"1 queries"'  # the page; its ETag comes from the same rows
+    assert float(timing["serialize"]["dur"]) > 0
+
+
+def test_server_timing_reports_template_render(instrumented_client):
+    r = instrumented_client.get("/banks/new")
+    assert float(_server_timing(r)["render"]["dur"]) > 0
+
+
+def test_streamed_list_is_recorded_when_the_stream_ends(instrumented_client):
+    instrumented_client.post("/api/banks", json={"name": "Alpha", "location": "NYC"})
+
+    r = instrumented_client.get("/banks/")
+    # headers go out before the page is queried and rendered
+    assert "Server-Timing" not in r.headers
+    assert "Alpha" in r.get_data(as_text=True)
+    r.close()  # as a WSGI server does once the body is sent
+
+    body = instrumented_client.get("/metrics").get_data(as_text=True)
+    labels = 'method="GET",endpoint="/banks/"'
+    assert f'http_requests_total{{{labels},status="200"}} 1' in body
+    assert f"http_request_sql_queries_sum{{{labels}}} 1" in body
+    render_sum = f"http_request_render_duration_seconds_sum{{{labels}}}"
+    assert float(next(line for line in body.splitlines() if line.startswith(render_sum)).split()[-1]) > 0
+
+
+def test_metrics_endpoint_exposes_prometheus_histograms(instrumented_client):
+    instrumented_client.get("/api/banks")
+    instrumented_client.get("/api/banks/999")
+
+    r = instrumented_client.get("/metrics")
+    assert r.status_code == 200
+    assert r.mimetype == "text/plain"
+    body = r.get_data(as_text=True)
+    assert 'http_requests_total{method="GET",endpoint="/api/banks/<int:bank_id>",status="404"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",endpoint="/api/banks",le="+Inf"} 1' in body
+    assert "http_request_sql_queries_count" in body
+    assert "bank_cache_hits_total" in body
+
+
+def test_instrumentation_is_opt_in(client):
+    assert "Server-Timing" not in client.get("/api/banks").headers
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,54 @@
+import decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.instrumentation import TimedJSONProvider
+from app.json_provider import select_json_provider
+
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(ValueError):
+        select_json_provider("ujson")
+
+
+def test_missing_library_falls_back_to_stdlib(monkeypatch):
+    monkeypatch.setattr("app.json_provider._is_installed", lambda name: False)
+
+    assert select_json_provider("auto") is DefaultJSONProvider
+    assert select_json_provider("orjson") is DefaultJSONProvider
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec"])
+def test_fast_provider_serves_api_responses(session_factory, name):
+    pytest.importorskip(name)
+    app = create_app({"DB_SESSION_FACTORY": session_factory, "TESTING": True, "JSON_PROVIDER": name})
+    client = app.test_client()
+
+    assert type(app.json) is select_json_provider(name)
+    created = client.post("/api/banks", json={"name": "Fast Bank", "location": "Zurich"})
+    assert created.status_code == 201
+    assert created.mimetype == "application/json"
+    bank = created.get_json()
+
+    assert client.get(f"/api/banks/{bank['id']}").get_json() == bank
+    assert bank in client.get("/api/banks").get_json()
+    with app.app_context():
+        # non-str keys and types handled by Flask's default() still encode
+        assert app.json.loads(app.json.dumps({1: decimal.Decimal("1.5")})) == {"1": "1.5"}
+
+
+def test_instrumentation_wraps_selected_provider(session_factory):
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "TESTING": True,
+            "JSON_PROVIDER": "stdlib",
+            "INSTRUMENTATION": True,
+        }
+    )
+
+    assert isinstance(app.json, TimedJSONProvider)
+    assert type(app.json.inner) is DefaultJSONProvider
+    assert app.test_client().get("/api/banks").status_code == 200
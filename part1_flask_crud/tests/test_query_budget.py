@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import select
+
+from app import create_app
+from app.db import get_session
+from app.models import Bank
+from app.query_budget import QueryBudgetExceeded, QueryBudgetReport
+
+
+def test_crud_routes_stay_within_budget(query_budget):
+    query_budget.application.config["QUERY_BUDGETS"].update(
+        {"api.get_bank": 1, "api.list_banks": 1}
+    )
+
+    bank_id = query_budget.post("/api/banks", json={"name": "Alpha", "location": "NYC"}).get_json()["id"]
+    assert query_budget.get(f"/api/banks/{bank_id}").status_code == 200
+    assert query_budget.get("/api/banks").status_code == 200
+    assert query_budget.put(f"/api/banks/{bank_id}", json={"name": "A", "location": "LA"}).status_code == 200
+    assert query_budget.get(f"/banks/{bank_id}").status_code == 200
+    assert query_budget.delete(f"/api/banks/{bank_id}").status_code == 204
+
+
+def test_exceeding_budget_fails_the_request(query_budget):
+    query_budget.application.config["QUERY_BUDGETS"]["api.list_banks"] = 0
+
+    with pytest.raises(QueryBudgetExceeded):
+        query_budget.get("/api/banks")
+
+
+def test_streamed_list_is_checked_when_the_stream_ends(query_budget):
+    query_budget.application.config["QUERY_BUDGETS"]["banks.list_banks"] = 0
+
+    r = query_budget.get("/banks/")
+    r.get_data()
+    # checked when the WSGI server closes the body, after the page query ran
+    with pytest.raises(QueryBudgetExceeded):
+        r.close()
+
+    query_budget.application.config["QUERY_BUDGETS"]["banks.list_banks"] = 1
+    r = query_budget.get("/banks/")
+    r.get_data()
+    r.close()
+    report = query_budget.application.config["QUERY_BUDGET_REPORT"].as_dict()
+    assert report["banks.list_banks"]["max_statements"] == 1
+
+
+def test_repeated_statements_are_flagged(session_factory):
+    report = QueryBudgetReport()
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "QUERY_BUDGET_ENABLED": True,
+            "QUERY_BUDGET_REPORT": report,
+            "TESTING": True,
+        }
+    )
+
+    @app.get("/n-plus-one")
+    def n_plus_one():
+        session = get_session()
+        session.add_all([Bank(name=f"Bank {i}", location="NYC") for i in range(3)])
+        session.commit()
+        session.expunge_all()
+        # one SELECT per bank instead of a single query
+        bank_ids = session.scalars(select(Bank.id)).all()
+        return {"names": [session.get(Bank, bank_id).name for bank_id in bank_ids]}
+
+    app.test_client().get("/n-plus-one")
+
+    endpoint = report.as_dict()["n_plus_one"]
+    assert endpoint["violations"] == 0
+    assert max(endpoint["repeated_statements"].values()) >= 3
+
+
+def test_budget_and_instrumentation_share_statement_counts(session_factory):
+    report = QueryBudgetReport()
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "INSTRUMENTATION": True,
+            "QUERY_BUDGET_ENABLED": True,
+            "QUERY_BUDGET_REPORT": report,
+            "TESTING": True,
+        }
+    )
+    r = app.test_client().get("/api/banks")
+
+    statements = report.as_dict()["api.list_banks"]["max_statements"]
+    assert statements == 1
+    assert f'desc="{statements} queries"' in r.headers["Server-Timing"]
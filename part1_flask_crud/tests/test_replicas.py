@@ -0,0 +1,140 @@
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import create_app
+from app.cache import BankCache, MemoryCache
+from app.db import STICKY_COOKIE, ReplicaRouter
+from app.models import Bank, Base
+
+
+def _database(path, *names):
+    """A SQLite file standing in for one server, seeded with banks."""
+    engine = create_engine(f"sqlite+pysqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    if names:
+        with engine.begin() as conn:
+            conn.execute(insert(Bank), [{"name": name, "location": "NYC"} for name in names])
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture()
+def replicated_app(tmp_path):
+    # Each "server" holds different rows, so responses show which one served
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": _database(tmp_path / "primary.db", "Primary"),
+            "DB_REPLICA_SESSION_FACTORIES": [
+                _database(tmp_path / "replica1.db", "Replica 1"),
+                _database(tmp_path / "replica2.db", "Replica 2"),
+            ],
+            "TESTING": True,
+        }
+    )
+    yield app
+    for factory in [app.config["DB_SESSION_FACTORY"], *app.config["DB_REPLICA_SESSION_FACTORIES"]]:
+        factory.kw["bind"].dispose()
+
+
+def _names(response):
+    return [bank["name"] for bank in response.get_json()]
+
+
+def test_reads_are_spread_round_robin_over_replicas(replicated_app):
+    client = replicated_app.test_client()
+
+    served = [_names(client.get("/api/banks")) for _ in range(4)]
+
+    assert served == [["Replica 1"], ["Replica 2"], ["Replica 1"], ["Replica 2"]]
+    assert [replica["served"] for replica in client.get("/pool/stats").get_json()["replicas"]] == [2, 2]
+
+
+def test_html_list_is_read_from_a_replica(replicated_app):
+    body = replicated_app.test_client().get("/banks/").get_data(as_text=True)
+
+    assert "Replica 1" in body
+    assert "Primary" not in body
+
+
+def test_writes_go_to_the_primary_and_make_the_client_sticky(replicated_app):
+    writer = replicated_app.test_client()
+
+    created = writer.post("/api/banks", json={"name": "New", "location": "LA"})
+
+    assert created.status_code == 201
+    assert writer.get_cookie(STICKY_COOKIE) is not None
+    assert _names(writer.get("/api/banks")) == ["Primary", "New"]
+    # other clients keep reading from the replicas
+    assert _names(replicated_app.test_client().get("/api/banks")) == ["Replica 1"]
+
+
+def test_sticky_window_expires(replicated_app):
+    client = replicated_app.test_client()
+    client.set_cookie(STICKY_COOKIE, "0")
+
+    assert _names(client.get("/api/banks")) == ["Replica 1"]
+
+
+def test_failed_writes_do_not_make_the_client_sticky(replicated_app):
+    client = replicated_app.test_client()
+
+    assert client.post("/api/banks", json={"name": ""}).status_code == 400
+    assert client.get_cookie(STICKY_COOKIE) is None
+
+
+def test_stickiness_can_be_disabled(tmp_path):
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": _database(tmp_path / "primary.db"),
+            "DB_REPLICA_SESSION_FACTORIES": [_database(tmp_path / "replica.db")],
+            "DB_READ_YOUR_WRITES_SECONDS": 0,
+            "TESTING": True,
+        }
+    )
+    client = app.test_client()
+
+    client.post("/api/banks", json={"name": "New", "location": "LA"})
+
+    assert client.get_cookie(STICKY_COOKIE) is None
+    assert client.get("/api/banks").get_json() == []
+
+
+def test_least_connections_picks_the_least_busy_replica():
+    router = ReplicaRouter([object(), object(), object()], strategy="least_connections")
+
+    first, second = router.acquire(), router.acquire()
+    router.release(first)
+
+    assert (first, second) == (0, 1)
+    # replica 0 is idle again but has served more than replica 2
+    assert router.acquire() == 2
+    assert router.acquire() == 0
+    assert [replica["active"] for replica in router.stats()] == [1, 1, 1]
+
+
+def test_router_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        ReplicaRouter([object()], strategy="random")
+
+
+def test_lagging_replica_reads_are_not_cached(tmp_path):
+    # the replicas have not yet seen the primary's rows
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": _database(tmp_path / "primary.db", "Primary"),
+            "DB_REPLICA_SESSION_FACTORIES": [_database(tmp_path / "replica.db", "Stale")],
+            "BANK_CACHE": BankCache(MemoryCache()),
+            "TESTING": True,
+        }
+    )
+    writer, reader = app.test_client(), app.test_client()
+
+    writer.put("/api/banks/1", json={"name": "Renamed", "location": "NYC"})
+    assert reader.get("/api/banks/1").get_json()["name"] == "Stale"
+    assert _names(reader.get("/api/banks")) == ["Stale"]
+
+    # the sticky writer reads its own write, not the replica's rows cached by the reader
+    assert writer.get("/api/banks/1").get_json()["name"] == "Renamed"
+    assert _names(writer.get("/api/banks")) == ["Renamed"]
+    # what the primary returned may be cached and served to everyone
+    assert _names(reader.get("/api/banks")) == ["Renamed"]
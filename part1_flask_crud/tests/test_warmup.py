@@ -0,0 +1,20 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import create_app
+from app.models import Base
+from app.warmup import warm_up
+
+
+def test_warm_up_fills_pool_and_template_cache(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'banks.db'}", pool_size=3)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    app = create_app({"DB_SESSION_FACTORY": sessionmaker(bind=engine)})
+
+    timings = warm_up(app)
+
+    assert set(timings) == {"mappers_seconds", "pool_seconds", "templates_seconds"}
+    assert engine.pool.checkedin() == 3
+    assert len(app.jinja_env.cache) == len(app.jinja_env.list_templates())
+    engine.dispose()
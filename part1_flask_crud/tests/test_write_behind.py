@@ -0,0 +1,190 @@
+import threading
+import time
+
+import pytest
+
+from app import create_app
+from app.cache import BankCache, MemoryCache
+from app.write_behind import WriteBehindFull, WriteBehindQueue
+
+
+@pytest.fixture()
+def write_behind_app(session_factory):
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "TESTING": True,
+            "WRITE_BEHIND_ENABLED": True,
+            "WRITE_BEHIND_INTERVAL_MS": 20,
+        }
+    )
+    yield app
+    app.config["WRITE_BEHIND_QUEUE"].close()
+
+
+def _poll(client, location, attempts=100):
+    for _ in range(attempts):
+        response = client.get(location)
+        if response.get_json()["status"] != "pending":
+            return response
+        time.sleep(0.01)
+    raise AssertionError("write was never committed")
+
+
+def test_durable_create_waits_for_the_group_commit(write_behind_app):
+    client = write_behind_app.test_client()
+
+    response = client.post("/api/banks", json={"name": "Queued", "location": "Dublin"})
+
+    assert response.status_code == 201
+    bank = response.get_json()
+    assert bank["name"] == "Queued"
+    assert response.headers["ETag"] == f'"bank-{bank["id"]}-v1"'
+    assert client.get(f"/api/banks/{bank['id']}").get_json()["location"] == "Dublin"
+
+
+def test_respond_async_returns_a_ticket_to_poll(write_behind_app):
+    client = write_behind_app.test_client()
+
+    response = client.post(
+        "/api/banks", json={"name": "Later", "location": "Cork"}, headers={"Prefer": "respond-async"}
+    )
+
+    assert response.status_code == 202
+    assert response.get_json()["status"] in {"pending", "committed"}
+    status = _poll(client, response.headers["Location"])
+    body = status.get_json()
+    assert body["status"] == "committed"
+    assert body["bank"]["name"] == "Later"
+    assert status.headers["Location"].endswith(f"/api/banks/{body['bank']['id']}")
+
+
+def test_non_durable_mode_always_returns_202(write_behind_app):
+    write_behind_app.config["WRITE_BEHIND_DURABLE"] = False
+    client = write_behind_app.test_client()
+
+    response = client.post("/api/banks", json={"name": "Fast", "location": "Galway"})
+
+    assert response.status_code == 202
+    assert _poll(client, response.headers["Location"]).get_json()["status"] == "committed"
+
+
+def test_invalid_payload_is_rejected_before_queueing(write_behind_app):
+    client = write_behind_app.test_client()
+
+    response = client.post("/api/banks", json={"name": "", "location": "Cork"})
+
+    assert response.status_code == 400
+    assert client.get("/write-behind/stats").get_json()["enqueued"] == 0
+
+
+def test_too_long_fields_are_rejected_before_queueing(write_behind_app):
+    client = write_behind_app.test_client()
+
+    response = client.post("/api/banks", json={"name": "x" * 256, "location": "Cork"})
+
+    assert response.status_code == 400
+    assert "255" in response.get_json()["error"]
+    assert client.get("/write-behind/stats").get_json()["enqueued"] == 0
+
+
+def test_unknown_ticket_is_404(write_behind_app):
+    response = write_behind_app.test_client().get("/api/banks/pending/nope")
+
+    assert response.status_code == 404
+
+
+def test_concurrent_creates_are_group_committed(session_factory):
+    write_behind = WriteBehindQueue(session_factory, BankCache(MemoryCache()), interval_ms=50)
+    try:
+        writes = [write_behind.submit(f"Bank {i}", "City") for i in range(50)]
+        banks = [write.future.result(timeout=5) for write in writes]
+    finally:
+        write_behind.close()
+
+    assert [bank["name"] for bank in banks] == [f"Bank {i}" for i in range(50)]
+    assert len({bank["id"] for bank in banks}) == 50
+    stats = write_behind.stats()
+    assert stats["committed"] == 50
+    assert stats["batches"] < 50
+
+
+def test_failed_batch_is_retried_row_by_row(session_factory):
+    write_behind = WriteBehindQueue(session_factory, BankCache(MemoryCache()), interval_ms=50)
+    try:
+        # a NULL name violates the NOT NULL constraint and fails the group insert
+        writes = [write_behind.submit(name, "City") for name in ("Good 1", None, "Good 2")]
+        good = [writes[0].future.result(timeout=5), writes[2].future.result(timeout=5)]
+        error = writes[1].future.exception(timeout=5)
+    finally:
+        write_behind.close()
+
+    assert [bank["name"] for bank in good] == ["Good 1", "Good 2"]
+    assert error is not None
+    stats = write_behind.stats()
+    assert (stats["committed"], stats["failed"]) == (2, 1)
+
+
+def test_close_fails_writes_it_could_not_commit(session_factory):
+    write_behind = WriteBehindQueue(session_factory, BankCache(MemoryCache()))
+    # Hold the writer inside its first commit so the second write stays queued
+    entered, release = threading.Event(), threading.Event()
+    commit = write_behind._commit
+    write_behind._commit = lambda batch: (entered.set(), release.wait(5), commit(batch))
+    first = write_behind.submit("A", "X")
+    assert entered.wait(2)
+    second = write_behind.submit("B", "X")
+
+    write_behind.close(timeout=0.1)
+    release.set()
+
+    assert isinstance(second.future.exception(timeout=1), RuntimeError)
+    assert write_behind.status(second.ticket)["status"] == "failed"
+    assert first.future.result(timeout=5)["name"] == "A"
+
+
+def test_full_queue_is_rejected_with_503(session_factory):
+    app = create_app(
+        {
+            "DB_SESSION_FACTORY": session_factory,
+            "TESTING": True,
+            "WRITE_BEHIND_ENABLED": True,
+            "WRITE_BEHIND_MAX_QUEUE": 1,
+            "WRITE_BEHIND_DURABLE": False,
+        }
+    )
+    write_behind = app.config["WRITE_BEHIND_QUEUE"]
+    # Hold the writer inside its first commit so the queue cannot drain
+    release = threading.Event()
+    commit = write_behind._commit
+    write_behind._commit = lambda batch: (release.wait(5), commit(batch))
+    client = app.test_client()
+    try:
+        client.post("/api/banks", json={"name": "A", "location": "X"})
+        deadline = time.monotonic() + 2
+        while write_behind.stats()["queued"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client.post("/api/banks", json={"name": "B", "location": "X"})
+
+        response = client.post("/api/banks", json={"name": "C", "location": "X"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert client.get("/write-behind/stats").get_json()["rejected"] == 1
+    finally:
+        release.set()
+        write_behind.close()
+
+
+def test_submit_raises_when_full(session_factory):
+    write_behind = WriteBehindQueue(session_factory, BankCache(MemoryCache()), max_queue=1)
+    # Not started: nothing drains the queue
+    write_behind._ensure_started = lambda: None
+    write_behind.submit("A", "X")
+
+    with pytest.raises(WriteBehindFull):
+        write_behind.submit("B", "X")
+
+
+def test_stats_when_disabled(client):
+    assert client.get("/write-behind/stats").get_json() == {"enabled": False}
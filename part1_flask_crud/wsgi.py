@@ -0,0 +1,5 @@
+from app import create_app
+
+# Imported by every gunicorn worker after fork (preload_app is off), so each
+# worker builds its own engine and connection pool.
+app = create_app()
@@ -1,56 +1,32 @@
-import os
+import argparse
 from pathlib import Path
+from typing import Optional, Sequence
 
 import pandas as pd
-from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from preprocessing import ARTIFACTS_DIR, prepare
+from schema import TARGET_COL, processed_dtypes
+from storage import export_csv, read_table, write_table
 
-RAW_PATH = Path("part2_ml/data/raw/loan_data.csv")
+
+RAW_PATH = Path("part2_ml/data/raw/loan_data.parquet")
 PROCESSED_DIR = Path("part2_ml/data/processed")
-PROCESSED_DATASET_PATH = PROCESSED_DIR / "loan_data_processed.csv"
-TRAIN_PATH = PROCESSED_DIR / "train.csv"
-TEST_PATH = PROCESSED_DIR / "test.csv"
-
-
-def main() -> None:
-    df = pd.read_csv(RAW_PATH)
-
-    target_col = "loan_approved"
-    X = df.drop(columns=[target_col])
-    y = df[target_col].astype(int)
-
-    numeric_features = ["income", "credit_score", "loan_amount", "loan_term"]
-    categorical_features = ["employment_status"]
-
-    # Preprocessing:
-    # - One-hot encode employment_status
-    # - Standardize numeric features (important for KNN)
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", StandardScaler(), numeric_features),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_features),
-        ],
-        remainder="drop",
-    )
+PROCESSED_DATASET_PATH = PROCESSED_DIR / "loan_data_processed.feather"
+TRAIN_PATH = PROCESSED_DIR / "train.feather"
+TEST_PATH = PROCESSED_DIR / "test.feather"
 
-    # Fit on full dataset ONLY for the purpose of exporting a processed dataset CSV
-    # (Train/Test split is done separately below for modeling.)
-    X_processed = preprocessor.fit_transform(X)
 
-    # Build feature names for the processed matrix
-    ohe = preprocessor.named_transformers_["cat"]
-    cat_feature_names = list(ohe.get_feature_names_out(categorical_features))
-    feature_names = numeric_features + cat_feature_names
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Preprocess the loan dataset and split it.")
+    parser.add_argument("--raw", type=Path, default=RAW_PATH, help="raw table (Parquet file or directory, or CSV)")
+    parser.add_argument("--no-csv", action="store_true", help="skip the CSV exports")
+    args = parser.parse_args(argv)
 
-    processed_df = pd.DataFrame(X_processed.toarray() if hasattr(X_processed, "toarray") else X_processed,
-                                columns=feature_names)
-    processed_df[target_col] = y.values
+    df = read_table(args.raw)
 
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    processed_df.to_csv(PROCESSED_DATASET_PATH, index=False)
+    X = df.drop(columns=[TARGET_COL])
+    y = df[TARGET_COL]
 
     # Train/test split for modeling (reproducible)
     X_train, X_test, y_train, y_test = train_test_split(
@@ -59,16 +35,32 @@ def main() -> None:
 
     # Save raw-split (unprocessed) so downstream scripts can reuse the same split
     train_df = X_train.copy()
-    train_df[target_col] = y_train.values
+    train_df[TARGET_COL] = y_train.values
     test_df = X_test.copy()
-    test_df[target_col] = y_test.values
+    test_df[TARGET_COL] = y_test.values
+
+    write_table(train_df, TRAIN_PATH)
+    write_table(test_df, TEST_PATH)
+
+    # Fit the shared preprocessor on the training split and cache the
+    # transformed matrices for the modeling stages
+    prepared = prepare(read_table(TRAIN_PATH), read_table(TEST_PATH))
+
+    # Processed export of the full dataset, scaled with the training-split fit
+    processed_df = pd.DataFrame(prepared.preprocessor.transform(X), columns=prepared.feature_names)
+    processed_df[TARGET_COL] = y.values
+
+    write_table(processed_df, PROCESSED_DATASET_PATH, processed_dtypes(processed_df.columns))
 
-    train_df.to_csv(TRAIN_PATH, index=False)
-    test_df.to_csv(TEST_PATH, index=False)
+    if not args.no_csv:
+        export_csv(processed_df, PROCESSED_DATASET_PATH)
+        export_csv(train_df, TRAIN_PATH)
+        export_csv(test_df, TEST_PATH)
 
     print(f"Saved processed dataset: {PROCESSED_DATASET_PATH}")
     print(f"Saved train split: {TRAIN_PATH}")
     print(f"Saved test split: {TEST_PATH}")
+    print(f"Saved preprocessor and transformed splits: {ARTIFACTS_DIR}")
 
 
 if __name__ == "__main__":
@@ -1,17 +1,37 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
 import numpy as np
 import pandas as pd
 
+from schema import EMPLOYMENT_STATUSES, apply_schema
+from storage import export_csv, write_table
+
+
+RAW_PATH = Path("part2_ml/data/raw/loan_data.parquet")
+DEFAULT_CHUNK_SIZE = 1_000_000
+# Rows drawn from one random stream. Fixed, so the rows do not depend on the
+# chunk size, which only decides how they are split into files.
+GENERATION_BLOCK_SIZE = 65_536
+
+# Columns standardized before building the approval score
+NORMALIZED = ("income", "credit_score", "loan_amount")
+
 
 def sigmoid(x: np.ndarray) -> np.ndarray:
     return 1 / (1 + np.exp(-x))
 
 
-def generate_dataset(n: int = 500, seed: int = 42) -> pd.DataFrame:
-    rng = np.random.default_rng(seed)
-
+def _features(rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+    """Draw the applicant features for `n` rows (everything except the target)."""
     # Employment status (categorical)
     employment_status = rng.choice(
-        ["employed", "self-employed", "unemployed"],
+        EMPLOYMENT_STATUSES,
         size=n,
         p=[0.65, 0.25, 0.10],
     )
@@ -33,6 +53,51 @@ def generate_dataset(n: int = 500, seed: int = 42) -> pd.DataFrame:
     noise = rng.normal(loc=0, scale=5000, size=n)
     loan_amount = np.clip(base_loan + noise, 1000, 80000)
 
+    return {
+        "employment_status": employment_status,
+        "income": income,
+        "credit_score": credit_score,
+        "loan_term": loan_term,
+        "loan_amount": loan_amount,
+    }
+
+
+def _moments(features: Dict[str, np.ndarray]) -> Dict[str, Tuple[int, float, float]]:
+    """(count, mean, sum of squared deviations) of each normalized column."""
+    moments = {}
+    for col in NORMALIZED:
+        values = features[col]
+        mean = float(values.mean())
+        moments[col] = (values.size, mean, float(((values - mean) ** 2).sum()))
+    return moments
+
+
+def _combine_moments(parts: Sequence[Dict[str, Tuple[int, float, float]]]) -> Dict[str, Tuple[float, float]]:
+    """Merge per-chunk moments into global (mean, std) per column.
+
+    Uses the pairwise update of Chan et al., which is exact and stable, so
+    the stats equal those of the full column whatever the chunking.
+    """
+    stats = {}
+    for col in NORMALIZED:
+        count, mean, m2 = 0, 0.0, 0.0
+        for part in parts:
+            n_b, mean_b, m2_b = part[col]
+            total = count + n_b
+            delta = mean_b - mean
+            mean += delta * n_b / total
+            m2 += m2_b + delta * delta * count * n_b / total
+            count = total
+        # population std, as np.std() in the in-memory generator
+        stats[col] = (mean, float(np.sqrt(m2 / count)))
+    return stats
+
+
+def _label(rng: np.random.Generator, features: Dict[str, np.ndarray], stats: Dict[str, Tuple[float, float]]) -> pd.DataFrame:
+    """Draw loan approval for drawn features, normalizing with the given global stats."""
+    employment_status = features["employment_status"]
+    n = employment_status.size
+
     # Employment stability score
     emp_score = np.select(
         [employment_status == "employed", employment_status == "self-employed", employment_status == "unemployed"],
@@ -41,9 +106,7 @@ def generate_dataset(n: int = 500, seed: int = 42) -> pd.DataFrame:
 
     # Build approval probability (probabilistic decision)
     # Normalize key variables roughly to comparable scales
-    income_z = (income - income.mean()) / income.std()
-    credit_z = (credit_score - credit_score.mean()) / credit_score.std()
-    loan_z = (loan_amount - loan_amount.mean()) / loan_amount.std()
+    income_z, credit_z, loan_z = ((features[col] - stats[col][0]) / stats[col][1] for col in NORMALIZED)
 
     # Latent score: higher income/credit help, larger loan hurts, employment helps
     latent_score = (
@@ -57,22 +120,166 @@ def generate_dataset(n: int = 500, seed: int = 42) -> pd.DataFrame:
     approval_prob = sigmoid(latent_score)
     loan_approved = rng.binomial(n=1, p=approval_prob, size=n)
 
-    df = pd.DataFrame(
+    return pd.DataFrame(
         {
-            "income": income.round(0).astype(int),
-            "credit_score": credit_score.round(0).astype(int),
-            "loan_amount": loan_amount.round(0).astype(int),
-            "loan_term": loan_term.astype(int),
+            "income": features["income"].round(0).astype(int),
+            "credit_score": features["credit_score"].round(0).astype(int),
+            "loan_amount": features["loan_amount"].round(0).astype(int),
+            "loan_term": features["loan_term"].astype(int),
             "employment_status": employment_status,
             "loan_approved": loan_approved.astype(int),
         }
     )
 
-    return df
 
+def generate_dataset(n: int = 500, seed: int = 42) -> pd.DataFrame:
+    if n < 1:
+        raise ValueError("n must be at least 1.")
+    rng = np.random.default_rng(seed)
+    features = _features(rng, n)
+    return _label(rng, features, _combine_moments([_moments(features)]))
 
-if __name__ == "__main__":
-    df = generate_dataset(n=500, seed=42)
-    df.to_csv("part2_ml/data/raw/loan_data.csv", index=False)
-    print("Saved: part2_ml/data/raw/loan_data.csv")
+
+# ---------------------------------------------------------------------------
+# Chunked generation (datasets larger than memory)
+# ---------------------------------------------------------------------------
+
+
+def _chunk_sizes(n: int, chunk_size: int) -> List[int]:
+    return [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+
+
+def _block_rng(seed: int, block: int) -> np.random.Generator:
+    # the stream SeedSequence(seed).spawn() would give this block, without spawning the others
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+
+def _block_moments(seed: int, block: int, size: int) -> Dict[str, Tuple[int, float, float]]:
+    return _moments(_features(_block_rng(seed, block), size))
+
+
+@lru_cache(maxsize=1)
+def _block(seed: int, block: int, size: int, stats: Tuple[Tuple[str, Tuple[float, float]], ...]) -> pd.DataFrame:
+    # Same stream as in the first pass, so the features are drawn again
+    # identically. Cached, as a block may straddle two consecutive files.
+    rng = _block_rng(seed, block)
+    return _label(rng, _features(rng, size), dict(stats))
+
+
+def _write_chunk(
+    index: int,
+    start: int,
+    stop: int,
+    n: int,
+    seed: int,
+    stats: Tuple[Tuple[str, Tuple[float, float]], ...],
+    out_dir: Path,
+    fmt: str,
+) -> Path:
+    """Write rows [start, stop) to one file, cut from the generation blocks they fall in."""
+    parts = []
+    for block in range(start // GENERATION_BLOCK_SIZE, (stop - 1) // GENERATION_BLOCK_SIZE + 1):
+        block_start = block * GENERATION_BLOCK_SIZE
+        rows = _block(seed, block, min(GENERATION_BLOCK_SIZE, n - block_start), stats)
+        parts.append(rows.iloc[max(start - block_start, 0):stop - block_start])
+    df = apply_schema(pd.concat(parts, ignore_index=True))
+    path = out_dir / f"part-{index:05d}.{fmt}"
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def generate_dataset_chunked(
+    n: int,
+    out_dir: Path,
+    seed: int = 42,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    fmt: str = "parquet",
+) -> List[Path]:
+    """Generate `n` rows as one Parquet/CSV file per chunk under `out_dir`.
+
+    Rows are drawn in blocks of GENERATION_BLOCK_SIZE, each from its own
+    stream spawned from `seed`, and the blocks are cut into files of
+    `chunk_size` rows. The rows are therefore the same for a given (n, seed)
+    whatever the chunk size and however many `workers` processes run.
+
+    The approval score is normalized with global stats, computed in a first
+    pass that only draws the features and keeps per-block moments. The
+    second pass redraws each block from its stream and labels it. Only one
+    file chunk and the block being cut are held in memory per worker.
+    """
+    if fmt not in ("parquet", "csv"):
+        raise ValueError("fmt must be 'parquet' or 'csv'.")
+    if n < 1:
+        raise ValueError("n must be at least 1.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    block_sizes = _chunk_sizes(n, GENERATION_BLOCK_SIZE)
+    starts = range(0, n, chunk_size)
+    stops = [min(start + chunk_size, n) for start in starts]
+    workers = workers or os.cpu_count() or 1
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        moments = pool.map(_block_moments, [seed] * len(block_sizes), range(len(block_sizes)), block_sizes)
+        stats = tuple(sorted(_combine_moments(list(moments)).items()))
+        return list(
+            pool.map(
+                _write_chunk,
+                range(len(starts)),
+                starts,
+                stops,
+                [n] * len(starts),
+                [seed] * len(starts),
+                [stats] * len(starts),
+                [out_dir] * len(starts),
+                [fmt] * len(starts),
+                # consecutive files per worker, so a block shared by two is drawn once
+                chunksize=math.ceil(len(starts) / workers),
+            )
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate the synthetic loan dataset.")
+    parser.add_argument("--rows", type=int, default=500, help="number of loan applications")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out-dir", type=Path, help="write chunk files here instead of the raw CSV")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="rows per chunk file; the rows themselves do not depend on it",
+    )
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument(
+        "--format",
+        choices=["parquet", "csv"],
+        default="parquet",
+        help="chunk file format; either directory can be read back with storage.read_table",
+    )
+    args = parser.parse_args(argv)
+    if args.rows < 1:
+        parser.error("--rows must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    if args.out_dir is not None:
+        paths = generate_dataset_chunked(
+            args.rows, args.out_dir, args.seed, args.chunk_size, args.workers, args.format
+        )
+        print(f"Saved {args.rows} rows in {len(paths)} {args.format} files under: {args.out_dir}")
+        return
+
+    df = generate_dataset(n=args.rows, seed=args.seed)
+    write_table(df, RAW_PATH)
+    csv_path = export_csv(df, RAW_PATH)
+    print(f"Saved: {RAW_PATH} (CSV export: {csv_path})")
     print(df.head())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Registry of the candidate models compared by train_and_evaluate.py.
+
+Each entry maps the name reported in metrics.csv to a factory returning a
+fresh, unfitted estimator. Candidates are added with `register_model`.
+"""
+
+from typing import Callable, Dict
+
+from sklearn.base import ClassifierMixin
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+
+ModelFactory = Callable[[], ClassifierMixin]
+
+MODELS: Dict[str, ModelFactory] = {}
+
+
+def register_model(name: str, factory: ModelFactory) -> None:
+    if name in MODELS:
+        raise ValueError(f"Model already registered: {name}")
+    MODELS[name] = factory
+
+
+# Model 1: KNN (scaling is important)
+register_model("KNN (k=7)", lambda: KNeighborsClassifier(n_neighbors=7))
+
+# Model 2: Decision Tree (interpretable baseline)
+register_model("Decision Tree (max_depth=5)", lambda: DecisionTreeClassifier(max_depth=5, random_state=42))
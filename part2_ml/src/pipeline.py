@@ -0,0 +1,254 @@
+"""Incremental runner for the whole part 2 pipeline.
+
+Stages and the files they read and write are declared in `build_stages`; the
+order follows from which stage writes which input. A stage runs only when
+its key changed or an output is missing. The key is a hash of:
+- the source of its code modules;
+- its parameters;
+- the contents of its input files;
+- the Python and library versions.
+
+Independent stages (training and feature importance) run in parallel
+processes.
+
+Every run writes a per-stage timing report to `REPORT_PATH`.
+
+From the repository root:
+
+   python part2_ml/src/pipeline.py
+   python part2_ml/src/pipeline.py --rows 100000 --workers 2
+   python part2_ml/src/pipeline.py --force
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+import preprocessing
+from data_processing import PROCESSED_DATASET_PATH, TEST_PATH, TRAIN_PATH
+from feature_importance import FEATURE_IMPORTANCE_PATH
+from generate_dataset import RAW_PATH
+from train_and_evaluate import METRICS_PATH, TIMINGS_PATH
+
+
+SRC_DIR = Path(__file__).resolve().parent
+STATE_PATH = preprocessing.ARTIFACTS_DIR / "pipeline_state.json"
+REPORT_PATH = preprocessing.ARTIFACTS_DIR / "pipeline_report.csv"
+
+ARTIFACT_PATHS = tuple(
+    preprocessing.ARTIFACTS_DIR / name
+    for name in (
+        preprocessing.PREPROCESSOR_FILE,
+        preprocessing.X_TRAIN_FILE,
+        preprocessing.X_TEST_FILE,
+    )
+)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One script of the pipeline: its `main`, code, parameters and files.
+
+    `argv` is passed to `main` (None for scripts whose `main` takes no
+    arguments). `code` lists the local modules whose source is part of the
+    stage key.
+    """
+
+    name: str
+    module: str
+    code: Tuple[str, ...]
+    inputs: Tuple[Path, ...]
+    outputs: Tuple[Path, ...]
+    argv: Optional[Tuple[str, ...]] = None
+
+
+def build_stages(rows: int = 500, seed: int = 42) -> List[Stage]:
+    return [
+        Stage(
+            name="generate",
+            module="generate_dataset",
+            code=("generate_dataset", "schema", "storage"),
+            inputs=(),
+            outputs=(RAW_PATH, RAW_PATH.with_suffix(".csv")),
+            argv=("--rows", str(rows), "--seed", str(seed)),
+        ),
+        Stage(
+            name="process",
+            module="data_processing",
+            code=("data_processing", "preprocessing", "schema", "storage"),
+            inputs=(RAW_PATH,),
+            outputs=(PROCESSED_DATASET_PATH, TRAIN_PATH, TEST_PATH, *ARTIFACT_PATHS),
+            argv=(),
+        ),
+        Stage(
+            name="train_evaluate",
+            module="train_and_evaluate",
+            code=("train_and_evaluate", "models", "preprocessing", "schema", "storage"),
+            inputs=(TRAIN_PATH, TEST_PATH, *ARTIFACT_PATHS),
+            outputs=(METRICS_PATH, TIMINGS_PATH),
+        ),
+        Stage(
+            name="feature_importance",
+            module="feature_importance",
+            code=("feature_importance", "preprocessing", "schema", "storage"),
+            inputs=(TRAIN_PATH, TEST_PATH, *ARTIFACT_PATHS),
+            outputs=(FEATURE_IMPORTANCE_PATH,),
+        ),
+    ]
+
+
+def waves(stages: Sequence[Stage]) -> List[List[Stage]]:
+    """Group stages into waves; a stage's inputs are all written by earlier waves."""
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    deps = {stage.name: {producers[path] for path in stage.inputs if path in producers} for stage in stages}
+    done: set = set()
+    remaining = list(stages)
+    result = []
+    while remaining:
+        wave = [stage for stage in remaining if deps[stage.name] <= done]
+        if not wave:
+            raise ValueError(f"Cycle between stages: {[stage.name for stage in remaining]}")
+        result.append(wave)
+        done.update(stage.name for stage in wave)
+        remaining = [stage for stage in remaining if stage.name not in done]
+    return result
+
+
+class FileHashes:
+    """SHA-256 of files, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, known: Dict[str, List]) -> None:
+        self.known = known
+
+    def __call__(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+        cached = self.known.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.known[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def stage_key(stage: Stage, file_hash: FileHashes) -> Optional[str]:
+    """Content hash of everything a stage depends on; None if an input is missing."""
+    if not all(path.exists() for path in stage.inputs):
+        return None
+    payload = {
+        "code": {name: file_hash(SRC_DIR / f"{name}.py") for name in stage.code},
+        "argv": stage.argv,
+        "inputs": {str(path): file_hash(path) for path in stage.inputs},
+        "environment": environment(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def run_stage(module: str, argv: Optional[Tuple[str, ...]]) -> float:
+    """Import a stage's module and run its `main`; return the seconds it took."""
+    start = time.perf_counter()
+    main = importlib.import_module(module).main
+    if argv is None:
+        main()
+    else:
+        main(list(argv))
+    return time.perf_counter() - start
+
+
+def _load_state() -> Dict:
+    try:
+        return json.loads(STATE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def run_pipeline(stages: Sequence[Stage], workers: int = 2, force: bool = False) -> pd.DataFrame:
+    """Run the stages that are out of date and return the timing report.
+
+    The report has one row per stage: its status (`ran`, `skipped`,
+    `failed` or `blocked` by a failed stage), the seconds the stage took,
+    and its key.
+    """
+    state = _load_state()
+    file_hash = FileHashes(state.setdefault("files", {}))
+    keys = state.setdefault("stages", {})
+    report: Dict[str, Dict] = {}
+    failed = False
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for wave in waves(stages):
+            pending = {}
+            for stage in wave:
+                key = stage_key(stage, file_hash)
+                if failed or key is None:
+                    report[stage.name] = {"status": "blocked", "seconds": 0.0, "key": key}
+                elif not force and keys.get(stage.name) == key and all(path.exists() for path in stage.outputs):
+                    report[stage.name] = {"status": "skipped", "seconds": 0.0, "key": key}
+                else:
+                    pending[stage.name] = (key, pool.submit(run_stage, stage.module, stage.argv))
+            for name, (key, future) in pending.items():
+                try:
+                    seconds = future.result()
+                except Exception as exc:
+                    failed = True
+                    keys.pop(name, None)
+                    report[name] = {"status": "failed", "seconds": 0.0, "key": key, "error": repr(exc)}
+                else:
+                    keys[name] = key
+                    report[name] = {"status": "ran", "seconds": seconds, "key": key}
+
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    STATE_PATH.write_text(json.dumps(state, indent=2))
+
+    report_df = pd.DataFrame(
+        [{"stage": stage.name, **report[stage.name]} for stage in stages],
+        columns=["stage", "status", "seconds", "key", "error"],
+    )
+    report_df.to_csv(REPORT_PATH, index=False)
+    return report_df
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="rows to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=2, help="processes for independent stages")
+    parser.add_argument("--force", action="store_true", help="run every stage, even if up to date")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = run_pipeline(build_stages(args.rows, args.seed), args.workers, args.force)
+    total = time.perf_counter() - start
+
+    print("\nPipeline report:")
+    print(report[["stage", "status", "seconds"]].to_string(index=False))
+    print(f"\nTotal: {total:.2f} s. Saved report: {REPORT_PATH}")
+    return 1 if (report["status"] == "failed").any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""The shared preprocessor, fitted once on the training split and cached on disk.
+
+`prepare` returns the fitted preprocessor and the transformed train/test
+matrices. Stages reuse the saved artifact and matrices while they are
+still valid, and only refit or retransform when something changed.
+
+The artifact is valid while all of these are unchanged:
+- `PREPROCESSOR_VERSION`, which must be bumped whenever
+  `build_preprocessor` changes;
+- the scikit-learn version;
+- the hash of the training data.
+
+The cached matrices are also tied to the hash of the test data.
+
+The fingerprint is stored inside `preprocessor.joblib` next to the fitted
+preprocessor, so one rename publishes both and a reader can never pair a
+preprocessor with another run's fingerprint. The matrices are written
+before that file, so a payload always describes matrices already on disk.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from schema import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TARGET_COL
+
+
+PREPROCESSOR_VERSION = 1
+
+ARTIFACTS_DIR = Path("part2_ml/artifacts")
+PREPROCESSOR_FILE = "preprocessor.joblib"
+X_TRAIN_FILE = "X_train.npy"
+X_TEST_FILE = "X_test.npy"
+
+
+def build_preprocessor() -> ColumnTransformer:
+    # - Standardize numeric features (important for KNN)
+    # - One-hot encode employment_status
+    return ColumnTransformer(
+        transformers=[
+            ("num", StandardScaler(), NUMERIC_FEATURES),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
+        ],
+        remainder="drop",
+        # always a dense matrix, so it can be cached and memory-mapped as .npy
+        sparse_threshold=0,
+    )
+
+
+def feature_names(preprocessor: ColumnTransformer) -> List[str]:
+    """Names of the transformed columns, in matrix order."""
+    ohe = preprocessor.named_transformers_["cat"]
+    return NUMERIC_FEATURES + list(ohe.get_feature_names_out(CATEGORICAL_FEATURES))
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """Content hash of a table: values, column names and dtypes, not the index."""
+    digest = pd.util.hash_pandas_object(df, index=False).values.tobytes()
+    header = json.dumps([[col, str(dtype)] for col, dtype in df.dtypes.items()]).encode()
+    return joblib.hash(header + digest)
+
+
+@dataclass
+class PreparedData:
+    """Fitted preprocessor with the transformed splits and their targets."""
+
+    preprocessor: ColumnTransformer
+    feature_names: List[str]
+    X_train: np.ndarray
+    X_test: np.ndarray
+    y_train: pd.Series
+    y_test: pd.Series
+
+
+def _replace(path: Path, write: Callable[[Path], Any]) -> None:
+    # Write beside the target and rename over it: readers that memory-mapped
+    # the old file keep their copy, and nobody sees a half-written one.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _save_npy(path: Path, matrix: np.ndarray) -> None:
+    # through a file object, as np.save would append .npy to the temporary name
+    with open(path, "wb") as f:
+        np.save(f, matrix)
+
+
+def _load_payload(path: Path) -> Dict[str, Any]:
+    # a missing, truncated or foreign file just means "rebuild"
+    try:
+        payload = joblib.load(path)
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def prepare(
+    train_df: pd.DataFrame, test_df: pd.DataFrame, artifacts_dir: Optional[Path] = None
+) -> PreparedData:
+    """Load the preprocessor and transformed splits from `artifacts_dir`, or build them.
+
+    The matrices are returned memory-mapped read-only when loaded from the
+    cache.
+    """
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    X_train_df = train_df.drop(columns=[TARGET_COL])
+    X_test_df = test_df.drop(columns=[TARGET_COL])
+
+    fingerprint = {
+        "version": PREPROCESSOR_VERSION,
+        "sklearn": sklearn.__version__,
+        "train_hash": data_hash(train_df),
+    }
+    test_hash = data_hash(test_df)
+    preprocessor_path = artifacts_dir / PREPROCESSOR_FILE
+    matrix_paths = (artifacts_dir / X_TRAIN_FILE, artifacts_dir / X_TEST_FILE)
+    payload = _load_payload(preprocessor_path)
+
+    if payload.get("fingerprint") == fingerprint:
+        preprocessor = payload["preprocessor"]
+    else:
+        preprocessor = build_preprocessor().fit(X_train_df)
+        payload = {
+            "fingerprint": fingerprint,
+            "feature_names": feature_names(preprocessor),
+            "preprocessor": preprocessor,
+        }
+
+    if payload.get("test_hash") == test_hash and all(path.exists() for path in matrix_paths):
+        X_train, X_test = (np.load(path, mmap_mode="r") for path in matrix_paths)
+    else:
+        X_train, X_test = preprocessor.transform(X_train_df), preprocessor.transform(X_test_df)
+        for path, matrix in zip(matrix_paths, (X_train, X_test)):
+            _replace(path, lambda tmp, matrix=matrix: _save_npy(tmp, matrix))
+        payload["test_hash"] = test_hash
+        # published last, once the matrices it vouches for are in place
+        _replace(preprocessor_path, lambda tmp: joblib.dump(payload, tmp))
+
+    return PreparedData(
+        preprocessor=preprocessor,
+        feature_names=payload["feature_names"],
+        X_train=X_train,
+        X_test=X_test,
+        y_train=train_df[TARGET_COL],
+        y_test=test_df[TARGET_COL],
+    )
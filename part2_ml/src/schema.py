@@ -0,0 +1,38 @@
+"""Column schema of the loan dataset, shared by every stage of the pipeline."""
+
+from typing import Any, Dict, Optional, Sequence
+
+import pandas as pd
+
+
+TARGET_COL = "loan_approved"
+NUMERIC_FEATURES = ["income", "credit_score", "loan_amount", "loan_term"]
+CATEGORICAL_FEATURES = ["employment_status"]
+FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+EMPLOYMENT_STATUSES = ["employed", "self-employed", "unemployed"]
+
+# Smallest dtypes that hold the generator's value ranges:
+# income 5k-200k, credit score 300-850, loan amount 1k-80k, term 12-60 months
+DTYPES = {
+    "income": "int32",
+    "credit_score": "int16",
+    "loan_amount": "int32",
+    "loan_term": "int8",
+    "employment_status": pd.CategoricalDtype(EMPLOYMENT_STATUSES),
+    TARGET_COL: "int8",
+}
+
+# Standardized / one-hot features of the processed dataset
+PROCESSED_DTYPE = "float32"
+
+
+def processed_dtypes(columns: Sequence[str]) -> Dict[str, Any]:
+    """Dtypes of a processed table: float32 features and the compact target."""
+    return {col: DTYPES[TARGET_COL] if col == TARGET_COL else PROCESSED_DTYPE for col in columns}
+
+
+def apply_schema(df: pd.DataFrame, dtypes: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """Cast columns to their compact dtypes (`DTYPES` by default); others are left as they are."""
+    dtypes = DTYPES if dtypes is None else dtypes
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
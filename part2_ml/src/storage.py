@@ -0,0 +1,69 @@
+"""Reading and writing pipeline data as Feather/Parquet, with CSV as an export.
+
+- Feather (Arrow IPC, uncompressed) is used for intermediate tables. It is
+  memory-mapped on read, so loading costs little beyond touching the pages.
+- Parquet is used for raw data, which is larger and compresses well.
+- CSV is only written as a human-readable export next to each table.
+
+The format follows the file suffix. Tables are cast to compact dtypes on
+write and on read: `schema.DTYPES` unless other `dtypes` are given.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from schema import DTYPES, apply_schema
+
+
+def write_table(df: pd.DataFrame, path: Path, dtypes: Optional[Dict[str, Any]] = None) -> Path:
+    """Write `df` as Feather or Parquet, depending on the suffix of `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = apply_schema(df, dtypes)
+    if path.suffix == ".feather":
+        # compressed buffers cannot be memory-mapped, so intermediates stay uncompressed
+        feather.write_feather(df, path, compression="uncompressed")
+    elif path.suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported table format: {path}")
+    return path
+
+
+def read_table(
+    path: Path, columns: Optional[Sequence[str]] = None, dtypes: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """Read a Feather, Parquet or CSV table with the schema's dtypes.
+
+    `path` may also be a directory of Parquet or CSV part files, such as the
+    output of `generate_dataset.py --out-dir`.
+    """
+    columns = list(columns) if columns is not None else None
+    if path.suffix == ".feather":
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        df = table.to_pandas(split_blocks=True)
+    elif path.is_dir() and any(path.glob("*.csv")):
+        # CSV parts are read in name order, as Parquet datasets are
+        df = pd.concat(
+            (
+                pd.read_csv(part, usecols=columns, dtype=DTYPES if dtypes is None else dtypes)
+                for part in sorted(path.glob("*.csv"))
+            ),
+            ignore_index=True,
+        )
+    elif path.suffix == ".parquet" or path.is_dir():
+        df = pd.read_parquet(path, columns=columns)
+    elif path.suffix == ".csv":
+        df = pd.read_csv(path, usecols=columns, dtype=DTYPES if dtypes is None else dtypes)
+    else:
+        raise ValueError(f"Unsupported table format: {path}")
+    return apply_schema(df, dtypes)
+
+
+def export_csv(df: pd.DataFrame, path: Path) -> Path:
+    """Write a CSV copy of a table next to it (same name, .csv suffix)."""
+    csv_path = path.with_suffix(".csv")
+    df.to_csv(csv_path, index=False)
+    return csv_path
@@ -1,37 +1,31 @@
+import time
 from pathlib import Path
+from typing import Dict, List, Mapping
 
+import numpy as np
 import pandas as pd
-from sklearn.compose import ColumnTransformer
+from joblib import Parallel, delayed
+from sklearn.base import ClassifierMixin
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.tree import DecisionTreeClassifier
 
+from models import MODELS, ModelFactory
+from preprocessing import ARTIFACTS_DIR, PreparedData, prepare
+from storage import read_table
 
-TRAIN_PATH = Path("part2_ml/data/processed/train.csv")
-TEST_PATH = Path("part2_ml/data/processed/test.csv")
+
+TRAIN_PATH = Path("part2_ml/data/processed/train.feather")
+TEST_PATH = Path("part2_ml/data/processed/test.feather")
 RESULTS_DIR = Path("part2_ml/results")
 METRICS_PATH = RESULTS_DIR / "metrics.csv"
+# Wall-clock timings differ on every run, so they stay out of results/
+TIMINGS_PATH = ARTIFACTS_DIR / "model_timings.csv"
+TIMING_COLUMNS = ["fit_seconds", "predict_seconds"]
 
-TARGET_COL = "loan_approved"
-NUMERIC_FEATURES = ["income", "credit_score", "loan_amount", "loan_term"]
-CATEGORICAL_FEATURES = ["employment_status"]
-
-
-def build_preprocessor() -> ColumnTransformer:
-    return ColumnTransformer(
-        transformers=[
-            ("num", StandardScaler(), NUMERIC_FEATURES),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
-        ],
-        remainder="drop",
-    )
-
+# Worker processes for fitting candidates (-1: one per CPU)
+N_JOBS = -1
 
-def evaluate_model(name: str, pipeline: Pipeline, X_test: pd.DataFrame, y_test: pd.Series) -> dict:
-    preds = pipeline.predict(X_test)
 
+def score_predictions(name: str, y_test: pd.Series, preds: np.ndarray) -> dict:
     return {
         "model": name,
         "accuracy": accuracy_score(y_test, preds),
@@ -41,51 +35,57 @@ def evaluate_model(name: str, pipeline: Pipeline, X_test: pd.DataFrame, y_test:
     }
 
 
-def main() -> None:
-    train_df = pd.read_csv(TRAIN_PATH)
-    test_df = pd.read_csv(TEST_PATH)
-
-    X_train = train_df.drop(columns=[TARGET_COL])
-    y_train = train_df[TARGET_COL].astype(int)
-
-    X_test = test_df.drop(columns=[TARGET_COL])
-    y_test = test_df[TARGET_COL].astype(int)
-
-    preprocessor = build_preprocessor()
-
-    # Model 1: KNN (scaling is important)
-    knn_pipeline = Pipeline(
-        steps=[
-            ("preprocess", preprocessor),
-            ("model", KNeighborsClassifier(n_neighbors=7)),
-        ]
+def fit_and_score(
+    name: str,
+    model: ClassifierMixin,
+    X_train: np.ndarray,
+    y_train: pd.Series,
+    X_test: np.ndarray,
+    y_test: pd.Series,
+) -> dict:
+    """Fit one candidate and evaluate it, timing the fit and the prediction."""
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preds = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return {**score_predictions(name, y_test, preds), "fit_seconds": fit_seconds, "predict_seconds": predict_seconds}
+
+
+def evaluate_models(models: Mapping[str, ModelFactory], data: PreparedData, n_jobs: int = N_JOBS) -> List[Dict]:
+    """Fit and score every candidate across a loky process pool.
+
+    Workers share one read-only copy of the training matrix. When it comes
+    from the cache it is an np.memmap, which joblib passes as a reference
+    to the file. A freshly transformed array larger than `max_nbytes` is
+    dumped once to a temporary file, and workers memory-map that file.
+    """
+    return Parallel(n_jobs=n_jobs, backend="loky", max_nbytes="1M", mmap_mode="r")(
+        delayed(fit_and_score)(name, factory(), data.X_train, data.y_train, data.X_test, data.y_test)
+        for name, factory in models.items()
     )
 
-    # Model 2: Decision Tree (interpretable baseline)
-    tree_pipeline = Pipeline(
-        steps=[
-            ("preprocess", preprocessor),
-            ("model", DecisionTreeClassifier(max_depth=5, random_state=42)),
-        ]
-    )
 
-    # Fit
-    knn_pipeline.fit(X_train, y_train)
-    tree_pipeline.fit(X_train, y_train)
+def main() -> None:
+    # Shared preprocessor, fitted once on the training split; the transformed
+    # matrices come from the cache written by data_processing.py
+    data = prepare(read_table(TRAIN_PATH), read_table(TEST_PATH))
 
-    # Evaluate
-    results = [
-        evaluate_model("KNN (k=7)", knn_pipeline, X_test, y_test),
-        evaluate_model("Decision Tree (max_depth=5)", tree_pipeline, X_test, y_test),
-    ]
+    results = evaluate_models(MODELS, data)
 
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-    metrics_df = pd.DataFrame(results).sort_values(by="f1", ascending=False)
+    results_df = pd.DataFrame(results).sort_values(by="f1", ascending=False)
+    metrics_df = results_df.drop(columns=TIMING_COLUMNS)
     metrics_df.to_csv(METRICS_PATH, index=False)
+    results_df[["model"] + TIMING_COLUMNS].to_csv(TIMINGS_PATH, index=False)
 
     print("\nModel comparison (sorted by F1):")
-    print(metrics_df.to_string(index=False))
+    print(results_df.to_string(index=False))
     print(f"\nSaved metrics: {METRICS_PATH}")
+    print(f"Saved timings: {TIMINGS_PATH}")
 
 
 if __name__ == "__main__":